@@ -1,15 +1,15 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
-from .models import UserProfile, UserDocument
+from .models import UserProfile, UserDocument, CalendarFeedToken
 
 
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
-    list_display = ('user', 'role', 'town', 'is_approved', 'created_at', 'updated_at')
+    list_display = ('user', 'role', 'town', 'is_approved', 'last_seen_at', 'created_at', 'updated_at')
     list_filter = ('role', 'is_approved', 'town', 'created_at')
     search_fields = ('user__email', 'user__first_name', 'user__last_name', 'phone_number')
-    readonly_fields = ('created_at', 'updated_at', 'approved_at')
+    readonly_fields = ('created_at', 'updated_at', 'approved_at', 'last_seen_at')
     ordering = ('-created_at',)
     
     fieldsets = (
@@ -66,3 +66,11 @@ class UserDocumentAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+
+@admin.register(CalendarFeedToken)
+class CalendarFeedTokenAdmin(admin.ModelAdmin):
+    list_display = ('user', 'created_at')
+    search_fields = ('user__email', 'user__username')
+    readonly_fields = ('token', 'created_at')
+    ordering = ('-created_at',)
@@ -0,0 +1,260 @@
+"""
+Cached Token Authentication
+DRF token authentication with an in-process LRU cache, token expiry and batched last-seen writes
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, connection
+from django.db.models import Case, DateTimeField, Value, When
+from django.utils import timezone
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from townhall_project.metrics import record_cache
+from .models import UserProfile
+
+logger = logging.getLogger(__name__)
+
+# Concrete User columns kept in the cache; a fresh User is built from them per request
+USER_FIELDS = [field.attname for field in User._meta.concrete_fields]
+
+
+def token_expiry_delta():
+    """Token lifetime, or None when tokens never expire"""
+    hours = getattr(settings, 'TOKEN_EXPIRY_HOURS', 0)
+    return timedelta(hours=hours) if hours else None
+
+
+def token_expires_at(created):
+    delta = token_expiry_delta()
+    return created + delta if delta else None
+
+
+class TokenCache:
+    """
+    Bounded LRU of token key -> principal with a per-entry TTL.
+    Entries are process-local; the TTL bounds how long another worker can keep
+    honouring a token that was deleted or a user that was deactivated elsewhere.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry['cached_until'] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        entry['cached_until'] = time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def discard_users(self, user_ids):
+        user_ids = set(user_ids)
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry['user_id'] in user_ids]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class LastSeenBuffer:
+    """
+    Collects last-seen timestamps in memory and writes them in one UPDATE
+    every few seconds instead of once per request.
+    A background thread flushes every flush_interval even when no requests arrive,
+    and the buffer is flushed once more when the process exits.
+    """
+
+    def __init__(self, flush_interval, max_pending):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._flusher = None
+
+    def record(self, user_id, seen_at):
+        with self._lock:
+            self._pending[user_id] = seen_at
+            self._ensure_flusher()
+            due = (
+                len(self._pending) >= self.max_pending
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            try:
+                self.flush()
+            except Exception as e:
+                # Never fail the request; flush() kept the timestamps and the flush thread retries
+                logger.error(f"Error flushing last-seen timestamps: {str(e)}")
+
+    def flush(self):
+        """Write all pending timestamps with a single UPDATE ... CASE"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+        try:
+            return UserProfile.objects.filter(user_id__in=list(pending)).update(
+                last_seen_at=Case(
+                    *[When(user_id=user_id, then=Value(seen_at)) for user_id, seen_at in pending.items()],
+                    output_field=DateTimeField(),
+                )
+            )
+        except Exception:
+            # Keep the timestamps for the next attempt; newer ones recorded meanwhile win
+            with self._lock:
+                for user_id, seen_at in pending.items():
+                    self._pending.setdefault(user_id, seen_at)
+            raise
+
+    def _ensure_flusher(self):
+        """Start the flush thread (again after a fork, which leaves only the forking thread)"""
+        if self.flush_interval <= 0:
+            return  # Every record() writes immediately
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(target=self._run, name='last-seen-flush', daemon=True)
+            self._flusher.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            if time.monotonic() - self._last_flush < self.flush_interval:
+                continue
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing last-seen timestamps: {str(e)}")
+            finally:
+                # The thread's own connection; do not hold it open between flushes
+                connection.close()
+
+    def flush_at_exit(self):
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Error flushing last-seen timestamps at exit: {str(e)}")
+
+
+token_cache = TokenCache(
+    max_size=getattr(settings, 'TOKEN_CACHE_SIZE', 10000),
+    ttl=getattr(settings, 'TOKEN_CACHE_TTL', 30),
+)
+
+last_seen_buffer = LastSeenBuffer(
+    flush_interval=getattr(settings, 'LAST_SEEN_FLUSH_SECONDS', 30),
+    max_pending=getattr(settings, 'LAST_SEEN_MAX_PENDING', 500),
+)
+atexit.register(last_seen_buffer.flush_at_exit)
+
+
+def invalidate_token(key):
+    """Drop a token from this process's cache"""
+    token_cache.discard(key)
+
+
+def invalidate_user_tokens(user_ids):
+    """Drop every cached token belonging to the given users"""
+    token_cache.discard_users(user_ids)
+
+
+def issue_token(user):
+    """
+    Return a usable token for a user, rotating it when the current one has expired
+    """
+    try:
+        # Already loaded when the user was fetched with select_related('auth_token')
+        token, created = user.auth_token, False
+    except Token.DoesNotExist:
+        token, created = Token.objects.get_or_create(user=user)
+    expires_at = token_expires_at(token.created)
+    if not created and expires_at and expires_at <= timezone.now():
+        token = rotate_token(user)
+    return token
+
+
+def rotate_token(user):
+    """Replace a user's token with a new key"""
+    Token.objects.filter(user=user).delete()
+    return Token.objects.create(user=user)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that serves token -> user lookups from token_cache.
+    A cache hit costs no queries; a miss is one query joining token, user and profile.
+    """
+
+    def authenticate_credentials(self, key):
+        entry = token_cache.get(key)
+        record_cache('token', entry is not None)
+        if entry is None:
+            entry = self._load(key)
+            token_cache.set(key, entry)
+
+        now = timezone.now()
+        if entry['expires_at'] and entry['expires_at'] <= now:
+            invalidate_token(key)
+            raise exceptions.AuthenticationFailed('Token has expired.')
+
+        user = User.from_db('default', USER_FIELDS, entry['user_values'])
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+
+        self._touch(entry, now)
+        token = Token.from_db('default', ['key', 'user_id', 'created'], [key, entry['user_id'], entry['created']])
+        return user, token
+
+    def _load(self, key):
+        try:
+            # Always the primary: a token issued moments ago may not have reached a replica yet
+            token = Token.objects.using(DEFAULT_DB_ALIAS).select_related('user', 'user__userprofile').get(key=key)
+        except Token.DoesNotExist:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+
+        try:
+            last_seen_at = token.user.userprofile.last_seen_at
+        except UserProfile.DoesNotExist:
+            last_seen_at = None
+        return {
+            'user_id': token.user_id,
+            'user_values': [getattr(token.user, field) for field in USER_FIELDS],
+            'created': token.created,
+            'expires_at': token_expires_at(token.created),
+            'last_seen_at': last_seen_at,
+        }
+
+    def _touch(self, entry, now):
+        """Record activity at most once per LAST_SEEN_RESOLUTION_SECONDS per user"""
+        resolution = timedelta(seconds=getattr(settings, 'LAST_SEEN_RESOLUTION_SECONDS', 300))
+        if entry['last_seen_at'] is None or now - entry['last_seen_at'] >= resolution:
+            entry['last_seen_at'] = now
+            last_seen_buffer.record(entry['user_id'], now)
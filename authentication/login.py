@@ -0,0 +1,149 @@
+"""
+Login Pipeline
+Credential checks with one joined lookup, rehash-on-login and a failure cache
+"""
+
+import hashlib
+import hmac
+import time
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+from townhall_project.caches import is_shared
+from .models import ThrottleCounter
+from .throttling import DatabaseThrottleBackend
+
+# Failed attempts per account and client address within the window before password checks are skipped
+LOGIN_MAX_FAILURES = 10
+
+# Seconds a failure is remembered (both the exact-attempt cache and the per-account counter)
+LOGIN_FAILURE_WINDOW = 15 * 60
+
+# Result codes returned alongside the user
+INVALID_CREDENTIALS = 'invalid'
+TOO_MANY_FAILURES = 'locked'
+
+
+def _cache_alias():
+    return getattr(settings, 'LOGIN_FAILURE_CACHE', 'default')
+
+
+def _cache():
+    return caches[_cache_alias()]
+
+
+def _digest(*parts):
+    """Keyed digest so cache keys never contain passwords or their plain hashes"""
+    message = '\x00'.join(parts).encode('utf-8')
+    return hmac.new(settings.SECRET_KEY.encode('utf-8'), message, hashlib.sha256).hexdigest()
+
+
+def _attempt_key(identity, password):
+    return f'login:fail:attempt:{_digest(identity, password)}'
+
+
+def client_ip(request):
+    """Client address as the throttles see it (honours REST_FRAMEWORK NUM_PROXIES)"""
+    return BaseThrottle().get_ident(request)
+
+
+def _account_key(email, client_ip):
+    """
+    Failures are counted per (account, client address): repeated failures from one
+    address lock that address out of the account without locking out its owner elsewhere.
+    """
+    return f'login:fail:account:{_digest(email.lower(), client_ip or "")}'
+
+
+def fetch_login_user(email):
+    """User with profile and token in a single joined query (None if unknown)"""
+    return User.objects.select_related('userprofile', 'auth_token').filter(username=email).first()
+
+
+def _failure_count(cache, account_key):
+    """
+    Recent failures for an account key. Kept in the failure cache when it is shared by
+    every worker, otherwise in the ThrottleCounter table so all workers see the same count.
+    """
+    if is_shared(_cache_alias()):
+        return cache.get(account_key, 0)
+    row = ThrottleCounter.objects.filter(bucket_key=account_key).values_list(
+        'window_start', 'current_count', 'previous_count'
+    ).first()
+    if row is None:
+        return 0
+    window_start, current, previous = row
+    now = time.time()
+    this_window = int(now // LOGIN_FAILURE_WINDOW * LOGIN_FAILURE_WINDOW)
+    remaining = 1 - (now - this_window) / LOGIN_FAILURE_WINDOW
+    if window_start == this_window:
+        return current + previous * remaining
+    if window_start == this_window - LOGIN_FAILURE_WINDOW:
+        return current * remaining
+    return 0
+
+
+def _record_failure(cache, account_key, attempt_key=None):
+    if attempt_key is not None:
+        cache.set(attempt_key, True, LOGIN_FAILURE_WINDOW)
+    if not is_shared(_cache_alias()):
+        window_start = int(time.time() // LOGIN_FAILURE_WINDOW * LOGIN_FAILURE_WINDOW)
+        DatabaseThrottleBackend().hit(account_key, window_start, LOGIN_FAILURE_WINDOW)
+        return
+    if not cache.add(account_key, 1, LOGIN_FAILURE_WINDOW):
+        try:
+            cache.incr(account_key)
+        except ValueError:
+            cache.set(account_key, 1, LOGIN_FAILURE_WINDOW)
+
+
+def _clear_failures(cache, account_key):
+    if is_shared(_cache_alias()):
+        cache.delete(account_key)
+    else:
+        ThrottleCounter.objects.filter(bucket_key=account_key).delete()
+
+
+def check_login(email, password, client_ip=None):
+    """
+    Verify credentials.
+    - Too many recent failures for this account from this client address are rejected
+      without hashing; other addresses are unaffected, so nobody can lock an owner out.
+    - An exact (user, password) pair that already failed the password check is rejected
+      without hashing; the key includes the stored hash, so it stops matching once the
+      password changes. Only wrong passwords are remembered this way.
+    - A successful check upgrades the stored hash when PASSWORD_HASHERS prefers
+      another algorithm (User.check_password's setter).
+    Returns: (user, error_code)
+    """
+    cache = _cache()
+    account_key = _account_key(email, client_ip)
+    if _failure_count(cache, account_key) >= LOGIN_MAX_FAILURES:
+        return None, TOO_MANY_FAILURES
+
+    user = fetch_login_user(email)
+    identity = user.password if user is not None else f'unknown:{email.lower()}'
+    attempt_key = _attempt_key(identity, password)
+    if cache.get(attempt_key):
+        _record_failure(cache, account_key)
+        return None, INVALID_CREDENTIALS
+
+    if user is None:
+        # Hash anyway so unknown and known emails take the same time
+        make_password(password)
+        _record_failure(cache, account_key, attempt_key)
+        return None, INVALID_CREDENTIALS
+
+    if not user.check_password(password):
+        _record_failure(cache, account_key, attempt_key)
+        return None, INVALID_CREDENTIALS
+
+    if not user.is_active:
+        # Right password: counted, but not remembered, so it works once the account is reactivated
+        _record_failure(cache, account_key)
+        return None, INVALID_CREDENTIALS
+
+    _clear_failures(cache, account_key)
+    return user, None
@@ -0,0 +1,8 @@
+# Management package
+
+
+
+
+
+
+
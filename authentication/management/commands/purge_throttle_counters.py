@@ -0,0 +1,28 @@
+"""
+Django management command to delete stale throttle counters
+Usage: python manage.py purge_throttle_counters [--older-than-hours 48]
+Counters only matter for their current and previous window; run daily from cron.
+"""
+import time
+from django.core.management.base import BaseCommand
+from authentication.throttling import DatabaseThrottleBackend, get_backend
+
+
+class Command(BaseCommand):
+    help = 'Delete throttle counters whose windows have expired'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-hours',
+            type=int,
+            default=48,
+            help='Delete counters whose current window started more than this many hours ago (default: 48)',
+        )
+
+    def handle(self, *args, **options):
+        older_than = int(time.time()) - options['older_than_hours'] * 3600
+        # The table also holds login failure counters, whichever backend throttles requests
+        deleted = get_backend().purge(older_than)
+        if not isinstance(get_backend(), DatabaseThrottleBackend):
+            deleted += DatabaseThrottleBackend().purge(older_than)
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} throttle counter(s)'))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_calendarfeedtoken'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='last_seen_at',
+            field=models.DateTimeField(blank=True, help_text='Last authenticated API request (written in batches)', null=True),
+        ),
+    ]
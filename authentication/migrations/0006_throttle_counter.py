@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0005_userprofile_last_seen_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ThrottleCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket_key', models.CharField(max_length=200, unique=True)),
+                ('window_start', models.BigIntegerField(help_text='Start of the current window (unix seconds)')),
+                ('current_count', models.PositiveIntegerField(default=0)),
+                ('previous_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['window_start'], name='throttle_window_idx')],
+            },
+        ),
+    ]
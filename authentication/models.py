@@ -1,3 +1,4 @@
+import secrets
 from django.db import models
 from django.contrib.auth.models import User
 from django.contrib.auth.models import AbstractUser
@@ -18,6 +19,7 @@ class UserProfile(models.Model):
     is_approved = models.BooleanField(default=False)
     approved_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='approved_users')
     approved_at = models.DateTimeField(null=True, blank=True)
+    last_seen_at = models.DateTimeField(null=True, blank=True, help_text="Last authenticated API request (written in batches)")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -67,4 +69,39 @@ class UserDocument(models.Model):
         ]
     
     def __str__(self):
-        return f"{self.file_name} - {self.user.get_full_name()}"
\ No newline at end of file
+        return f"{self.file_name} - {self.user.get_full_name()}"
+
+class CalendarFeedToken(models.Model):
+    """Secret token that lets calendar clients subscribe to a user's .ics feeds without logging in"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='calendar_feed_token')
+    token = models.CharField(max_length=64, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"Calendar feed token for {self.user.username}"
+    
+    @staticmethod
+    def generate_token():
+        return secrets.token_urlsafe(32)
+    
+    def rotate(self):
+        """Replace the token, invalidating previously shared feed URLs"""
+        self.token = self.generate_token()
+        self.save(update_fields=['token'])
+        return self.token
+
+
+class ThrottleCounter(models.Model):
+    """Sliding-window request counter for one throttle key (fixed size per key)"""
+    bucket_key = models.CharField(max_length=200, unique=True)
+    window_start = models.BigIntegerField(help_text="Start of the current window (unix seconds)")
+    current_count = models.PositiveIntegerField(default=0)
+    previous_count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['window_start'], name='throttle_window_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.bucket_key}: {self.current_count} (+{self.previous_count} previous)"
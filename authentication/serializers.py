@@ -147,7 +147,32 @@ class SignupSerializer(serializers.Serializer):
                 })
             # Government users don't require address fields (they use officeAddress)
         
+        if attrs.get('zipCode') and user_type in ['citizen', 'business']:
+            self._validate_zip_matches_town(attrs['zipCode'], attrs.get('townId'))
+        
         return attrs
+    
+    def _validate_zip_matches_town(self, zip_code, town_id):
+        """Check the address ZIP code against the selected town using the ZIP index"""
+        from towns.models import TownZipCode
+        from towns.zip_codes import normalize_zip
+        
+        normalized = normalize_zip(zip_code)
+        if not normalized:
+            raise serializers.ValidationError({
+                'zipCode': 'Enter a valid 5-digit ZIP code.'
+            })
+        entry = TownZipCode.objects.select_related('town').filter(zip_code=normalized).first()
+        if entry is not None:
+            if entry.town_id != town_id:
+                raise serializers.ValidationError({
+                    'zipCode': f'ZIP code {normalized} belongs to {entry.town.name}, not the selected town.'
+                })
+        elif TownZipCode.objects.filter(town_id=town_id).exists():
+            # Towns without configured ZIP codes accept any address
+            raise serializers.ValidationError({
+                'zipCode': f'ZIP code {normalized} is not served by the selected town.'
+            })
 
 
 class PendingUserSerializer(serializers.Serializer):
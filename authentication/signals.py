@@ -0,0 +1,22 @@
+"""
+Authentication Signals
+Keep the token cache consistent with token and user changes
+"""
+
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from .authentication import invalidate_token, invalidate_user_tokens
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """Logout and token rotation delete the token row"""
+    invalidate_token(instance.key)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user(sender, instance, **kwargs):
+    """Cached principals carry user columns (is_active, password, names); reload them after a change"""
+    invalidate_user_tokens([instance.id])
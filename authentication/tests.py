@@ -0,0 +1,268 @@
+"""
+Authentication Tests
+Sliding-window throttling: the counter upsert, the retry delay and backend selection (authentication.throttling)
+Login failure lockout (authentication.login)
+Token cache expiry and eviction, and last-seen flushes (authentication.authentication)
+"""
+
+import json
+import os
+import tempfile
+from datetime import timedelta
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import DatabaseError
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from .authentication import LastSeenBuffer, issue_token, token_cache
+from .login import INVALID_CREDENTIALS, LOGIN_MAX_FAILURES, TOO_MANY_FAILURES, check_login
+from .models import ThrottleCounter, UserProfile
+from .throttling import (
+    CacheThrottleBackend, DatabaseThrottleBackend, SlidingWindowThrottle, _fallback_warned, get_backend,
+    throttle_decisions, throttle_metrics,
+)
+
+WINDOW = 60
+START = 1_000_020  # A multiple of WINDOW
+
+
+class DatabaseThrottleBackendTests(TestCase):
+    """The single INSERT ... ON CONFLICT statement that rolls windows forward"""
+
+    def setUp(self):
+        self.backend = DatabaseThrottleBackend()
+
+    def hit(self, window_start, key='throttle_user_1'):
+        return tuple(self.backend.hit(key, window_start, WINDOW))
+
+    def test_first_hit_creates_counter(self):
+        self.assertEqual(self.hit(START), (1, 0))
+        counter = ThrottleCounter.objects.get(bucket_key='throttle_user_1')
+        self.assertEqual((counter.window_start, counter.current_count, counter.previous_count), (START, 1, 0))
+
+    def test_hits_in_same_window_increment(self):
+        self.hit(START)
+        self.hit(START)
+        self.assertEqual(self.hit(START), (3, 0))
+
+    def test_next_window_carries_current_count_over(self):
+        for _ in range(4):
+            self.hit(START)
+        self.assertEqual(self.hit(START + WINDOW), (1, 4))
+        self.assertEqual(self.hit(START + WINDOW), (2, 4))
+
+    def test_skipped_window_resets_previous_count(self):
+        for _ in range(4):
+            self.hit(START)
+        self.assertEqual(self.hit(START + 2 * WINDOW), (1, 0))
+
+    def test_late_hit_from_earlier_window_counts_in_current(self):
+        # A worker whose clock lags must not roll the window backwards
+        self.hit(START)
+        self.hit(START + WINDOW)
+        self.assertEqual(self.hit(START), (2, 1))
+        self.assertEqual(ThrottleCounter.objects.get(bucket_key='throttle_user_1').window_start, START + WINDOW)
+
+    def test_keys_are_independent(self):
+        self.hit(START)
+        self.assertEqual(self.hit(START, key='throttle_user_2'), (1, 0))
+
+    def test_purge_deletes_old_windows(self):
+        self.hit(START, key='old')
+        self.hit(START + 5 * WINDOW, key='new')
+        self.assertEqual(self.backend.purge(START + WINDOW), 1)
+        self.assertEqual(list(ThrottleCounter.objects.values_list('bucket_key', flat=True)), ['new'])
+
+
+class ComputeWaitTests(SimpleTestCase):
+    """Seconds until the sliding estimate is back under the limit"""
+
+    class TenPerMinute(SlidingWindowThrottle):
+        scope = 'test'
+        rate = '10/min'
+
+    def setUp(self):
+        self.throttle = self.TenPerMinute()
+
+    def estimate(self, now, current, previous):
+        return previous * (1 - (now - START) / WINDOW) + current
+
+    def test_without_previous_window_waits_for_window_end(self):
+        self.assertEqual(self.throttle._compute_wait(START + 15, START, 11, 0), 45)
+
+    def test_current_window_over_limit_waits_for_window_end(self):
+        self.assertEqual(self.throttle._compute_wait(START + 15, START, 12, 8), 45)
+
+    def test_waits_until_previous_window_has_decayed(self):
+        now = START + 10
+        wait = self.throttle._compute_wait(now, START, 5, 10)
+        self.assertAlmostEqual(wait, 20)
+        self.assertGreater(self.estimate(now, 5, 10), 10)
+        self.assertAlmostEqual(self.estimate(now + wait, 5, 10), 10)
+
+    def test_already_decayed_never_negative(self):
+        self.assertEqual(self.throttle._compute_wait(START + 50, START, 5, 10), 0)
+
+
+class ThrottleBackendSelectionTests(SimpleTestCase):
+
+    @override_settings(THROTTLE_BACKEND='cache', THROTTLE_CACHE='default')
+    def test_process_local_cache_falls_back_to_database(self):
+        _fallback_warned.clear()
+        with self.assertLogs('authentication.throttling', 'WARNING'):
+            self.assertIsInstance(get_backend(), DatabaseThrottleBackend)
+
+    @override_settings(
+        THROTTLE_BACKEND='cache', THROTTLE_CACHE='shared',
+        CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'shared': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': tempfile.gettempdir()},
+        },
+    )
+    def test_shared_cache_is_used(self):
+        self.assertIsInstance(get_backend(), CacheThrottleBackend)
+
+
+class ThrottleMetricsTests(SimpleTestCase):
+
+    def test_snapshot_includes_other_workers(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_MULTIPROC_DIR=directory):
+            before = throttle_metrics.snapshot().get('test', {'allowed': 0, 'throttled': 0})
+            throttle_decisions.inc('test', 'allowed')
+            # Values flushed by another worker process
+            with open(os.path.join(directory, '999999.json'), 'w') as handle:
+                json.dump([[throttle_decisions.name, ['test', 'throttled'], 3]], handle)
+
+            snapshot = throttle_metrics.snapshot()['test']
+            self.assertEqual(snapshot['allowed'], before['allowed'] + 1)
+            self.assertEqual(snapshot['throttled'], before['throttled'] + 3)
+
+
+class LoginLockoutTests(TestCase):
+    """Failures lock out one client address per account, never the owner elsewhere"""
+
+    ATTACKER = '203.0.113.7'
+    OWNER = '198.51.100.20'
+
+    def setUp(self):
+        caches['default'].clear()
+        self.user = User.objects.create_superuser('admin@example.com', 'admin@example.com', 'right-password')
+
+    def fail_from(self, address, times=LOGIN_MAX_FAILURES):
+        for number in range(times):
+            check_login('admin@example.com', f'wrong-{number}', address)
+
+    def test_repeated_failures_lock_that_address(self):
+        self.fail_from(self.ATTACKER)
+        self.assertEqual(check_login('admin@example.com', 'right-password', self.ATTACKER), (None, TOO_MANY_FAILURES))
+
+    def test_other_addresses_still_log_in(self):
+        self.fail_from(self.ATTACKER)
+        self.assertEqual(check_login('admin@example.com', 'right-password', self.OWNER), (self.user, None))
+
+    def test_counts_are_kept_in_database_without_shared_cache(self):
+        self.fail_from(self.ATTACKER, times=3)
+        self.assertEqual(ThrottleCounter.objects.get().current_count, 3)
+        check_login('admin@example.com', 'right-password', self.ATTACKER)
+        self.assertFalse(ThrottleCounter.objects.exists())
+
+    @override_settings(
+        LOGIN_FAILURE_CACHE='shared',
+        CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'shared': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': tempfile.mkdtemp()},
+        },
+    )
+    def test_counts_are_kept_in_shared_cache(self):
+        self.fail_from(self.ATTACKER)
+        self.assertFalse(ThrottleCounter.objects.exists())
+        self.assertEqual(check_login('admin@example.com', 'right-password', self.ATTACKER), (None, TOO_MANY_FAILURES))
+        self.assertEqual(check_login('admin@example.com', 'right-password', self.OWNER), (self.user, None))
+
+    def test_right_password_on_inactive_account_works_after_reactivation(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(check_login('admin@example.com', 'right-password', self.OWNER), (None, INVALID_CREDENTIALS))
+        self.user.is_active = True
+        self.user.save()
+        self.assertEqual(check_login('admin@example.com', 'right-password', self.OWNER), (self.user, None))
+
+
+class TokenCacheTests(TestCase):
+    """Cached principals are dropped whenever the token or the user stops being valid"""
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user('citizen@example.com', 'citizen@example.com', 'old-password-1')
+        UserProfile.objects.create(user=self.user, role='citizen', is_approved=True)
+        self.key = issue_token(self.user).key
+        self.assertEqual(self.get_profile(self.key).status_code, 200)
+        self.assertIsNotNone(token_cache.get(self.key))
+
+    def get_profile(self, key):
+        return self.client.get('/api/auth/users/me/', HTTP_AUTHORIZATION=f'Token {key}')
+
+    def assertRefused(self, key, detail):
+        response = self.get_profile(key)
+        self.assertIn(response.status_code, (401, 403))
+        self.assertEqual(response.json()['detail'], detail)
+
+    def test_expired_token_is_refused_and_evicted(self):
+        Token.objects.filter(key=self.key).update(created=timezone.now() - timedelta(hours=169))
+        token_cache.clear()
+        self.assertRefused(self.key, 'Token has expired.')
+        self.assertIsNone(token_cache.get(self.key))
+
+    def test_logout_evicts_token(self):
+        response = self.client.post('/api/auth/logout/', HTTP_AUTHORIZATION=f'Token {self.key}')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(token_cache.get(self.key))
+        self.assertRefused(self.key, 'Invalid token.')
+
+    def test_deactivation_evicts_user(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(token_cache.get(self.key))
+        self.assertRefused(self.key, 'User inactive or deleted.')
+
+    def test_password_change_evicts_cached_password_hash(self):
+        response = self.client.post(
+            '/api/auth/change-password/',
+            {'old_password': 'old-password-1', 'new_password': 'New-password-2!', 'confirm_password': 'New-password-2!'},
+            content_type='application/json', HTTP_AUTHORIZATION=f'Token {self.key}',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(token_cache.get(self.key))
+
+        self.assertEqual(self.get_profile(self.key).status_code, 200)
+        self.assertIn(User.objects.get(id=self.user.id).password, token_cache.get(self.key)['user_values'])
+
+    def test_bulk_deactivate_evicts_users(self):
+        admin_user = User.objects.create_superuser('admin@example.com', 'admin@example.com', 'pw')
+        response = self.client.post(
+            '/api/auth/users/bulk/', {'user_ids': [self.user.id], 'status': 'deactivate'},
+            content_type='application/json', HTTP_AUTHORIZATION=f'Token {issue_token(admin_user).key}',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(token_cache.get(self.key))
+        self.assertRefused(self.key, 'User inactive or deleted.')
+
+
+class LastSeenBufferTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('citizen@example.com', 'citizen@example.com', 'pw')
+        UserProfile.objects.create(user=self.user, role='citizen', is_approved=True)
+        self.buffer = LastSeenBuffer(flush_interval=0, max_pending=500)
+
+    def test_failed_flush_on_request_path_is_logged_and_retried(self):
+        seen_at = timezone.now()
+        with mock.patch.object(UserProfile.objects, 'filter', side_effect=DatabaseError('down')):
+            with self.assertLogs('authentication.authentication', 'ERROR'):
+                self.buffer.record(self.user.id, seen_at)
+        self.assertEqual(UserProfile.objects.get(user=self.user).last_seen_at, None)
+
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual(UserProfile.objects.get(user=self.user).last_seen_at, seen_at)
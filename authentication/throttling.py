@@ -0,0 +1,215 @@
+"""
+Sliding-Window Throttling
+DRF throttles backed by a store shared across worker processes
+"""
+
+import logging
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from rest_framework.throttling import SimpleRateThrottle
+from townhall_project import metrics
+from townhall_project.caches import is_shared
+from .models import ThrottleCounter
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseThrottleBackend:
+    """
+    Counters in the ThrottleCounter table.
+    One INSERT ... ON CONFLICT DO UPDATE ... RETURNING per check: the row rolls
+    its window forward, increments and returns the counts in a single round trip.
+    """
+
+    def hit(self, key, window_start, duration):
+        table = connection.ops.quote_name(ThrottleCounter._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} (bucket_key, window_start, current_count, previous_count) '
+                f'VALUES (%s, %s, 1, 0) '
+                f'ON CONFLICT (bucket_key) DO UPDATE SET '
+                f'previous_count = CASE '
+                f'WHEN {table}.window_start >= EXCLUDED.window_start THEN {table}.previous_count '
+                f'WHEN {table}.window_start = EXCLUDED.window_start - %s THEN {table}.current_count '
+                f'ELSE 0 END, '
+                f'current_count = CASE '
+                f'WHEN {table}.window_start >= EXCLUDED.window_start THEN {table}.current_count + 1 '
+                f'ELSE 1 END, '
+                f'window_start = CASE '
+                f'WHEN {table}.window_start >= EXCLUDED.window_start THEN {table}.window_start '
+                f'ELSE EXCLUDED.window_start END '
+                f'RETURNING current_count, previous_count',
+                [key, window_start, duration],
+            )
+            return cursor.fetchone()
+
+    def purge(self, older_than):
+        """Delete counters whose windows ended before `older_than` (unix seconds)"""
+        deleted, _ = ThrottleCounter.objects.filter(window_start__lt=older_than).delete()
+        return deleted
+
+
+class CacheThrottleBackend:
+    """
+    Counters in a shared Django cache (e.g. memcached or Redis on a local socket,
+    configured as THROTTLE_CACHE). One key per window and no table writes, at the
+    cost of a second round trip (read the previous window, then add/incr the current one).
+    """
+
+    def __init__(self, alias=None):
+        self.alias = alias or getattr(settings, 'THROTTLE_CACHE', 'default')
+
+    def hit(self, key, window_start, duration):
+        cache = caches[self.alias]
+        current_key = f'throttle:{key}:{window_start}'
+        previous_key = f'throttle:{key}:{window_start - duration}'
+        previous = cache.get(previous_key, 0)
+        if cache.add(current_key, 1, duration * 2):
+            return 1, previous
+        try:
+            return cache.incr(current_key), previous
+        except ValueError:
+            cache.set(current_key, 1, duration * 2)
+            return 1, previous
+
+    def purge(self, older_than):
+        # Cache entries expire on their own
+        return 0
+
+
+THROTTLE_BACKENDS = {
+    'database': DatabaseThrottleBackend,
+    'cache': CacheThrottleBackend,
+}
+
+
+# THROTTLE_CACHE aliases already warned about, so the warning is logged once per process
+_fallback_warned = set()
+
+
+def backend_name():
+    """
+    The configured backend name. A process-local THROTTLE_CACHE (e.g. LocMem) would give every
+    worker its own counters and multiply the effective limit, so it falls back to 'database'.
+    """
+    name = getattr(settings, 'THROTTLE_BACKEND', 'database')
+    if name == 'cache':
+        alias = getattr(settings, 'THROTTLE_CACHE', 'default')
+        if not is_shared(alias):
+            if alias not in _fallback_warned:
+                _fallback_warned.add(alias)
+                logger.warning(
+                    f"THROTTLE_CACHE '{alias}' is not shared between worker processes; "
+                    f"using the database throttle backend instead"
+                )
+            return 'database'
+    return name
+
+
+def get_backend():
+    return THROTTLE_BACKENDS[backend_name()]()
+
+
+throttle_decisions = metrics.counter(
+    'townhall_throttle_decisions_total', 'Throttle checks by scope and result (allowed/throttled)',
+    ['scope', 'result'],
+)
+
+
+class ThrottleMetrics:
+    """
+    Per-scope allowed/throttled counters (exported at /metrics).
+    Snapshots cover every worker on the host when METRICS_MULTIPROC_DIR is set, else this process only.
+    """
+
+    def record(self, scope, allowed):
+        throttle_decisions.inc(scope, 'allowed' if allowed else 'throttled')
+
+    def snapshot(self):
+        counts = {}
+        for (scope, result), value in throttle_decisions.aggregated_values().items():
+            counts.setdefault(scope, {'allowed': 0, 'throttled': 0})[result] = value
+        return counts
+
+
+throttle_metrics = ThrottleMetrics()
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Sliding-window rate limit approximated from two fixed windows:
+    estimate = previous_count * (unelapsed share of the window) + current_count.
+    Memory per key is constant regardless of the request rate.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = time.time()
+        window_start = int(now // self.duration * self.duration)
+        current, previous = get_backend().hit(self.key, window_start, self.duration)
+
+        elapsed = (now - window_start) / self.duration
+        estimate = previous * (1 - elapsed) + current
+        allowed = estimate <= self.num_requests
+        throttle_metrics.record(self.scope, allowed)
+        if not allowed:
+            self._wait = self._compute_wait(now, window_start, current, previous)
+        return allowed
+
+    def _compute_wait(self, now, window_start, current, previous):
+        """Seconds until the estimate drops back under the limit"""
+        window_end = window_start + self.duration
+        if previous and current <= self.num_requests:
+            # The previous window's weight decays linearly; solve for when it has decayed enough
+            elapsed_needed = 1 - (self.num_requests - current) / previous
+            return max(window_start + elapsed_needed * self.duration - now, 0)
+        return window_end - now
+
+    def wait(self):
+        return getattr(self, '_wait', None)
+
+
+class SlidingAnonRateThrottle(SlidingWindowThrottle):
+    """Limits anonymous requests by client IP (replaces AnonRateThrottle)"""
+    scope = 'anon'
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request)
+        }
+
+
+class SlidingUserRateThrottle(SlidingWindowThrottle):
+    """Limits requests by user id, or client IP when anonymous (replaces UserRateThrottle)"""
+    scope = 'user'
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': ident
+        }
+
+
+class LoginThrottle(SlidingUserRateThrottle):
+    """Custom throttle for login endpoint"""
+    scope = 'login'
+
+
+class SignupThrottle(SlidingUserRateThrottle):
+    """Custom throttle for signup endpoint"""
+    scope = 'signup'
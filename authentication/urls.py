@@ -21,8 +21,10 @@ urlpatterns = [
     # GET /auth/users/ - List all users
     # GET /auth/users/<id>/ - Get user details
     # PATCH /auth/users/<id>/ - Approve/reject/deactivate user
+    # POST /auth/users/bulk/ - Approve/reject/deactivate many users
     path('users/me/', views_users.user_profile_view, name='user_profile'),
     path('users/', views_users.users_list_view, name='users_list'),
+    path('users/bulk/', views_users.bulk_user_action_view, name='users_bulk_action'),
     path('users/<int:user_id>/', views_users.user_detail_action_view, name='user_detail_action'),
     
     # Admin Reports - RESTful
@@ -31,11 +33,17 @@ urlpatterns = [
     # GET /auth/admin/reports/complaints/ - Get complaints report
     # GET /auth/admin/reports/licenses/ - Get business licenses report
     # GET /auth/admin/reports/towns/ - Get town statistics report
+    # GET /auth/admin/throttle-metrics/ - Get throttle hit counters
+    # GET /auth/admin/db-connections/ - Get database connection pool stats
+    # GET /auth/admin/query-budget/ - Get recent requests over their query budget
     path('admin/reports/summary/', views_admin_reports.admin_reports_summary_view, name='admin_reports_summary'),
     path('admin/reports/users/', views_admin_reports.admin_user_registrations_report_view, name='admin_user_registrations_report'),
     path('admin/reports/complaints/', views_admin_reports.admin_complaints_report_view, name='admin_complaints_report'),
     path('admin/reports/licenses/', views_admin_reports.admin_business_licenses_report_view, name='admin_business_licenses_report'),
     path('admin/reports/towns/', views_admin_reports.admin_town_statistics_report_view, name='admin_town_statistics_report'),
+    path('admin/throttle-metrics/', views_admin_reports.admin_throttle_metrics_view, name='admin_throttle_metrics'),
+    path('admin/db-connections/', views_admin_reports.admin_db_connections_view, name='admin_db_connections'),
+    path('admin/query-budget/', views_admin_reports.admin_query_budget_view, name='admin_query_budget'),
     
     # User Documents - RESTful
     # GET /auth/documents/ - List user documents
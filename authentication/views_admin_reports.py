@@ -8,6 +8,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.db.models import Count, Q, Sum, Avg
+from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta, datetime
 from authentication.models import UserProfile
@@ -19,7 +20,12 @@ from businessowner.models import (
     BusinessEvent,
     BusinessService
 )
+from businessowner.license_expiry import expiring_licenses as expiring_licenses_queryset
 from towns.models import Town
+from townhall_project.db_connections import connection_stats
+from townhall_project.query_budget import query_budget, recent_violations
+from .throttling import backend_name, throttle_metrics
+from townhall_project.db_routers import replica_reads
 import logging
 
 logger = logging.getLogger(__name__)
@@ -32,6 +38,7 @@ def check_admin_access(user):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def admin_reports_summary_view(request):
     """
     Get comprehensive reports summary for admin panel
@@ -92,11 +99,7 @@ def admin_reports_summary_view(request):
         total_licenses = BusinessLicense.objects.count()
         pending_licenses = BusinessLicense.objects.filter(status='pending').count()
         approved_licenses = BusinessLicense.objects.filter(status='approved').count()
-        expiring_licenses = BusinessLicense.objects.filter(
-            status='approved',
-            expiry_date__lte=end_date + timedelta(days=30),
-            expiry_date__gte=end_date
-        ).count()
+        expiring_licenses = expiring_licenses_queryset(end_date.date(), days=30).count()
         
         # Town Statistics
         total_towns = Town.objects.count()
@@ -177,6 +180,7 @@ def admin_reports_summary_view(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def admin_user_registrations_report_view(request):
     """
     Get user registrations report
@@ -242,6 +246,7 @@ def admin_user_registrations_report_view(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def admin_complaints_report_view(request):
     """
     Get complaints report
@@ -339,6 +344,7 @@ def admin_complaints_report_view(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def admin_business_licenses_report_view(request):
     """
     Get business licenses report
@@ -382,11 +388,7 @@ def admin_business_licenses_report_view(request):
         
         # Expiring soon (next 30 days)
         end_date = timezone.now().date()
-        expiring_soon = BusinessLicense.objects.filter(
-            status='approved',
-            expiry_date__lte=end_date + timedelta(days=30),
-            expiry_date__gte=end_date
-        ).count()
+        expiring_soon = expiring_licenses_queryset(end_date, days=30).count()
         
         return Response({
             'licenses': license_data,
@@ -404,8 +406,10 @@ def admin_business_licenses_report_view(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@query_budget(6)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def admin_town_statistics_report_view(request):
     """
     Get town-level statistics report
@@ -419,26 +423,39 @@ def admin_town_statistics_report_view(request):
     try:
         towns = Town.objects.all().order_by('name')
         
+        # Two grouped queries instead of six counts per town
+        user_counts = {
+            row['town_id']: row
+            for row in UserProfile.objects.filter(town__isnull=False).values('town_id').annotate(
+                total=Count('id'),
+                citizens=Count('id', filter=Q(role='citizen')),
+                businesses=Count('id', filter=Q(role='business')),
+                government=Count('id', filter=Q(role='government')),
+            )
+        }
+        complaint_counts = {
+            row['town_id']: row
+            for row in CitizenComplaint.objects.filter(town__isnull=False).values('town_id').annotate(
+                total=Count('id'),
+                resolved=Count('id', filter=Q(status='resolved')),
+            )
+        }
+        
         town_stats = []
         for town in towns:
-            # Count users by town
-            users_count = UserProfile.objects.filter(town=town).count()
-            citizens_count = UserProfile.objects.filter(town=town, role='citizen').count()
-            businesses_count = UserProfile.objects.filter(town=town, role='business').count()
-            government_count = UserProfile.objects.filter(town=town, role='government').count()
-            
-            # Count complaints by town
-            complaints_count = CitizenComplaint.objects.filter(town=town).count()
-            resolved_complaints = CitizenComplaint.objects.filter(town=town, status='resolved').count()
+            users = user_counts.get(town.id, {})
+            complaints = complaint_counts.get(town.id, {})
+            complaints_count = complaints.get('total', 0)
+            resolved_complaints = complaints.get('resolved', 0)
             
             town_stats.append({
                 'town_id': town.id,
                 'town_name': town.name,
                 'users': {
-                    'total': users_count,
-                    'citizens': citizens_count,
-                    'businesses': businesses_count,
-                    'government': government_count,
+                    'total': users.get('total', 0),
+                    'citizens': users.get('citizens', 0),
+                    'businesses': users.get('businesses', 0),
+                    'government': users.get('government', 0),
                 },
                 'complaints': {
                     'total': complaints_count,
@@ -460,3 +477,66 @@ def admin_town_statistics_report_view(request):
             'error': f'An error occurred: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def admin_throttle_metrics_view(request):
+    """
+    Throttle hit counters per scope
+    Returns allowed/throttled totals summed over every worker on the host when
+    METRICS_MULTIPROC_DIR is set ('aggregated': true), otherwise for the serving worker only
+    """
+    if not check_admin_access(request.user):
+        return Response({
+            'error': 'Access denied. Admin access required.'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    return Response({
+        'backend': backend_name(),
+        'aggregated': bool(settings.METRICS_MULTIPROC_DIR),
+        'scopes': throttle_metrics.snapshot(),
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def admin_db_connections_view(request):
+    """
+    Database connection settings for this worker process, per database alias
+    Returns pool size, connections in use, waiting requests and saturation when pooling is enabled
+    """
+    if not check_admin_access(request.user):
+        return Response({
+            'error': 'Access denied. Admin access required.'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    try:
+        return Response({
+            'mode': settings.DB_CONN_MODE,
+            'databases': connection_stats(),
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Error getting database connection stats: {str(e)}")
+        return Response({
+            'error': f'An error occurred: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def admin_query_budget_view(request):
+    """
+    Latest requests that exceeded their query budget in this worker process
+    Returns query counts, database time and the most repeated statements per request
+    """
+    if not check_admin_access(request.user):
+        return Response({
+            'error': 'Access denied. Admin access required.'
+        }, status=status.HTTP_403_FORBIDDEN)
+    
+    return Response({
+        'default_budget': settings.QUERY_BUDGET,
+        'strict': settings.QUERY_BUDGET_STRICT,
+        'violations': recent_violations.snapshot(),
+    }, status=status.HTTP_200_OK)
@@ -5,17 +5,18 @@ Handles login, logout, and signup operations
 
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes, throttle_classes
-from rest_framework.throttling import UserRateThrottle
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.authtoken.models import Token
-from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
 from django.db import transaction
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError as DjangoValidationError
 from .models import UserProfile
+from .authentication import issue_token
+from .login import check_login, client_ip, TOO_MANY_FAILURES
+from .throttling import LoginThrottle, SignupThrottle
 from .serializers import LoginSerializer, SignupSerializer, AdminLoginSerializer
 from citizen.models import CitizenProfile
 from businessowner.models import BusinessOwnerProfile
@@ -26,14 +27,15 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-class LoginThrottle(UserRateThrottle):
-    """Custom throttle for login endpoint"""
-    scope = 'login'
-
-
-class SignupThrottle(UserRateThrottle):
-    """Custom throttle for signup endpoint"""
-    scope = 'signup'
+def login_failed_response(error):
+    """Response for a failed check_login result"""
+    if error == TOO_MANY_FAILURES:
+        return Response({
+            'error': 'Too many failed login attempts. Please try again later.'
+        }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+    return Response({
+        'error': 'Invalid credentials'
+    }, status=status.HTTP_401_UNAUTHORIZED)
 
 
 @api_view(['POST'])
@@ -52,14 +54,12 @@ def login_view(request):
     password = serializer.validated_data['password']
     user_type = serializer.validated_data['userType']
     
-    user = authenticate(username=email, password=password)
-    if not user:
-        return Response({
-            'error': 'Invalid credentials'
-        }, status=status.HTTP_401_UNAUTHORIZED)
+    user, error = check_login(email, password, client_ip(request))
+    if error:
+        return login_failed_response(error)
     
     try:
-        profile = UserProfile.objects.get(user=user)
+        profile = user.userprofile
     except UserProfile.DoesNotExist:
         return Response({
             'error': 'User profile not found. Please complete your registration.'
@@ -85,7 +85,7 @@ def login_view(request):
                 'message': 'Your account is pending approval from government officials.'
             }, status=status.HTTP_403_FORBIDDEN)
     
-    token, created = Token.objects.get_or_create(user=user)
+    token = issue_token(user)
     effective_role = user_type if is_superuser else profile.role
     
     return Response({
@@ -196,7 +196,7 @@ def signup_view(request):
 def logout_view(request):
     """Handle user logout"""
     try:
-        request.user.auth_token.delete()
+        Token.objects.filter(user=request.user).delete()
         return Response({
             'message': 'Logout successful'
         }, status=status.HTTP_200_OK)
@@ -222,18 +222,16 @@ def admin_login_view(request):
     email = serializer.validated_data['email']
     password = serializer.validated_data['password']
     
-    user = authenticate(username=email, password=password)
-    if not user:
-        return Response({
-            'error': 'Invalid credentials'
-        }, status=status.HTTP_401_UNAUTHORIZED)
+    user, error = check_login(email, password, client_ip(request))
+    if error:
+        return login_failed_response(error)
     
     if not user.is_superuser:
         return Response({
             'error': 'Access denied. Admin access required.'
         }, status=status.HTTP_403_FORBIDDEN)
     
-    token, created = Token.objects.get_or_create(user=user)
+    token = issue_token(user)
     
     return Response({
         'token': token.key,
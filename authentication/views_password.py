@@ -10,6 +10,7 @@ from rest_framework import status
 from django.contrib.auth import update_session_auth_hash
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError as DjangoValidationError
+from .authentication import invalidate_user_tokens
 import logging
 
 logger = logging.getLogger(__name__)
@@ -75,6 +76,9 @@ def change_password_view(request):
         # Update session to prevent logout
         update_session_auth_hash(request, request.user)
         
+        # Cached principals hold the old password hash
+        invalidate_user_tokens([request.user.id])
+        
         return Response({
             'message': 'Password changed successfully'
         }, status=status.HTTP_200_OK)
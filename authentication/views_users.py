@@ -9,11 +9,15 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from django.contrib.auth.models import User
+from django.db import transaction
 from django.utils import timezone
 from .models import UserProfile
 from citizen.models import CitizenProfile
 from businessowner.models import BusinessOwnerProfile
 from government.models import GovernmentOfficial
+from government.views_utils import parse_bulk_ids
+from .authentication import invalidate_user_tokens
+from townhall_project.db_routers import replica_reads
 import logging
 
 logger = logging.getLogger(__name__)
@@ -109,6 +113,7 @@ def user_profile_view(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def users_list_view(request):
     """List users with filters (GET /users/?status=pending or /users/)"""
     try:
@@ -406,3 +411,80 @@ def deactivate_user_action(request, target_user, target_profile, is_superuser):
 
 
 
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_user_action_view(request):
+    """
+    Approve, reject or deactivate many users at once
+    Body: {"user_ids": [...], "status": "approved" | "rejected" | "deactivate"}
+    Permissions are checked once; changes are applied with set-based updates.
+    """
+    try:
+        action = request.data.get('status') or request.data.get('action')
+        if action not in ['approved', 'rejected', 'deactivate']:
+            return Response({
+                'error': 'Invalid action. Use status: "approved", "rejected", or "deactivate"'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        user_ids, error = parse_bulk_ids(request.data, 'user_ids')
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        
+        profiles = UserProfile.objects.filter(user_id__in=user_ids)
+        if not request.user.is_superuser:
+            try:
+                actor_profile = UserProfile.objects.get(user=request.user)
+                gov_official = GovernmentOfficial.objects.get(user=request.user)
+            except (UserProfile.DoesNotExist, GovernmentOfficial.DoesNotExist):
+                return Response({
+                    'error': 'Permission denied'
+                }, status=status.HTTP_403_FORBIDDEN)
+            if actor_profile.role != 'government' or not gov_official.can_approve_users:
+                return Response({
+                    'error': 'You do not have permission to manage users'
+                }, status=status.HTTP_403_FORBIDDEN)
+            profiles = profiles.filter(town=actor_profile.town)
+        
+        if action == 'approved':
+            profiles = profiles.filter(is_approved=False)
+        
+        with transaction.atomic():
+            target_ids = list(profiles.select_for_update().values_list('user_id', flat=True))
+            
+            if action == 'approved':
+                now = timezone.now()
+                UserProfile.objects.filter(user_id__in=target_ids).update(
+                    is_approved=True,
+                    approved_by=request.user,
+                    approved_at=now,
+                    updated_at=now,
+                )
+                has_token = set(Token.objects.filter(user_id__in=target_ids).values_list('user_id', flat=True))
+                Token.objects.bulk_create([
+                    Token(user_id=user_id, key=Token.generate_key())
+                    for user_id in target_ids if user_id not in has_token
+                ])
+            elif action == 'rejected':
+                User.objects.filter(id__in=target_ids).delete()
+            else:
+                UserProfile.objects.filter(user_id__in=target_ids).update(
+                    is_approved=False,
+                    updated_at=timezone.now(),
+                )
+                User.objects.filter(id__in=target_ids).update(is_active=False)
+                # .update() skips the post_save signal that drops cached tokens
+                invalidate_user_tokens(target_ids)
+        
+        processed = set(target_ids)
+        return Response({
+            'message': f'{len(processed)} user(s) processed',
+            'processed': sorted(processed),
+            'skipped': [user_id for user_id in user_ids if user_id not in processed],
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Error in bulk user action: {str(e)}")
+        return Response({
+            'error': f'An error occurred: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
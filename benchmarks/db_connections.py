@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Database connection mode benchmark
+Replays the request cycle (request_started -> query -> request_finished) under each DB_CONN_MODE
+and reports per-request latency, so the cost of opening a connection per request is visible.
+
+    python benchmarks/db_connections.py                      # all modes against the configured database
+    python benchmarks/db_connections.py --mode pool --threads 16 --requests 500
+
+Each mode runs in its own process because the mode is read when settings are imported.
+The 'pool' mode needs psycopg 3 with the pool extra and a PostgreSQL database.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = ['none', 'persistent', 'pool']
+
+
+def percentile(values, pct):
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[pct - 1]
+
+
+def run_worker(args):
+    """Child process: time simulated requests under the DB_CONN_MODE in the environment"""
+    sys.path.insert(0, BASE_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'townhall_project.settings')
+    import django
+    django.setup()
+
+    from django.core.signals import request_finished, request_started
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+    from towns.models import Town
+    from townhall_project.db_connections import connection_stats
+
+    opened = []
+    connection_created.connect(lambda sender, connection, **kwargs: opened.append(connection.alias), weak=False)
+
+    def one_request(_):
+        started = time.perf_counter()
+        request_started.send(sender=None)
+        try:
+            list(Town.objects.filter(is_active=True).values('id', 'name')[:20])
+        finally:
+            request_finished.send(sender=None)
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        started = time.perf_counter()
+        latencies = list(executor.map(one_request, range(args.requests)))
+        elapsed = time.perf_counter() - started
+
+    print(json.dumps({
+        'mode': os.environ.get('DB_CONN_MODE'),
+        'requests': len(latencies),
+        'elapsed': elapsed,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'connections_opened': len(opened),
+        'pool': connection_stats()['default']['pool'],
+    }))
+    connections.close_all()
+
+
+def run_mode(mode, args):
+    env = dict(os.environ, DB_CONN_MODE=mode)
+    command = [
+        sys.executable, os.path.abspath(__file__), '--worker',
+        '--requests', str(args.requests), '--threads', str(args.threads),
+    ]
+    result = subprocess.run(command, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        error = (result.stderr.strip().splitlines() or ['unknown error'])[-1]
+        return {'mode': mode, 'error': error}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare per-request latency of database connection modes')
+    parser.add_argument('--mode', action='append', choices=MODES, help='Mode to run (repeatable, defaults to all)')
+    parser.add_argument('--requests', type=int, default=1000, help='Simulated requests per mode')
+    parser.add_argument('--threads', type=int, default=8, help='Concurrent worker threads')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    print(f'{"mode":<12}{"req/s":>10}{"p50 ms":>10}{"p95 ms":>10}{"opened":>9}{"pool size":>16}')
+    for mode in args.mode or MODES:
+        result = run_mode(mode, args)
+        if 'error' in result:
+            print(f'{mode:<12}  failed: {result["error"]}')
+            continue
+        pool = result['pool']
+        pool_use = f'{pool["size"]}/{pool["max_size"]} ({pool["requests_queued"]} queued)' if pool else '-'
+        print(
+            f'{mode:<12}{result["requests"] / result["elapsed"]:>10.1f}{result["p50_ms"]:>10.2f}'
+            f'{result["p95_ms"]:>10.2f}{result["connections_opened"]:>9}{pool_use:>16}'
+        )
+
+
+if __name__ == '__main__':
+    main()
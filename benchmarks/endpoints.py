@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+"""
+Endpoint benchmark suite
+Drives key read endpoints through the Django test client against a seeded database
+and reports latency percentiles and SQL query counts per endpoint.
+
+    python manage.py seed_scale --users 20000 --complaints 200000   # once
+    python benchmarks/endpoints.py
+    python benchmarks/endpoints.py --requests 200 --only bills --json results.json
+    python benchmarks/endpoints.py --baseline results.json            # exit 1 on regression
+
+Requests go through the full middleware, authentication and throttling stack but no
+network or server, so the numbers isolate the application and the database.
+Each request is made by one of --users-per-role seeded accounts in turn, which keeps
+every account under the per-user throttle rate.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (name, role, path); the admin role is the seeded superuser
+SCENARIOS = [
+    ('towns_active', 'anonymous', '/api/towns/active/'),
+    ('announcements', 'citizen', '/api/government/announcements/'),
+    ('bills', 'citizen', '/api/government/bills/'),
+    ('bills_by_votes', 'citizen', '/api/government/bills/?sort=votes'),
+    ('citizen_complaints', 'citizen', '/api/citizen/complaints/'),
+    ('citizen_notifications', 'citizen', '/api/citizen/notifications/'),
+    ('business_events', 'business', '/api/business/events/'),
+    ('business_notifications', 'business', '/api/business/notifications/'),
+    ('government_licenses', 'government', '/api/government/licenses/'),
+    ('government_officials', 'admin', '/api/government/officials/'),
+    ('reports_summary', 'admin', '/api/auth/admin/reports/summary/'),
+    ('reports_towns', 'admin', '/api/auth/admin/reports/towns/'),
+]
+
+# A p95 latency or median query count this much above the baseline counts as a regression
+DEFAULT_TOLERANCE = 0.2
+
+
+def percentile(values, pct):
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[pct - 1]
+
+
+def setup_django():
+    sys.path.insert(0, BASE_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'townhall_project.settings')
+    import django
+    django.setup()
+    # Lets the test client's 'testserver' host through ALLOWED_HOSTS
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+
+
+def load_credentials(users_per_role, seed):
+    """Authorization headers of seeded accounts, per role"""
+    from django.contrib.auth.models import User
+    from authentication.authentication import issue_token
+    from towns.management.commands.seed_scale import SEED_EMAIL_DOMAIN
+
+    rng = random.Random(seed)
+    seeded = User.objects.filter(email__endswith=f'@{SEED_EMAIL_DOMAIN}', is_active=True)
+    credentials = {'anonymous': [{}]}
+    for role in ['citizen', 'business', 'government']:
+        ids = list(
+            seeded.filter(userprofile__role=role, userprofile__is_approved=True).order_by('id').values_list('id', flat=True)
+        )
+        users = User.objects.filter(id__in=rng.sample(ids, min(users_per_role, len(ids))))
+        credentials[role] = [{'HTTP_AUTHORIZATION': f'Token {issue_token(user).key}'} for user in users]
+    credentials['admin'] = [
+        {'HTTP_AUTHORIZATION': f'Token {issue_token(user).key}'} for user in seeded.filter(is_superuser=True)
+    ]
+    return credentials
+
+
+def run_scenario(client, path, headers, requests, warmup):
+    latencies, queries, failures = [], [], 0
+    budget = None
+    # Every account makes at least one unmeasured request, so token cache misses are not measured
+    warmup = max(warmup, len(headers))
+    for number in range(warmup + requests):
+        extra = dict(headers[number % len(headers)])
+        if not extra:
+            # Anonymous requests are throttled per address, so give each its own
+            extra['REMOTE_ADDR'] = f'10.{number // 65536 % 256}.{number // 256 % 256}.{number % 256}'
+        started = time.perf_counter()
+        response = client.get(path, **extra)
+        elapsed = time.perf_counter() - started
+        if number < warmup:
+            continue
+        latencies.append(elapsed * 1000)
+        stats = getattr(response.wsgi_request, 'query_stats', None)
+        queries.append(stats.count if stats else 0)
+        budget = getattr(response.wsgi_request, 'query_budget', None)
+        if not 200 <= response.status_code < 300:
+            failures += 1
+    return {
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'queries_median': statistics.median(queries),
+        'queries_max': max(queries),
+        'query_budget': budget,
+        'non_2xx': failures,
+        'requests': requests,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Scenarios whose p95 latency or median query count grew beyond the tolerance"""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        for metric in ['p95_ms', 'queries_median']:
+            if result[metric] > before[metric] * (1 + tolerance):
+                regressions.append(f'{name}: {metric} {before[metric]} -> {result[metric]}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=100, help='Measured requests per endpoint (default: 100)')
+    parser.add_argument('--warmup', type=int, default=5, help='Unmeasured requests per endpoint first, at least one per account (default: 5)')
+    parser.add_argument('--users-per-role', type=int, default=50, help='Seeded accounts to rotate through (default: 50)')
+    parser.add_argument('--only', action='append', help='Run only scenarios whose name contains this (repeatable)')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for picking accounts (default: 42)')
+    parser.add_argument('--json', help='Write the results to this file')
+    parser.add_argument('--baseline', help='Results file of an earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Allowed growth over the baseline (default: {DEFAULT_TOLERANCE})')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import Client
+
+    credentials = load_credentials(args.users_per_role, args.seed)
+    client = Client()
+    scenarios = [
+        scenario for scenario in SCENARIOS
+        if not args.only or any(part in scenario[0] for part in args.only)
+    ]
+
+    results = {}
+    print(f'{"endpoint":<24}{"p50 ms":>9}{"p95 ms":>9}{"queries":>9}{"max":>6}{"budget":>8}{"non-2xx":>9}')
+    for name, role, path in scenarios:
+        if not credentials[role]:
+            print(f'{name:<24}  skipped: no seeded {role} accounts (run manage.py seed_scale)')
+            continue
+        result = results[name] = run_scenario(client, path, credentials[role], args.requests, args.warmup)
+        budget = '-' if result['query_budget'] is None else result['query_budget']
+        print(
+            f'{name:<24}{result["p50_ms"]:>9.1f}{result["p95_ms"]:>9.1f}{result["queries_median"]:>9g}'
+            f'{result["queries_max"]:>6}{budget:>8}{result["non_2xx"]:>9}'
+        )
+
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(results, handle, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            regressions = compare(results, json.load(handle), args.tolerance)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
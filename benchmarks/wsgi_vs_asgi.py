@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+WSGI vs ASGI load test
+Fires concurrent GET requests at a running server and reports throughput and latency.
+
+Start the same code base under each server, then point this script at it:
+
+    # WSGI (sync views, one thread per in-flight request)
+    gunicorn townhall_project.wsgi:application -w 4 --threads 8 -b 127.0.0.1:8001
+
+    # ASGI (async read views from townhall_project.urls_asgi)
+    uvicorn townhall_project.asgi:application --workers 4 --port 8002
+
+    python benchmarks/wsgi_vs_asgi.py --url http://127.0.0.1:8001 --token <token>
+    python benchmarks/wsgi_vs_asgi.py --url http://127.0.0.1:8002 --token <token>
+
+Raise the anon/user throttle rates first, or most responses will be 429s.
+Only the standard library is used, so it can run from any environment.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+# Read endpoints that have async versions under ASGI
+DEFAULT_PATHS = [
+    '/api/government/announcements/',
+    '/api/government/bills/',
+    '/api/citizen/notifications/',
+    '/api/towns/active/',
+]
+
+
+async def fetch(host, port, path, headers):
+    """One HTTP/1.1 request on a fresh connection; returns the status code"""
+    reader, writer = await asyncio.open_connection(host, port)
+    lines = [f'GET {path} HTTP/1.1', f'Host: {host}', 'Connection: close']
+    lines += [f'{name}: {value}' for name, value in headers.items()]
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+    await writer.drain()
+    status_line = await reader.readline()
+    await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return int(status_line.split()[1])
+
+
+async def worker(host, port, paths, headers, deadline, latencies, statuses):
+    index = 0
+    while time.perf_counter() < deadline:
+        path = paths[index % len(paths)]
+        index += 1
+        started = time.perf_counter()
+        try:
+            status = await fetch(host, port, path, headers)
+        except (OSError, ValueError, IndexError):
+            status = 0
+        latencies.append(time.perf_counter() - started)
+        statuses[status] = statuses.get(status, 0) + 1
+
+
+def percentile(values, pct):
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[pct - 1]
+
+
+async def run(args):
+    target = urlsplit(args.url)
+    host, port = target.hostname, target.port or 80
+    headers = {'Authorization': f'Token {args.token}'} if args.token else {}
+    paths = args.path or DEFAULT_PATHS
+    latencies, statuses = [], {}
+
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*[
+        worker(host, port, paths, headers, deadline, latencies, statuses)
+        for _ in range(args.concurrency)
+    ])
+    elapsed = time.perf_counter() - started
+
+    print(f'Target:       {args.url} ({len(paths)} paths, concurrency {args.concurrency})')
+    print(f'Requests:     {len(latencies)} in {elapsed:.1f}s')
+    print(f'Throughput:   {len(latencies) / elapsed:.1f} req/s')
+    print(f'Latency p50:  {percentile(latencies, 50) * 1000:.1f} ms')
+    print(f'Latency p95:  {percentile(latencies, 95) * 1000:.1f} ms')
+    print(f'Status codes: {dict(sorted(statuses.items()))}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare WSGI and ASGI deployments of the read API')
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help='Server base URL')
+    parser.add_argument('--path', action='append', help='Path to request (repeatable, defaults to the async read endpoints)')
+    parser.add_argument('--token', default='', help='API token sent as "Authorization: Token <token>"')
+    parser.add_argument('--concurrency', type=int, default=50, help='Concurrent connections')
+    parser.add_argument('--duration', type=float, default=15.0, help='Seconds to run')
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+License Expiry Engine
+Finds expiring and expired licenses through the (status, expiry_date) index and notifies owners
+"""
+
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from .models import BusinessLicense, BusinessNotification
+
+# Owners are reminded this many days before a license expires
+EXPIRY_REMINDER_DAYS = 30
+
+# Licenses processed per UPDATE / bulk_create round trip
+SWEEP_BATCH_SIZE = 500
+
+
+def expiring_licenses(today=None, days=EXPIRY_REMINDER_DAYS):
+    """Approved licenses expiring within the next `days` days"""
+    today = today or timezone.now().date()
+    return BusinessLicense.objects.filter(
+        status='approved',
+        expiry_date__gte=today,
+        expiry_date__lte=today + timedelta(days=days),
+    )
+
+
+def _sweep(queryset, update, build_notification, batch_size):
+    """
+    Process a queryset in batches: lock a batch, apply one UPDATE, bulk-create notifications.
+    `update` must move rows out of `queryset` so the next batch picks up new rows.
+    """
+    processed = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                queryset.select_for_update(skip_locked=True)
+                .order_by('expiry_date', 'id')
+                .values('id', 'business_owner_id', 'license_type', 'license_number', 'expiry_date')[:batch_size]
+            )
+            if not batch:
+                break
+            BusinessLicense.objects.filter(id__in=[row['id'] for row in batch]).update(
+                updated_at=timezone.now(), **update
+            )
+            BusinessNotification.objects.bulk_create([build_notification(row) for row in batch])
+        processed += len(batch)
+        if len(batch) < batch_size:
+            break
+    return processed
+
+
+def expire_licenses(today=None, batch_size=SWEEP_BATCH_SIZE):
+    """Mark approved licenses past their expiry date as expired and notify owners"""
+    today = today or timezone.now().date()
+    queryset = BusinessLicense.objects.filter(status='approved', expiry_date__lt=today)
+    return _sweep(
+        queryset,
+        {'status': 'expired'},
+        lambda row: BusinessNotification(
+            business_owner_id=row['business_owner_id'],
+            notification_type='license_expired',
+            title='License Expired',
+            message=f'Your license "{row["license_type"]}" ({row["license_number"]}) expired on {row["expiry_date"]:%Y-%m-%d}. Apply for a renewal to keep operating.',
+            related_license_id=row['id'],
+        ),
+        batch_size,
+    )
+
+
+def remind_expiring_licenses(today=None, days=EXPIRY_REMINDER_DAYS, batch_size=SWEEP_BATCH_SIZE):
+    """Notify owners once per expiry date about licenses that expire soon"""
+    queryset = expiring_licenses(today, days).filter(
+        Q(expiry_reminder_sent_for__isnull=True) | ~Q(expiry_reminder_sent_for=F('expiry_date'))
+    )
+    return _sweep(
+        queryset,
+        {'expiry_reminder_sent_for': F('expiry_date')},
+        lambda row: BusinessNotification(
+            business_owner_id=row['business_owner_id'],
+            notification_type='license_expiring',
+            title='License Expiring Soon',
+            message=f'Your license "{row["license_type"]}" ({row["license_number"]}) expires on {row["expiry_date"]:%Y-%m-%d}.',
+            related_license_id=row['id'],
+        ),
+        batch_size,
+    )
@@ -0,0 +1,70 @@
+"""
+License Number Allocator
+Sequence-backed, per-town and per-year license numbers with a Luhn check digit
+"""
+
+from django.db import connection, transaction
+from django.utils import timezone
+from .models import LicenseNumberSequence
+
+
+def luhn_check_digit(digits):
+    """Luhn (mod 10) check digit for a string of digits"""
+    total = 0
+    for index, char in enumerate(reversed(digits)):
+        value = int(char)
+        if index % 2 == 0:
+            value *= 2
+            if value > 9:
+                value -= 9
+        total += value
+    return str((10 - total % 10) % 10)
+
+
+def format_license_number(scope, year, value):
+    """LIC-<town:4>-<year>-<sequence:6><check digit>"""
+    body = f'{int(scope):04d}{year:04d}{value:06d}'
+    return f'LIC-{int(scope):04d}-{year:04d}-{value:06d}{luhn_check_digit(body)}'
+
+
+def is_valid_license_number(number):
+    """Validate the check digit of a number produced by format_license_number"""
+    parts = number.split('-')
+    if len(parts) != 4 or parts[0] != 'LIC' or not all(part.isdigit() for part in parts[1:]):
+        return False
+    digits = parts[1] + parts[2] + parts[3]
+    return luhn_check_digit(digits[:-1]) == digits[-1]
+
+
+def _reserve(scope, year, count):
+    """
+    Atomically advance a sequence by `count` in one statement and return its new value.
+    The upsert takes the row lock, so concurrent callers always get disjoint ranges.
+    """
+    table = connection.ops.quote_name(LicenseNumberSequence._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} (scope, year, last_value) VALUES (%s, %s, %s) '
+            f'ON CONFLICT (scope, year) DO UPDATE SET last_value = {table}.last_value + EXCLUDED.last_value '
+            f'RETURNING last_value',
+            [scope, year, count],
+        )
+        return cursor.fetchone()[0]
+
+
+def allocate_license_numbers(town, count=1, year=None):
+    """
+    Allocate `count` consecutive license numbers for a town (None for no town).
+    Returns: list of formatted license numbers
+    """
+    scope = str(town.id if town else 0)
+    year = year or timezone.now().year
+    with transaction.atomic():
+        last_value = _reserve(scope, year, count)
+    first_value = last_value - count + 1
+    return [format_license_number(scope, year, value) for value in range(first_value, last_value + 1)]
+
+
+def allocate_license_number(town, year=None):
+    """Allocate a single license number for a town"""
+    return allocate_license_numbers(town, 1, year)[0]
@@ -0,0 +1,34 @@
+"""
+Django management command to keep bookable service slots generated ahead of time
+Usage: python manage.py generate_service_slots [--days 60]
+Run daily (e.g. from cron) so the availability API always finds slots to list.
+"""
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from businessowner.models import BusinessService
+from businessowner.slots import ensure_slots, SLOT_HORIZON_DAYS
+
+
+class Command(BaseCommand):
+    help = 'Generate service slots from opening hours for the coming days'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=SLOT_HORIZON_DAYS,
+            help=f'Days ahead to generate, starting today (default: {SLOT_HORIZON_DAYS})',
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        end_date = today + timedelta(days=options['days'] - 1)
+        services = BusinessService.objects.filter(is_active=True, opening_hours__isnull=False).distinct()
+        count = 0
+        for service in services.iterator():
+            ensure_slots(service, today, end_date)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated slots through {end_date} for {count} service(s)'
+        ))
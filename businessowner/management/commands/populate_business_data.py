@@ -7,6 +7,8 @@ from django.contrib.auth.models import User
 from django.utils import timezone
 from datetime import date, timedelta
 from businessowner.models import BusinessOwnerProfile, BusinessLicense
+from businessowner.license_numbers import allocate_license_numbers
+from government.utils import get_user_town
 from authentication.models import UserProfile
 import random
 
@@ -126,14 +128,11 @@ class Command(BaseCommand):
             num_licenses = random.randint(2, 4)
             selected_licenses = random.sample(license_types, min(num_licenses, len(license_types)))
             
-            for license_data in selected_licenses:
-                # Generate unique license number
-                license_number = f"LIC-{business_profile.id:04d}-{random.randint(1000, 9999)}"
-                
-                # Check if license number already exists
-                while BusinessLicense.objects.filter(license_number=license_number).exists():
-                    license_number = f"LIC-{business_profile.id:04d}-{random.randint(1000, 9999)}"
-                
+            # Reserve all license numbers for this business in one statement
+            town = get_user_town(business_profile.user)
+            license_numbers = allocate_license_numbers(town, len(selected_licenses))
+            
+            for license_data, license_number in zip(selected_licenses, license_numbers):
                 # Set dates based on status
                 issue_date = None
                 expiry_date = None
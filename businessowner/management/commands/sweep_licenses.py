@@ -0,0 +1,38 @@
+"""
+Django management command to expire licenses and send renewal reminders
+Usage: python manage.py sweep_licenses [--reminder-days 30] [--batch-size 500]
+Safe to run repeatedly (e.g. daily from cron): owners are notified once per expiry date.
+"""
+from django.core.management.base import BaseCommand
+from businessowner.license_expiry import (
+    expire_licenses, remind_expiring_licenses,
+    EXPIRY_REMINDER_DAYS, SWEEP_BATCH_SIZE
+)
+
+
+class Command(BaseCommand):
+    help = 'Expire overdue business licenses and remind owners about upcoming expiries'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reminder-days',
+            type=int,
+            default=EXPIRY_REMINDER_DAYS,
+            help=f'Remind owners this many days before expiry (default: {EXPIRY_REMINDER_DAYS})',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=SWEEP_BATCH_SIZE,
+            help=f'Licenses processed per batch (default: {SWEEP_BATCH_SIZE})',
+        )
+
+    def handle(self, *args, **options):
+        expired = expire_licenses(batch_size=options['batch_size'])
+        reminded = remind_expiring_licenses(
+            days=options['reminder_days'],
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Expired {expired} license(s); sent {reminded} expiry reminder(s)'
+        ))
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:01
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_registered_count(apps, schema_editor):
+    """Seed registered_count from existing registrations"""
+    BusinessEvent = apps.get_model('businessowner', 'BusinessEvent')
+    EventRegistration = apps.get_model('businessowner', 'EventRegistration')
+    counts = (
+        EventRegistration.objects.filter(status='registered')
+        .values('event_id')
+        .annotate(total=models.Count('id'))
+        .order_by()
+    )
+    for row in counts:
+        BusinessEvent.objects.filter(id=row['event_id']).update(registered_count=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businessowner', '0006_alter_businesscomplaint_options_and_more'),
+        ('citizen', '0010_complaintassignment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='businessevent',
+            name='registered_count',
+            field=models.PositiveIntegerField(default=0, help_text='Seats taken by registered attendees (maintained with atomic updates)'),
+        ),
+        migrations.AlterField(
+            model_name='eventregistration',
+            name='registered_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='eventregistration',
+            name='status',
+            field=models.CharField(choices=[('registered', 'Registered'), ('waitlisted', 'Waitlisted'), ('cancelled', 'Cancelled'), ('attended', 'Attended')], default='registered', max_length=15),
+        ),
+        migrations.AddIndex(
+            model_name='eventregistration',
+            index=models.Index(fields=['event', 'status', 'registered_at'], name='businessown_event_i_365557_idx'),
+        ),
+        migrations.RunPython(backfill_registered_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businessowner', '0007_event_capacity_and_waitlist'),
+        ('citizen', '0010_complaintassignment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='businessservice',
+            name='slot_capacity',
+            field=models.PositiveIntegerField(default=1, help_text='Bookings accepted per slot'),
+        ),
+        migrations.AddField(
+            model_name='businessservice',
+            name='slot_duration_minutes',
+            field=models.PositiveIntegerField(default=30, help_text='Length of one bookable slot'),
+        ),
+        migrations.CreateModel(
+            name='ServiceOpeningHours',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekday', models.PositiveSmallIntegerField(choices=[(0, 'Monday'), (1, 'Tuesday'), (2, 'Wednesday'), (3, 'Thursday'), (4, 'Friday'), (5, 'Saturday'), (6, 'Sunday')])),
+                ('opens_at', models.TimeField()),
+                ('closes_at', models.TimeField()),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='opening_hours', to='businessowner.businessservice')),
+            ],
+            options={
+                'ordering': ['weekday', 'opens_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ServiceSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('capacity', models.PositiveIntegerField(default=1)),
+                ('booked_count', models.PositiveIntegerField(default=0)),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slots', to='businessowner.businessservice')),
+            ],
+            options={
+                'ordering': ['date', 'start_time'],
+            },
+        ),
+        migrations.AddField(
+            model_name='servicebooking',
+            name='slot',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='bookings', to='businessowner.serviceslot'),
+        ),
+        migrations.AddConstraint(
+            model_name='servicebooking',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'confirmed'])), fields=('slot', 'citizen'), name='unique_active_booking_per_slot'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='serviceopeninghours',
+            unique_together={('service', 'weekday', 'opens_at')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='serviceslot',
+            unique_together={('service', 'date', 'start_time')},
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businessowner', '0008_service_slots'),
+        ('government', '0010_complaint_routing_and_workload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='businesslicense',
+            name='expiry_notice_sent_for',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='businesslicense',
+            name='expiry_reminder_sent_for',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='businesslicense',
+            name='renewal_of',
+            field=models.ForeignKey(blank=True, help_text='License this application renews', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='renewals', to='businessowner.businesslicense'),
+        ),
+        migrations.AlterField(
+            model_name='businessnotification',
+            name='notification_type',
+            field=models.CharField(choices=[('application_approved', 'Application Approved'), ('application_rejected', 'Application Rejected'), ('event_approved', 'Event Approved'), ('event_rejected', 'Event Rejected'), ('complaint_response', 'Complaint Response'), ('booking_new', 'New Booking'), ('license_expiring', 'License Expiring'), ('license_expired', 'License Expired'), ('general', 'General')], default='general', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='businesslicense',
+            index=models.Index(fields=['status', 'expiry_date'], name='businessown_status_55520a_idx'),
+        ),
+    ]
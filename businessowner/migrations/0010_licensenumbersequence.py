@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businessowner', '0009_license_expiry_and_renewals'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LicenseNumberSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(help_text='Town id, or 0 for licenses without a town', max_length=20)),
+                ('year', models.PositiveSmallIntegerField()),
+                ('last_value', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('scope', 'year')},
+            },
+        ),
+    ]
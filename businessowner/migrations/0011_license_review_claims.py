@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businessowner', '0010_licensenumbersequence'),
+        ('government', '0010_complaint_routing_and_workload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='businesslicense',
+            name='claim_expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='businesslicense',
+            name='claimed_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='claimed_licenses', to='government.governmentofficial'),
+        ),
+        migrations.AddIndex(
+            model_name='businesslicense',
+            index=models.Index(fields=['status', '-fee_paid', 'created_at'], name='businessown_status_de26a3_idx'),
+        ),
+    ]
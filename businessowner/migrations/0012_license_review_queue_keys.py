@@ -0,0 +1,61 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:46
+
+from django.db import migrations, models
+from django.db.models import Case, IntegerField, Value, When
+from django.db.models.functions import TruncDate
+
+# Copy of government.license_queue.LICENSE_TYPE_PRIORITY as of this migration
+LICENSE_TYPE_PRIORITY = {
+    'Health Department Permit': 0,
+    'Food Service Permit': 0,
+    'Business Operating License': 1,
+    'Liquor License': 1,
+    'Construction Permit': 2,
+    'Special Event Permit': 2,
+    'Retail License': 3,
+    'Parking Lot Permit': 3,
+}
+DEFAULT_TYPE_PRIORITY = 5
+
+
+def backfill_queue_keys(apps, schema_editor):
+    """Fill submitted_on and review_priority of existing licenses in two UPDATEs"""
+    BusinessLicense = apps.get_model('businessowner', 'BusinessLicense')
+    BusinessLicense.objects.update(
+        submitted_on=TruncDate('created_at'),
+        review_priority=Case(
+            *[When(license_type=name, then=Value(priority)) for name, priority in LICENSE_TYPE_PRIORITY.items()],
+            default=Value(DEFAULT_TYPE_PRIORITY),
+            output_field=IntegerField(),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businessowner', '0011_license_review_claims'),
+        ('government', '0010_complaint_routing_and_workload'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='businesslicense',
+            name='businessown_status_de26a3_idx',
+        ),
+        migrations.AddField(
+            model_name='businesslicense',
+            name='review_priority',
+            field=models.PositiveSmallIntegerField(default=5, editable=False, help_text='Review priority of the license type (lower first)'),
+        ),
+        migrations.AddField(
+            model_name='businesslicense',
+            name='submitted_on',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_queue_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='businesslicense',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['-fee_paid', 'submitted_on', 'review_priority', 'created_at', 'id'], name='license_review_queue_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businessowner', '0012_license_review_queue_keys'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='businessnotification',
+            name='notification_type',
+            field=models.CharField(choices=[('application_approved', 'Application Approved'), ('application_rejected', 'Application Rejected'), ('event_approved', 'Event Approved'), ('event_rejected', 'Event Rejected'), ('event_cancelled', 'Event Cancelled'), ('complaint_response', 'Complaint Response'), ('booking_new', 'New Booking'), ('license_expiring', 'License Expiring'), ('license_expired', 'License Expired'), ('general', 'General')], default='general', max_length=20),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:09
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businessowner', '0013_notification_event_cancelled'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='businesslicense',
+            name='expiry_notice_sent_for',
+        ),
+    ]
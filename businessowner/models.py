@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 
 class BusinessOwnerProfile(models.Model):
@@ -44,6 +45,18 @@ class BusinessLicense(models.Model):
     fee_paid = models.BooleanField(default=False)
     attachments = models.JSONField(default=list, blank=True, help_text="List of attachment file paths/URLs")
     renewal_required = models.BooleanField(default=False, help_text="Whether this license requires periodic renewal")
+    renewal_of = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='renewals', help_text="License this application renews")
+    
+    # Review queue lease: the official working on this application and until when
+    claimed_by = models.ForeignKey('government.GovernmentOfficial', on_delete=models.SET_NULL, null=True, blank=True, related_name='claimed_licenses')
+    claim_expires_at = models.DateTimeField(null=True, blank=True)
+    # Review queue sort keys, stored (set in save) so license_review_queue_idx can provide the queue order
+    submitted_on = models.DateField(null=True, blank=True, editable=False)
+    review_priority = models.PositiveSmallIntegerField(default=5, editable=False, help_text="Review priority of the license type (lower first)")
+    
+    # Expiry sweeper idempotency marker: the expiry_date a reminder was already sent for.
+    # The expired notice needs none; moving the license to 'expired' takes it out of the sweep.
+    expiry_reminder_sent_for = models.DateField(null=True, blank=True)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -53,11 +66,28 @@ class BusinessLicense(models.Model):
         indexes = [
             models.Index(fields=['business_owner', 'status']),
             models.Index(fields=['status', '-created_at']),
+            models.Index(fields=['status', 'expiry_date']),
+            # Pending applications in review queue order (government.license_queue.queue_ordering)
+            models.Index(
+                fields=['-fee_paid', 'submitted_on', 'review_priority', 'created_at', 'id'],
+                condition=models.Q(status='pending'),
+                name='license_review_queue_idx',
+            ),
         ]
     
     def __str__(self):
         return f"{self.license_type} - {self.business_owner.business_name}"
     
+    def save(self, *args, **kwargs):
+        from government.license_queue import license_type_priority
+        self.review_priority = license_type_priority(self.license_type)
+        if self.submitted_on is None:
+            self.submitted_on = timezone.localdate()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'license_type' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'review_priority'}
+        super().save(*args, **kwargs)
+    
     def is_expired(self):
         """Check if license is expired"""
         if self.expiry_date and self.status == 'approved':
@@ -66,6 +96,19 @@ class BusinessLicense(models.Model):
         return False
 
 
+class LicenseNumberSequence(models.Model):
+    """Per-town, per-year counter backing license number allocation (see license_numbers.py)"""
+    scope = models.CharField(max_length=20, help_text="Town id, or 0 for licenses without a town")
+    year = models.PositiveSmallIntegerField()
+    last_value = models.PositiveBigIntegerField(default=0)
+    
+    class Meta:
+        unique_together = ['scope', 'year']
+    
+    def __str__(self):
+        return f"{self.scope}/{self.year}: {self.last_value}"
+
+
 class BusinessComplaint(models.Model):
     """Model for business-related complaints and issues"""
     STATUS_CHOICES = [
@@ -131,6 +174,10 @@ class BusinessEvent(models.Model):
     location = models.CharField(max_length=200)
     status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='pending')
     max_attendees = models.IntegerField(null=True, blank=True)
+    registered_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Seats taken by registered attendees (maintained with atomic updates)"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -149,6 +196,8 @@ class BusinessService(models.Model):
     category = models.CharField(max_length=100)
     price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     is_active = models.BooleanField(default=True)
+    slot_duration_minutes = models.PositiveIntegerField(default=30, help_text="Length of one bookable slot")
+    slot_capacity = models.PositiveIntegerField(default=1, help_text="Bookings accepted per slot")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -159,6 +208,48 @@ class BusinessService(models.Model):
         return f"{self.service_name} - {self.business_owner.business_name}"
 
 
+class ServiceOpeningHours(models.Model):
+    """Weekly opening window of a business service; slots are generated inside it"""
+    WEEKDAY_CHOICES = [
+        (0, 'Monday'),
+        (1, 'Tuesday'),
+        (2, 'Wednesday'),
+        (3, 'Thursday'),
+        (4, 'Friday'),
+        (5, 'Saturday'),
+        (6, 'Sunday'),
+    ]
+    
+    service = models.ForeignKey(BusinessService, on_delete=models.CASCADE, related_name='opening_hours')
+    weekday = models.PositiveSmallIntegerField(choices=WEEKDAY_CHOICES)
+    opens_at = models.TimeField()
+    closes_at = models.TimeField()
+    
+    class Meta:
+        ordering = ['weekday', 'opens_at']
+        unique_together = ['service', 'weekday', 'opens_at']
+    
+    def __str__(self):
+        return f"{self.service.service_name} - {self.get_weekday_display()} {self.opens_at}-{self.closes_at}"
+
+
+class ServiceSlot(models.Model):
+    """Bookable time slot of a business service with atomic seat accounting"""
+    service = models.ForeignKey(BusinessService, on_delete=models.CASCADE, related_name='slots')
+    date = models.DateField()
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    capacity = models.PositiveIntegerField(default=1)
+    booked_count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['date', 'start_time']
+        unique_together = ['service', 'date', 'start_time']
+    
+    def __str__(self):
+        return f"{self.service.service_name} - {self.date} {self.start_time}"
+
+
 class CitizenBusinessFeedback(models.Model):
     """Model for citizen feedback on businesses"""
     citizen = models.ForeignKey('citizen.CitizenProfile', on_delete=models.CASCADE)
@@ -179,6 +270,7 @@ class EventRegistration(models.Model):
     """Model for citizen event registrations/RSVPs"""
     STATUS_CHOICES = [
         ('registered', 'Registered'),
+        ('waitlisted', 'Waitlisted'),
         ('cancelled', 'Cancelled'),
         ('attended', 'Attended'),
     ]
@@ -186,12 +278,16 @@ class EventRegistration(models.Model):
     event = models.ForeignKey(BusinessEvent, on_delete=models.CASCADE, related_name='registrations')
     citizen = models.ForeignKey('citizen.CitizenProfile', on_delete=models.CASCADE)
     status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='registered')
-    registered_at = models.DateTimeField(auto_now_add=True)
+    registered_at = models.DateTimeField(default=timezone.now)
     notes = models.TextField(blank=True)
     
     class Meta:
         ordering = ['-registered_at']
         unique_together = ['event', 'citizen']  # One registration per citizen per event
+        indexes = [
+            # FIFO waitlist lookup on cancellation
+            models.Index(fields=['event', 'status', 'registered_at']),
+        ]
     
     def __str__(self):
         return f"{self.citizen.user.get_full_name()} - {self.event.title}"
@@ -207,6 +303,7 @@ class ServiceBooking(models.Model):
     ]
     
     service = models.ForeignKey(BusinessService, on_delete=models.CASCADE, related_name='bookings')
+    slot = models.ForeignKey(ServiceSlot, on_delete=models.SET_NULL, null=True, blank=True, related_name='bookings')
     citizen = models.ForeignKey('citizen.CitizenProfile', on_delete=models.CASCADE)
     booking_date = models.DateField()
     booking_time = models.TimeField()
@@ -217,6 +314,14 @@ class ServiceBooking(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        constraints = [
+            # A citizen holds at most one active booking per slot
+            models.UniqueConstraint(
+                fields=['slot', 'citizen'],
+                condition=models.Q(status__in=['pending', 'confirmed']),
+                name='unique_active_booking_per_slot',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.citizen.user.get_full_name()} - {self.service.service_name} on {self.booking_date}"
@@ -229,8 +334,11 @@ class BusinessNotification(models.Model):
         ('application_rejected', 'Application Rejected'),
         ('event_approved', 'Event Approved'),
         ('event_rejected', 'Event Rejected'),
+        ('event_cancelled', 'Event Cancelled'),
         ('complaint_response', 'Complaint Response'),
         ('booking_new', 'New Booking'),
+        ('license_expiring', 'License Expiring'),
+        ('license_expired', 'License Expired'),
         ('general', 'General'),
     ]
     
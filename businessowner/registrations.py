@@ -0,0 +1,103 @@
+"""
+Event Registration Engine
+Atomic seat accounting for business events with a FIFO waitlist
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import BusinessEvent, EventRegistration
+
+# Registration statuses that hold a seat or a waitlist place
+ACTIVE_STATUSES = ['registered', 'waitlisted']
+
+
+def claim_seat(event):
+    """
+    Take one seat with a single conditional UPDATE.
+    The database only increments while registered_count < max_attendees, so
+    concurrent sign-ups can never oversell. Returns True if a seat was taken.
+    """
+    seats = BusinessEvent.objects.filter(id=event.id)
+    if event.max_attendees:
+        seats = seats.filter(registered_count__lt=F('max_attendees'))
+    return seats.update(registered_count=F('registered_count') + 1) == 1
+
+
+def release_seat(event):
+    """Give back one seat"""
+    BusinessEvent.objects.filter(id=event.id, registered_count__gt=0).update(
+        registered_count=F('registered_count') - 1
+    )
+
+
+def register_citizen(event, citizen, notes=''):
+    """
+    Register a citizen for an event, or place them on the waitlist when it is full.
+    A previously cancelled registration is reused (one row per citizen per event).
+    Returns: (registration, error_message)
+    """
+    try:
+        with transaction.atomic():
+            registration = EventRegistration.objects.select_for_update().filter(
+                event=event, citizen=citizen
+            ).first()
+            if registration and registration.status in ACTIVE_STATUSES + ['attended']:
+                return None, 'You are already registered for this event'
+
+            new_status = 'registered' if claim_seat(event) else 'waitlisted'
+            if registration is None:
+                registration = EventRegistration.objects.create(
+                    event=event,
+                    citizen=citizen,
+                    status=new_status,
+                    notes=notes,
+                )
+            else:
+                registration.status = new_status
+                registration.notes = notes
+                registration.registered_at = timezone.now()
+                registration.save(update_fields=['status', 'notes', 'registered_at'])
+            return registration, None
+    except IntegrityError:
+        # A concurrent request from the same citizen created the row first;
+        # the rolled-back transaction also returned any seat we claimed.
+        return None, 'You are already registered for this event'
+
+
+def promote_from_waitlist(event):
+    """
+    Move the longest-waiting citizen into a free seat.
+    Waitlisted rows already locked by another promotion are skipped.
+    Returns: the promoted registration or None
+    """
+    with transaction.atomic():
+        candidate = EventRegistration.objects.select_for_update(skip_locked=True).filter(
+            event=event, status='waitlisted'
+        ).order_by('registered_at', 'id').first()
+        if candidate is None or not claim_seat(event):
+            return None
+        candidate.status = 'registered'
+        candidate.save(update_fields=['status'])
+        return candidate
+
+
+def cancel_registration(registration):
+    """
+    Cancel a registration. Cancelling a seat releases it and promotes the
+    next citizen from the waitlist.
+    Returns: the promoted registration or None
+    """
+    with transaction.atomic():
+        registration = EventRegistration.objects.select_for_update().select_related('event').get(
+            id=registration.id
+        )
+        previous_status = registration.status
+        if previous_status not in ACTIVE_STATUSES:
+            return None
+        registration.status = 'cancelled'
+        registration.save(update_fields=['status'])
+        if previous_status != 'registered':
+            return None
+        release_seat(registration.event)
+        return promote_from_waitlist(registration.event)
@@ -0,0 +1,189 @@
+"""
+Service Slot Engine
+Generates bookable slots from opening hours and reserves them atomically
+"""
+
+from datetime import datetime, timedelta
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from .models import ServiceBooking, ServiceOpeningHours, ServiceSlot
+
+# Longest date range the availability API will materialize in one request
+MAX_AVAILABILITY_DAYS = 31
+
+# Booking statuses that hold a seat in their slot
+ACTIVE_BOOKING_STATUSES = ['pending', 'confirmed']
+
+# Slots exist this many days ahead: written when opening hours change and topped up
+# daily by the generate_service_slots command, so reads never create them
+SLOT_HORIZON_DAYS = 60
+
+
+def _slot_times(opens_at, closes_at, duration_minutes):
+    """Yield (start_time, end_time) pairs that fit fully inside an opening window"""
+    anchor = datetime(2000, 1, 1)
+    start = datetime.combine(anchor, opens_at)
+    close = datetime.combine(anchor, closes_at)
+    step = timedelta(minutes=duration_minutes or 30)
+    while start + step <= close:
+        yield start.time(), (start + step).time()
+        start += step
+
+
+def _planned_slots(service, windows, start_date, end_date):
+    """Yield (date, start_time, end_time) for every slot the opening windows define in the range"""
+    day = start_date
+    while day <= end_date:
+        for hours in windows.get(day.weekday(), []):
+            for start_time, end_time in _slot_times(hours.opens_at, hours.closes_at, service.slot_duration_minutes):
+                yield day, start_time, end_time
+        day += timedelta(days=1)
+
+
+def _opening_windows(service):
+    windows = {}
+    for hours in ServiceOpeningHours.objects.filter(service=service):
+        windows.setdefault(hours.weekday, []).append(hours)
+    return windows
+
+
+def ensure_slots(service, start_date, end_date):
+    """
+    Materialize slots for every opening window between start_date and end_date (inclusive).
+    Existing slots are left untouched, so repeated calls are cheap and booked counts survive.
+    """
+    windows = _opening_windows(service)
+    if not windows:
+        return
+    ServiceSlot.objects.bulk_create([
+        ServiceSlot(
+            service=service,
+            date=day,
+            start_time=start_time,
+            end_time=end_time,
+            capacity=service.slot_capacity,
+        )
+        for day, start_time, end_time in _planned_slots(service, windows, start_date, end_date)
+    ], ignore_conflicts=True)
+
+
+def rebuild_slots(service):
+    """
+    Bring future slots in line with the service's current opening hours.
+    Call inside the transaction that changes the hours. Unbooked slots are
+    regenerated; a booked slot that still fits the new hours is kept, one that
+    no longer fits is removed and its active bookings are cancelled.
+    Returns: the cancelled bookings (with citizen loaded, for notifications)
+    """
+    today = timezone.localdate()
+    end_date = today + timedelta(days=SLOT_HORIZON_DAYS - 1)
+    future = ServiceSlot.objects.filter(service=service, date__gte=today)
+    future.filter(booked_count=0).delete()
+
+    windows = _opening_windows(service)
+    if not windows:
+        # No opening hours: any time can be booked, so existing bookings stay valid
+        return []
+
+    booked = list(future.filter(booked_count__gt=0))
+    last_date = max([slot.date for slot in booked] + [end_date])
+    planned = set(_planned_slots(service, windows, today, last_date))
+    stale_ids = [slot.id for slot in booked if (slot.date, slot.start_time, slot.end_time) not in planned]
+    cancelled = list(ServiceBooking.objects.select_related('citizen', 'service').filter(
+        slot_id__in=stale_ids, status__in=ACTIVE_BOOKING_STATUSES
+    ))
+    ServiceBooking.objects.filter(id__in=[booking.id for booking in cancelled]).update(
+        status='cancelled', updated_at=timezone.now()
+    )
+    ServiceSlot.objects.filter(id__in=stale_ids).delete()
+
+    ensure_slots(service, today, end_date)
+    return cancelled
+
+
+def free_slots(service, start_date, end_date):
+    """
+    Slots in the date range that still have capacity and have not started yet
+    (one query on the service/date index)
+    """
+    now = timezone.localtime()
+    return ServiceSlot.objects.filter(
+        service=service,
+        date__gte=max(start_date, now.date()),
+        date__lte=end_date,
+        booked_count__lt=F('capacity'),
+    ).exclude(
+        Q(date=now.date()) & Q(start_time__lte=now.time())
+    ).order_by('date', 'start_time')
+
+
+def get_slot_for_booking(service, booking_date, booking_time):
+    """
+    Find the slot a booking request refers to.
+    Services with opening hours only accept generated slots; services without
+    opening hours get an ad-hoc slot at the requested time.
+    Returns: (slot, error_message)
+    """
+    if ServiceOpeningHours.objects.filter(service=service).exists():
+        ensure_slots(service, booking_date, booking_date)
+        slot = ServiceSlot.objects.filter(
+            service=service, date=booking_date, start_time=booking_time
+        ).first()
+        if slot is None:
+            return None, 'Requested time is not an available slot for this service'
+        return slot, None
+
+    end_time = (datetime.combine(booking_date, booking_time) + timedelta(minutes=service.slot_duration_minutes)).time()
+    slot, _ = ServiceSlot.objects.get_or_create(
+        service=service,
+        date=booking_date,
+        start_time=booking_time,
+        defaults={'end_time': end_time, 'capacity': service.slot_capacity},
+    )
+    return slot, None
+
+
+def reserve_slot(slot, citizen, notes=''):
+    """
+    Book a slot for a citizen.
+    The seat is taken with one conditional UPDATE and the booking row is
+    protected by a partial unique constraint, so there is no check-then-insert race.
+    Returns: (booking, error_message)
+    """
+    try:
+        with transaction.atomic():
+            taken = ServiceSlot.objects.filter(
+                id=slot.id, booked_count__lt=F('capacity')
+            ).update(booked_count=F('booked_count') + 1)
+            if not taken:
+                return None, 'This slot is fully booked'
+            booking = ServiceBooking.objects.create(
+                service=slot.service,
+                slot=slot,
+                citizen=citizen,
+                booking_date=slot.date,
+                booking_time=slot.start_time,
+                status='pending',
+                notes=notes,
+            )
+            return booking, None
+    except IntegrityError:
+        return None, 'You already have a booking for this slot'
+
+
+def cancel_booking(booking):
+    """Cancel an active booking and return its seat to the slot"""
+    with transaction.atomic():
+        booking = ServiceBooking.objects.select_for_update().filter(
+            id=booking.id, status__in=ACTIVE_BOOKING_STATUSES
+        ).first()
+        if booking is None:
+            return False
+        booking.status = 'cancelled'
+        booking.save(update_fields=['status', 'updated_at'])
+        if booking.slot_id:
+            ServiceSlot.objects.filter(id=booking.slot_id, booked_count__gt=0).update(
+                booked_count=F('booked_count') - 1
+            )
+    return True
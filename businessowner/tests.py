@@ -0,0 +1,310 @@
+"""
+Business Owner Tests
+Concurrency of event seat accounting and the waitlist (businessowner.registrations)
+Bulk event review (businessowner.views_events)
+License expiry sweeps (businessowner.license_expiry)
+License numbers: Luhn check digit and per-town, per-year sequences (businessowner.license_numbers)
+Opening hours, slot availability and booking cancellation (businessowner.views_services, businessowner.slots)
+"""
+
+import threading
+from datetime import date, datetime, time, timedelta
+from unittest import mock
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.utils import timezone
+from authentication.authentication import issue_token
+from authentication.models import UserProfile
+from citizen.models import CitizenProfile
+from towns.ical import get_version
+from towns.models import Town
+from .models import (
+    BusinessEvent, BusinessLicense, BusinessNotification, BusinessOwnerProfile, BusinessService, EventRegistration, ServiceBooking,
+    ServiceSlot,
+)
+from .license_expiry import expire_licenses, remind_expiring_licenses
+from .license_numbers import (
+    allocate_license_number, allocate_license_numbers, format_license_number, is_valid_license_number, luhn_check_digit,
+)
+from .registrations import cancel_registration, register_citizen
+from .slots import get_slot_for_booking, reserve_slot
+
+
+def run_concurrently(target, arguments):
+    """Call target(argument) in one thread per argument, all released at once; returns results in order"""
+    barrier = threading.Barrier(len(arguments))
+    results = [None] * len(arguments)
+    errors = []
+
+    def worker(index, argument):
+        try:
+            barrier.wait()
+            results[index] = target(argument)
+        except Exception as e:  # Reported by the test, not lost in the thread
+            errors.append(e)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker, args=(index, argument)) for index, argument in enumerate(arguments)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return results
+
+
+class EventRegistrationConcurrencyTests(TransactionTestCase):
+    """Threads race for the last seats; select_for_update and the conditional UPDATE need real transactions"""
+
+    SEATS = 3
+    CITIZENS = 10
+
+    def setUp(self):
+        owner_user = User.objects.create_user('owner@example.com', 'owner@example.com', 'pw')
+        owner = BusinessOwnerProfile.objects.create(
+            user=owner_user, business_name='Cafe', business_registration_number='R1',
+            business_type='cafe', business_address='1 Main St',
+        )
+        self.event = BusinessEvent.objects.create(
+            business_owner=owner, title='Open house', description='Tour', location='1 Main St',
+            event_date=date.today() + timedelta(days=7), event_time=time(18, 0),
+            status='approved', max_attendees=self.SEATS,
+        )
+        self.citizens = []
+        for number in range(self.CITIZENS):
+            user = User.objects.create_user(f'c{number}@example.com', f'c{number}@example.com', 'pw')
+            self.citizens.append(CitizenProfile.objects.create(user=user, citizen_id=f'C{number}'))
+
+    def register_all_at_once(self):
+        results = run_concurrently(lambda citizen: register_citizen(self.event, citizen), self.citizens)
+        self.assertEqual([error for _, error in results], [None] * self.CITIZENS)
+
+    def test_concurrent_registrations_never_oversell(self):
+        self.register_all_at_once()
+
+        self.event.refresh_from_db()
+        statuses = list(EventRegistration.objects.filter(event=self.event).values_list('status', flat=True))
+        self.assertEqual(statuses.count('registered'), self.SEATS)
+        self.assertEqual(statuses.count('waitlisted'), self.CITIZENS - self.SEATS)
+        self.assertEqual(self.event.registered_count, self.SEATS)
+
+    def test_concurrent_duplicate_registrations_create_one_row(self):
+        citizen = self.citizens[0]
+        results = run_concurrently(lambda _: register_citizen(self.event, citizen), range(5))
+
+        self.assertEqual(sum(1 for registration, _ in results if registration is not None), 1)
+        self.event.refresh_from_db()
+        self.assertEqual(EventRegistration.objects.filter(event=self.event, citizen=citizen).count(), 1)
+        self.assertEqual(self.event.registered_count, 1)
+
+    def test_cancellations_promote_waitlist_in_arrival_order(self):
+        self.register_all_at_once()
+        # Spread the arrival times so the expected order is unambiguous
+        waitlisted = list(EventRegistration.objects.filter(event=self.event, status='waitlisted').order_by('id'))
+        start = timezone.now() - timedelta(hours=1)
+        for offset, registration in enumerate(reversed(waitlisted)):
+            registration.registered_at = start + timedelta(minutes=offset)
+            registration.save(update_fields=['registered_at'])
+        expected = [registration.id for registration in reversed(waitlisted)][:self.SEATS]
+
+        registered = list(EventRegistration.objects.filter(event=self.event, status='registered'))
+        promoted = run_concurrently(cancel_registration, registered)
+
+        self.assertCountEqual([registration.id for registration in promoted], expected)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.registered_count, self.SEATS)
+        self.assertEqual(EventRegistration.objects.filter(event=self.event, status='registered').count(), self.SEATS)
+        self.assertEqual(
+            list(EventRegistration.objects.filter(event=self.event, status='registered').order_by('registered_at')
+                 .values_list('id', flat=True)),
+            expected,
+        )
+
+
+class BulkEventReviewTests(TestCase):
+
+    def setUp(self):
+        town = Town.objects.create(name='Springfield', slug='springfield', state='NJ')
+        owner_user = User.objects.create_user('owner@example.com', 'owner@example.com', 'pw')
+        UserProfile.objects.create(user=owner_user, role='business', town=town, is_approved=True)
+        owner = BusinessOwnerProfile.objects.create(
+            user=owner_user, business_name='Cafe', business_registration_number='R1',
+            business_type='cafe', business_address='1 Main St',
+        )
+        self.events = [
+            BusinessEvent.objects.create(
+                business_owner=owner, title=f'Event {number}', description='Tour', location='1 Main St',
+                event_date=date.today() + timedelta(days=7), event_time=time(18, 0), status=event_status,
+            )
+            for number, event_status in enumerate(['approved', 'approved', 'cancelled'])
+        ]
+        official = User.objects.create_user('official@example.com', 'official@example.com', 'pw')
+        UserProfile.objects.create(user=official, role='government', town=town, is_approved=True)
+        self.headers = {'HTTP_AUTHORIZATION': f'Token {issue_token(official).key}'}
+
+    def review(self, action):
+        return self.client.post(
+            '/api/business/events/bulk-review/',
+            {'event_ids': [event.id for event in self.events], 'action': action},
+            content_type='application/json', **self.headers,
+        )
+
+    def test_cancel_skips_cancelled_events_and_notifies_once_each(self):
+        response = self.review('cancel')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['message'], '2 event(s) cancelled')
+        self.assertEqual(response.json()['skipped'], [self.events[2].id])
+        notifications = BusinessNotification.objects.order_by('related_event_id')
+        self.assertEqual(
+            [(n.notification_type, n.title) for n in notifications],
+            [('event_cancelled', 'Event Cancelled')] * 2,
+        )
+        self.assertEqual(notifications[0].message, 'Your event "Event 0" has been cancelled by the government.')
+
+    def test_reject_wording(self):
+        self.review('reject')
+        self.assertEqual(
+            set(BusinessNotification.objects.values_list('notification_type', 'title')),
+            {('event_rejected', 'Event Rejected')},
+        )
+
+
+class ServiceOpeningHoursTests(TestCase):
+
+    def setUp(self):
+        owner_user = User.objects.create_user('owner@example.com', 'owner@example.com', 'pw')
+        owner = BusinessOwnerProfile.objects.create(
+            user=owner_user, business_name='Barber', business_registration_number='R1',
+            business_type='barber', business_address='1 Main St',
+        )
+        self.service = BusinessService.objects.create(
+            business_owner=owner, service_name='Haircut', description='Cut', category='care', slot_duration_minutes=60,
+        )
+        citizen_user = User.objects.create_user('citizen@example.com', 'citizen@example.com', 'pw')
+        self.citizen = CitizenProfile.objects.create(user=citizen_user, citizen_id='C1')
+        self.owner_headers = {'HTTP_AUTHORIZATION': f'Token {issue_token(owner_user).key}'}
+        self.citizen_headers = {'HTTP_AUTHORIZATION': f'Token {issue_token(citizen_user).key}'}
+        self.tomorrow = timezone.localdate() + timedelta(days=1)
+
+    def put_hours(self, *windows):
+        return self.client.put(
+            f'/api/business/services/{self.service.id}/opening-hours/',
+            {'opening_hours': [
+                {'weekday': self.tomorrow.weekday(), 'opens_at': opens_at, 'closes_at': closes_at}
+                for opens_at, closes_at in windows
+            ]},
+            content_type='application/json', **self.owner_headers,
+        )
+
+    def test_duplicate_and_overlapping_windows_are_rejected(self):
+        self.assertEqual(self.put_hours(('09:00', '12:00'), ('09:00', '10:00')).status_code, 400)
+        self.assertEqual(self.put_hours(('09:00', '12:00'), ('11:00', '14:00')).status_code, 400)
+        self.assertEqual(self.put_hours(('09:00', '12:00'), ('12:00', '14:00')).status_code, 200)
+
+    def test_cancelled_bookings_invalidate_the_citizens_feed(self):
+        self.put_hours(('09:00', '12:00'))
+        slot, _ = get_slot_for_booking(self.service, self.tomorrow, time(9, 0))
+        booking, _ = reserve_slot(slot, self.citizen)
+        version = get_version(f'user:{self.citizen.user_id}')
+
+        response = self.put_hours(('13:00', '15:00'))
+
+        self.assertEqual(response.json()['cancelled_booking_ids'], [booking.id])
+        self.assertEqual(ServiceBooking.objects.get(id=booking.id).status, 'cancelled')
+        self.assertGreater(get_version(f'user:{self.citizen.user_id}'), version)
+
+    def test_availability_hides_slots_that_have_started(self):
+        day = date(2030, 1, 7)
+        for hour in (9, 10, 11):
+            ServiceSlot.objects.create(service=self.service, date=day, start_time=time(hour), end_time=time(hour + 1))
+        now = timezone.make_aware(datetime(2030, 1, 7, 10, 15))
+
+        with mock.patch('businessowner.slots.timezone.localtime', return_value=now):
+            response = self.client.get(
+                f'/api/business/services/{self.service.id}/availability/?start=2030-01-06&end=2030-01-07',
+                **self.citizen_headers,
+            )
+
+        self.assertEqual([slot['start_time'] for slot in response.json()['slots']], ['11:00'])
+
+
+class LicenseExpirySweepTests(TestCase):
+
+    def setUp(self):
+        owner_user = User.objects.create_user('owner@example.com', 'owner@example.com', 'pw')
+        owner = BusinessOwnerProfile.objects.create(
+            user=owner_user, business_name='Cafe', business_registration_number='R1',
+            business_type='cafe', business_address='1 Main St',
+        )
+        self.today = date(2030, 6, 1)
+        self.expired = BusinessLicense.objects.create(
+            business_owner=owner, license_type='Retail License', license_number='L1',
+            status='approved', expiry_date=self.today - timedelta(days=1),
+        )
+        self.expiring = BusinessLicense.objects.create(
+            business_owner=owner, license_type='Food License', license_number='L2',
+            status='approved', expiry_date=self.today + timedelta(days=10),
+        )
+
+    def test_repeated_sweeps_notify_once_per_license(self):
+        for _ in range(2):
+            expire_licenses(self.today)
+            remind_expiring_licenses(self.today)
+
+        self.assertEqual(
+            sorted(BusinessNotification.objects.values_list('related_license_id', 'notification_type')),
+            [(self.expired.id, 'license_expired'), (self.expiring.id, 'license_expiring')],
+        )
+        self.expired.refresh_from_db()
+        self.assertEqual(self.expired.status, 'expired')
+
+    def test_renewed_expiry_date_is_reminded_again(self):
+        remind_expiring_licenses(self.today)
+        BusinessLicense.objects.filter(id=self.expiring.id).update(expiry_date=self.today + timedelta(days=20))
+        remind_expiring_licenses(self.today)
+        self.assertEqual(BusinessNotification.objects.filter(notification_type='license_expiring').count(), 2)
+
+
+class LicenseNumberFormatTests(SimpleTestCase):
+
+    def test_luhn_check_digit(self):
+        # The textbook example: 7992739871 completes to 79927398713
+        self.assertEqual(luhn_check_digit('7992739871'), '3')
+        self.assertEqual(luhn_check_digit('0'), '0')
+
+    def test_formatted_numbers_validate(self):
+        number = format_license_number('12', 2030, 345)
+        self.assertEqual(number[:-1], 'LIC-0012-2030-000345')
+        self.assertTrue(is_valid_license_number(number))
+
+    def test_typos_are_detected(self):
+        check = format_license_number('12', 2030, 345)[-1]
+        self.assertFalse(is_valid_license_number(f'LIC-0012-2030-000346{check}'))  # Wrong digit
+        self.assertFalse(is_valid_license_number(f'LIC-0012-2030-000354{check}'))  # Swapped digits
+        self.assertFalse(is_valid_license_number('LIC-12-2030'))
+
+
+class LicenseNumberSequenceTests(TransactionTestCase):
+    """The sequence upsert runs in real transactions, like concurrent requests"""
+
+    def setUp(self):
+        self.town = Town.objects.create(name='Springfield', slug='springfield', state='NJ')
+        self.other_town = Town.objects.create(name='Shelbyville', slug='shelbyville', state='NJ')
+
+    def test_sequences_are_per_town_and_year(self):
+        town, other = f'{self.town.id:04d}', f'{self.other_town.id:04d}'
+        self.assertEqual(allocate_license_number(self.town, 2030)[:-1], f'LIC-{town}-2030-000001')
+        self.assertEqual(allocate_license_number(self.town, 2030)[:-1], f'LIC-{town}-2030-000002')
+        self.assertEqual(allocate_license_number(self.town, 2031)[:-1], f'LIC-{town}-2031-000001')
+        self.assertEqual(allocate_license_number(self.other_town, 2030)[:-1], f'LIC-{other}-2030-000001')
+        self.assertEqual(allocate_license_number(None, 2030)[:-1], 'LIC-0000-2030-000001')
+
+    def test_concurrent_allocations_never_overlap(self):
+        batches = run_concurrently(lambda _: allocate_license_numbers(self.town, 5, 2030), range(6))
+        numbers = [number for batch in batches for number in batch]
+        self.assertEqual(len(set(numbers)), 30)
+        self.assertEqual(sorted(int(number.split('-')[3][:-1]) for number in numbers), list(range(1, 31)))
@@ -16,7 +16,9 @@ urlpatterns = [
     # Licenses & Permits - RESTful
     # GET /business/licenses/ - List licenses
     # POST /business/licenses/ - Create license application
+    # POST /business/licenses/<id>/renewals/ - Apply to renew a license
     path('licenses/', views_licenses.list_licenses_view, name='licenses_list'),
+    path('licenses/<int:license_id>/renewals/', views_licenses.renew_license_view, name='license_renewals'),
     
     # Business Complaints - RESTful
     # GET /business/complaints/ - List complaints
@@ -40,18 +42,28 @@ urlpatterns = [
     # GET /business/events/ - List events
     # POST /business/events/ - Create event
     # PATCH /business/events/<id>/ - Review/approve/reject event (government)
+    # POST /business/events/bulk-review/ - Approve/reject/cancel many events (government)
     # POST /business/events/<id>/registrations/ - Register for event
     # GET /business/events/<id>/registrations/ - List event registrations
+    # DELETE /business/events/<id>/registrations/<id>/ - Cancel registration (promotes waitlist)
     path('events/', views_events.list_business_events_view, name='events_list'),
     path('events/<int:event_id>/', views_events.review_business_event_view, name='event_detail'),
+    path('events/bulk-review/', views_events.bulk_review_business_events_view, name='events_bulk_review'),
     path('events/<int:event_id>/registrations/', views_events.register_for_event_view, name='event_registrations'),
+    path('events/<int:event_id>/registrations/<int:registration_id>/', views_events.cancel_event_registration_view, name='event_registration_detail'),
     
     # Business Services - RESTful
     # GET /business/services/ - List services
     # POST /business/services/ - Create service
+    # GET/PUT /business/services/<id>/opening-hours/ - Get or replace weekly opening hours
+    # GET /business/services/<id>/availability/?start=&end= - Free slots in a date range
     # POST /business/service-bookings/ - Book a service
+    # DELETE /business/service-bookings/<id>/ - Cancel booking
     path('services/', views_services.list_business_services_view, name='services_list'),
+    path('services/<int:service_id>/opening-hours/', views_services.service_opening_hours_view, name='service_opening_hours'),
+    path('services/<int:service_id>/availability/', views_services.service_availability_view, name='service_availability'),
     path('service-bookings/', views_services.create_service_booking_view, name='service_bookings_create'),
+    path('service-bookings/<int:booking_id>/', views_services.cancel_service_booking_view, name='service_booking_detail'),
     
     # Citizen Feedback on Businesses - RESTful
     # POST /business/business-feedback/ - Create feedback on business
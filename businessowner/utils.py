@@ -98,16 +98,31 @@ def check_town_access(user, business_owner):
     return True, None
 
 
+# Resulting status of each review action
+REVIEW_ACTION_STATUSES = {
+    'approve': 'approved',
+    'reject': 'rejected',
+    'cancel': 'cancelled',
+}
+
+# Notification type for each resulting event status
+EVENT_NOTIFICATION_TYPES = {
+    'approved': 'event_approved',
+    'rejected': 'event_rejected',
+    'cancelled': 'event_cancelled',
+}
+
+
 def create_license_notification(business_owner, license_obj, action):
     """
     Create notification for license application approval/rejection
     """
-    notification_type = 'application_approved' if action == 'approve' else 'application_rejected'
+    new_status = REVIEW_ACTION_STATUSES[action]
     BusinessNotification.objects.create(
         business_owner=business_owner,
-        notification_type=notification_type,
-        title=f'License Application {action.capitalize()}d',
-        message=f'Your license application "{license_obj.license_type}" has been {action}d by the government.',
+        notification_type=f'application_{new_status}',
+        title=f'License Application {new_status.capitalize()}',
+        message=f'Your license application "{license_obj.license_type}" has been {new_status} by the government.',
         related_license=license_obj,
     )
 
@@ -116,16 +131,52 @@ def create_event_notification(business_owner, event, action):
     """
     Create notification for event approval/rejection/cancellation
     """
-    notification_type = 'event_approved' if action == 'approve' else 'event_rejected'
+    new_status = REVIEW_ACTION_STATUSES[action]
     BusinessNotification.objects.create(
         business_owner=business_owner,
-        notification_type=notification_type,
-        title=f'Event {action.capitalize()}d',
-        message=f'Your event "{event.title}" has been {action}d by the government.',
+        notification_type=EVENT_NOTIFICATION_TYPES[new_status],
+        title=f'Event {new_status.capitalize()}',
+        message=f'Your event "{event.title}" has been {new_status} by the government.',
         related_event=event,
     )
 
 
+def bulk_create_license_notifications(licenses, new_status):
+    """
+    Create approval/rejection notifications for many licenses in one INSERT
+    licenses: iterable of dicts with id, business_owner_id and license_type
+    new_status: 'approved' or 'rejected'
+    """
+    BusinessNotification.objects.bulk_create([
+        BusinessNotification(
+            business_owner_id=license_row['business_owner_id'],
+            notification_type=f'application_{new_status}',
+            title=f'License Application {new_status.capitalize()}',
+            message=f'Your license application "{license_row["license_type"]}" has been {new_status} by the government.',
+            related_license_id=license_row['id'],
+        )
+        for license_row in licenses
+    ])
+
+
+def bulk_create_event_notifications(events, new_status):
+    """
+    Create approval/rejection/cancellation notifications for many events in one INSERT
+    events: iterable of dicts with id, business_owner_id and title
+    new_status: 'approved', 'rejected' or 'cancelled'
+    """
+    BusinessNotification.objects.bulk_create([
+        BusinessNotification(
+            business_owner_id=event_row['business_owner_id'],
+            notification_type=EVENT_NOTIFICATION_TYPES[new_status],
+            title=f'Event {new_status.capitalize()}',
+            message=f'Your event "{event_row["title"]}" has been {new_status} by the government.',
+            related_event_id=event_row['id'],
+        )
+        for event_row in events
+    ])
+
+
 def create_booking_notification(business_owner, service, citizen, booking_date, booking_time):
     """
     Create notification for new service booking
@@ -154,6 +205,7 @@ def format_license_response(license_obj, include_government_details=False):
         'fee': float(license_obj.fee) if license_obj.fee else None,
         'fee_paid': license_obj.fee_paid,
         'renewal_required': license_obj.renewal_required,
+        'renewal_of': license_obj.renewal_of_id,
         'attachments': license_obj.attachments if license_obj.attachments else [],
     }
     
@@ -177,8 +229,6 @@ def format_event_response(event, include_registrations=False):
     """
     Format event object for API response
     """
-    from .models import EventRegistration
-    
     data = {
         'id': event.id,
         'title': event.title,
@@ -193,11 +243,10 @@ def format_event_response(event, include_registrations=False):
     }
     
     if include_registrations:
-        registration_count = EventRegistration.objects.filter(
-            event=event, 
-            status='registered'
-        ).count()
-        data['current_attendees'] = registration_count
+        data['current_attendees'] = event.registered_count
+        data['spots_remaining'] = (
+            max(event.max_attendees - event.registered_count, 0) if event.max_attendees else None
+        )
     
     return data
 
@@ -213,6 +262,8 @@ def format_service_response(service):
         'category': service.category,
         'price': float(service.price) if service.price else None,
         'is_active': service.is_active,
+        'slot_duration_minutes': service.slot_duration_minutes,
+        'slot_capacity': service.slot_capacity,
         'business_name': service.business_owner.business_name,
         'business_owner': service.business_owner.user.get_full_name() or service.business_owner.user.username,
         'business_address': service.business_owner.business_address,
@@ -230,8 +281,8 @@ def format_notification_response(notification):
         'message': notification.message,
         'is_read': notification.is_read,
         'created_at': notification.created_at.strftime('%Y-%m-%d %H:%M'),
-        'related_license_id': notification.related_license.id if notification.related_license else None,
-        'related_event_id': notification.related_event.id if notification.related_event else None,
+        'related_license_id': notification.related_license_id,
+        'related_event_id': notification.related_event_id,
     }
 
 
@@ -0,0 +1,52 @@
+"""
+Business Owner Async Views
+Async-native version of the notification list endpoint (ASGI only)
+"""
+
+from django.http import JsonResponse
+from townhall_project.async_api import async_api_view
+from townhall_project.db_routers import replica_reads
+from authentication.models import UserProfile
+from .models import BusinessOwnerProfile, BusinessNotification
+from .utils import format_notification_response
+from .views_notifications import list_business_notifications_view
+
+
+@async_api_view(list_business_notifications_view)
+@replica_reads
+async def list_business_notifications_async_view(request, user):
+    """GET /business/notifications/ - same checks and output as list_business_notifications_view"""
+    profile = await UserProfile.objects.filter(user=user).afirst()
+    if profile is None or (profile.role != 'business' and not user.is_superuser):
+        return JsonResponse({
+            'error': 'Only business owners can access notifications'
+        }, status=403)
+    
+    business_profile = await BusinessOwnerProfile.objects.filter(user=user).afirst()
+    if not business_profile:
+        return JsonResponse({
+            'error': 'Business profile not found'
+        }, status=404)
+    
+    is_read = request.GET.get('is_read')
+    notification_type = request.GET.get('type')
+    
+    notifications = BusinessNotification.objects.filter(business_owner=business_profile)
+    
+    if is_read is not None:
+        notifications = notifications.filter(is_read=is_read.lower() == 'true')
+    if notification_type:
+        notifications = notifications.filter(notification_type=notification_type)
+    
+    data = [
+        format_notification_response(notification)
+        async for notification in notifications.order_by('-created_at').aiterator()
+    ]
+    
+    return JsonResponse({
+        'notifications': data,
+        'unread_count': await BusinessNotification.objects.filter(
+            business_owner=business_profile,
+            is_read=False
+        ).acount(),
+    })
@@ -11,6 +11,7 @@ from .models import BusinessComplaint
 from .utils import check_business_owner_access, validate_required_field
 from government.utils import filter_by_town, get_user_town
 from authentication.models import UserProfile
+from townhall_project.db_routers import replica_reads
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,6 +19,7 @@ logger = logging.getLogger(__name__)
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def list_business_complaints_view(request):
     """List complaints (GET) or create complaint (POST) filed by business owners"""
     if request.method == 'GET':
@@ -8,15 +8,21 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from .models import BusinessEvent, EventRegistration
+from .registrations import register_citizen, cancel_registration
 from .utils import (
     check_business_owner_access, check_government_access, check_citizen_access,
     validate_required_field, check_town_access, create_event_notification,
-    format_event_response
+    bulk_create_event_notifications, format_event_response
 )
 from government.utils import get_user_town
+from government.views_utils import parse_bulk_ids
+from towns.ical import bump_version, bump_event_versions
+from django.db import transaction
+from django.utils import timezone
 from authentication.models import UserProfile
-from citizen.models import CitizenProfile
+from citizen.models import CitizenProfile, CitizenNotification
 from datetime import datetime, date, time
+from townhall_project.db_routers import replica_reads
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,6 +30,7 @@ logger = logging.getLogger(__name__)
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def list_business_events_view(request):
     """List business events (GET) or create event (POST)"""
     if request.method == 'GET':
@@ -206,6 +213,82 @@ def review_business_event_view(request, event_id):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+# Event status set by each review action
+EVENT_REVIEW_STATUSES = {
+    'approve': 'approved',
+    'reject': 'rejected',
+    'cancel': 'cancelled',
+}
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_review_business_events_view(request):
+    """
+    Government approve/reject/cancel many business events at once
+    Body: {"event_ids": [...], "action": "approve" | "reject" | "cancel"}
+    Events outside the reviewer's town or already in the target status are skipped.
+    """
+    try:
+        is_government, profile = check_government_access(request.user)
+        
+        if not is_government:
+            return Response({
+                'error': 'Only government officials can review events'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        action = request.data.get('action', '').lower()
+        if action not in EVENT_REVIEW_STATUSES:
+            return Response({
+                'error': 'Action must be "approve", "reject", or "cancel"'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        event_ids, error = parse_bulk_ids(request.data, 'event_ids')
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        
+        new_status = EVENT_REVIEW_STATUSES[action]
+        events = BusinessEvent.objects.filter(id__in=event_ids).exclude(status=new_status)
+        if not request.user.is_superuser:
+            events = events.filter(business_owner__user__userprofile__town=get_user_town(request.user))
+        
+        with transaction.atomic():
+            # Lock only the event rows (PostgreSQL refuses FOR UPDATE on the nullable side of the
+            # profile join) and re-check the status, which may have changed before the lock was taken
+            locked_ids = list(
+                BusinessEvent.objects.select_for_update(of=('self',)).filter(
+                    id__in=events.values('id')
+                ).exclude(status=new_status).values_list('id', flat=True)
+            )
+            rows = list(BusinessEvent.objects.filter(id__in=locked_ids).values(
+                'id', 'business_owner_id', 'title', 'business_owner__user__userprofile__town_id'
+            ))
+            BusinessEvent.objects.filter(id__in=locked_ids).update(
+                status=new_status,
+                updated_at=timezone.now(),
+            )
+            bulk_create_event_notifications(rows, new_status)
+        
+        # .update() skips the post_save signals that invalidate calendar feeds
+        if rows:
+            for town_id in {row['business_owner__user__userprofile__town_id'] for row in rows}:
+                if town_id:
+                    bump_version(f'town:{town_id}')
+            bump_event_versions([row['id'] for row in rows])
+        
+        processed = {row['id'] for row in rows}
+        return Response({
+            'message': f'{len(processed)} event(s) {new_status}',
+            'processed': sorted(processed),
+            'skipped': [event_id for event_id in event_ids if event_id not in processed],
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Error bulk reviewing business events: {str(e)}")
+        return Response({
+            'error': f'An error occurred: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
 def register_for_event_view(request, event_id):
@@ -282,33 +365,30 @@ def register_for_event_view(request, event_id):
                     'error': 'Event not found or not approved'
                 }, status=status.HTTP_404_NOT_FOUND)
             
-            existing_registration = EventRegistration.objects.filter(
-                event=event,
-                citizen=citizen_profile,
-                status='registered'
-            ).first()
-            
-            if existing_registration:
-                return Response({
-                    'error': 'You are already registered for this event'
-                }, status=status.HTTP_400_BAD_REQUEST)
+            registration, error = register_citizen(
+                event,
+                citizen_profile,
+                notes=request.data.get('notes', '').strip(),
+            )
+            if error:
+                return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
             
-            if event.max_attendees:
-                current_registrations = EventRegistration.objects.filter(
+            if registration.status == 'waitlisted':
+                waitlist_position = EventRegistration.objects.filter(
                     event=event,
-                    status='registered'
+                    status='waitlisted',
+                    registered_at__lte=registration.registered_at,
                 ).count()
-                if current_registrations >= event.max_attendees:
-                    return Response({
-                        'error': 'Event is full'
-                    }, status=status.HTTP_400_BAD_REQUEST)
-            
-            registration = EventRegistration.objects.create(
-                event=event,
-                citizen=citizen_profile,
-                status='registered',
-                notes=request.data.get('notes', '').strip(),
-            )
+                return Response({
+                    'message': 'Event is full. You have been added to the waitlist',
+                    'registration': {
+                        'id': registration.id,
+                        'event_title': event.title,
+                        'event_date': event.event_date.strftime('%Y-%m-%d'),
+                        'status': registration.status,
+                        'waitlist_position': waitlist_position,
+                    }
+                }, status=status.HTTP_201_CREATED)
             
             return Response({
                 'message': 'Successfully registered for event',
@@ -325,3 +405,53 @@ def register_for_event_view(request, event_id):
                 'error': f'An error occurred: {str(e)}'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+
+
+@api_view(['DELETE'])
+@permission_classes([IsAuthenticated])
+def cancel_event_registration_view(request, event_id, registration_id):
+    """Cancel a registration and promote the next citizen on the waitlist"""
+    try:
+        try:
+            registration = EventRegistration.objects.select_related(
+                'event', 'event__business_owner', 'citizen'
+            ).get(id=registration_id, event_id=event_id)
+        except EventRegistration.DoesNotExist:
+            return Response({
+                'error': 'Registration not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        is_owner = registration.citizen.user_id == request.user.id
+        is_organizer = registration.event.business_owner.user_id == request.user.id
+        if not (is_owner or is_organizer or request.user.is_superuser):
+            return Response({
+                'error': 'You can only cancel your own registrations'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        if registration.status not in ['registered', 'waitlisted']:
+            return Response({
+                'error': 'Registration is not active'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        promoted = cancel_registration(registration)
+        
+        if promoted:
+            try:
+                CitizenNotification.objects.create(
+                    citizen=promoted.citizen,
+                    notification_type='general',
+                    title='Event Registration Confirmed',
+                    message=f'A seat opened up for "{registration.event.title}" and you have been moved off the waitlist.',
+                )
+            except Exception as e:
+                logger.error(f"Error creating waitlist promotion notification: {str(e)}")
+        
+        return Response({
+            'message': 'Registration cancelled successfully',
+            'promoted_registration_id': promoted.id if promoted else None,
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Error cancelling event registration: {str(e)}")
+        return Response({
+            'error': f'An error occurred: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -13,11 +13,13 @@ from .utils import (
     validate_required_field, check_town_access,
     create_license_notification, format_license_response
 )
+from .license_numbers import allocate_license_number
 from government.utils import get_user_town, filter_by_town
 from government.models import GovernmentOfficial
+from government.license_queue import is_claimed_by_other
 from django.utils import timezone
-import uuid
 from datetime import date, timedelta
+from townhall_project.db_routers import replica_reads
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,6 +27,7 @@ logger = logging.getLogger(__name__)
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def list_licenses_view(request):
     """List licenses (GET) or create license application (POST) for the authenticated business owner"""
     if request.method == 'GET':
@@ -85,7 +88,7 @@ def list_licenses_view(request):
             
             description = request.data.get('description', '').strip()
             
-            license_number = f"LIC-{uuid.uuid4().hex[:8].upper()}"
+            license_number = allocate_license_number(town)
             
             license_obj = BusinessLicense.objects.create(
                 business_owner=business_profile,
@@ -108,6 +111,7 @@ def list_licenses_view(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def list_pending_applications_view(request):
     """List pending business applications for government review"""
     try:
@@ -184,6 +188,12 @@ def review_license_application_view(request, license_id):
         except GovernmentOfficial.DoesNotExist:
             government_official = None
         
+        if is_claimed_by_other(license_obj, government_official):
+            return Response({
+                'error': 'This license is claimed by another reviewer',
+                'claim_expires_at': license_obj.claim_expires_at.isoformat(),
+            }, status=status.HTTP_409_CONFLICT)
+        
         review_comment = request.data.get('review_comment', '').strip()
         fee = request.data.get('fee', None)
         expiry_days = request.data.get('expiry_days', 365)  # Default 1 year
@@ -204,6 +214,8 @@ def review_license_application_view(request, license_id):
         license_obj.reviewed_by = government_official
         license_obj.review_comment = review_comment
         license_obj.review_date = timezone.now()
+        license_obj.claimed_by = None
+        license_obj.claim_expires_at = None
         license_obj.save()
         
         create_license_notification(license_obj.business_owner, license_obj, action)
@@ -218,3 +230,53 @@ def review_license_application_view(request, license_id):
             'error': f'An error occurred: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def renew_license_view(request, license_id):
+    """Business owner applies to renew an approved (expiring) or expired license"""
+    try:
+        is_business_owner, profile, business_profile = check_business_owner_access(request.user)
+        
+        if not is_business_owner or not business_profile:
+            return Response({
+                'error': 'Only business owners can renew licenses'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        try:
+            license_obj = BusinessLicense.objects.get(id=license_id, business_owner=business_profile)
+        except BusinessLicense.DoesNotExist:
+            return Response({
+                'error': 'License not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        if license_obj.status not in ['approved', 'expired']:
+            return Response({
+                'error': 'Only approved or expired licenses can be renewed'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if license_obj.renewals.filter(status='pending').exists():
+            return Response({
+                'error': 'A renewal application for this license is already pending'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        renewal = BusinessLicense.objects.create(
+            business_owner=business_profile,
+            license_type=license_obj.license_type,
+            license_number=allocate_license_number(get_user_town(request.user)),
+            status='pending',
+            description=request.data.get('description', '').strip() or license_obj.description,
+            renewal_required=license_obj.renewal_required,
+            renewal_of=license_obj,
+        )
+        
+        return Response({
+            'message': 'License renewal application created successfully',
+            'license': format_license_response(renewal)
+        }, status=status.HTTP_201_CREATED)
+    except Exception as e:
+        logger.error(f"Error creating license renewal: {str(e)}")
+        return Response({
+            'error': f'An error occurred: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
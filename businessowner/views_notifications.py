@@ -9,6 +9,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from .models import BusinessNotification
 from .utils import check_business_owner_access, format_notification_response
+from townhall_project.db_routers import replica_reads
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,6 +17,7 @@ logger = logging.getLogger(__name__)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def list_business_notifications_view(request):
     """List notifications for the authenticated business owner"""
     try:
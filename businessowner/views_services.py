@@ -7,7 +7,11 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from .models import BusinessService, ServiceBooking
+from .models import BusinessService, ServiceBooking, ServiceOpeningHours
+from .slots import (
+    free_slots, get_slot_for_booking, reserve_slot, cancel_booking, rebuild_slots,
+    MAX_AVAILABILITY_DAYS
+)
 from .utils import (
     check_business_owner_access, check_citizen_access,
     validate_required_field, create_booking_notification,
@@ -15,7 +19,11 @@ from .utils import (
 )
 from government.utils import get_user_town
 from authentication.models import UserProfile
-from citizen.models import CitizenProfile
+from citizen.models import CitizenProfile, CitizenNotification
+from django.db import transaction
+from datetime import datetime, timedelta
+from townhall_project.db_routers import replica_reads
+from towns.ical import bump_version
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,6 +31,7 @@ logger = logging.getLogger(__name__)
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def list_business_services_view(request):
     """List business services (GET) or create service (POST)"""
     if request.method == 'GET':
@@ -85,6 +94,18 @@ def list_business_services_view(request):
             category = request.data.get('category', '').strip()
             price = request.data.get('price')
             
+            try:
+                slot_duration_minutes = int(request.data.get('slot_duration_minutes') or 30)
+                slot_capacity = int(request.data.get('slot_capacity') or 1)
+            except (TypeError, ValueError):
+                return Response({
+                    'error': 'Slot duration and capacity must be integers'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            if slot_duration_minutes < 5 or slot_capacity < 1:
+                return Response({
+                    'error': 'Slot duration must be at least 5 minutes and capacity at least 1'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
             service = BusinessService.objects.create(
                 business_owner=business_profile,
                 service_name=service_name,
@@ -92,6 +113,8 @@ def list_business_services_view(request):
                 category=category,
                 price=float(price) if price else None,
                 is_active=True,
+                slot_duration_minutes=slot_duration_minutes,
+                slot_capacity=slot_capacity,
             )
             
             return Response({
@@ -141,24 +164,34 @@ def create_service_booking_view(request):
                 'error': 'Service not found or not available'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        is_valid, booking_date, error = validate_required_field(request.data, 'booking_date')
+        is_valid, booking_date_str, error = validate_required_field(request.data, 'booking_date')
         if not is_valid:
             return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
         
-        is_valid, booking_time, error = validate_required_field(request.data, 'booking_time')
+        is_valid, booking_time_str, error = validate_required_field(request.data, 'booking_time')
         if not is_valid:
             return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
         
+        try:
+            booking_date = datetime.strptime(booking_date_str, '%Y-%m-%d').date()
+        except ValueError:
+            return Response({'error': 'Invalid date format. Use YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            time_format = '%H:%M' if len(booking_time_str.split(':')) == 2 else '%H:%M:%S'
+            booking_time = datetime.strptime(booking_time_str, time_format).time()
+        except ValueError:
+            return Response({'error': 'Invalid time format. Use HH:MM'}, status=status.HTTP_400_BAD_REQUEST)
+        
         notes = request.data.get('notes', '').strip()
         
-        booking = ServiceBooking.objects.create(
-            service=service,
-            citizen=citizen_profile,
-            booking_date=booking_date,
-            booking_time=booking_time,
-            status='pending',
-            notes=notes,
-        )
+        slot, error = get_slot_for_booking(service, booking_date, booking_time)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        
+        booking, error = reserve_slot(slot, citizen_profile, notes=notes)
+        if error:
+            return Response({'error': error}, status=status.HTTP_409_CONFLICT)
         
         create_booking_notification(
             service.business_owner,
@@ -175,6 +208,7 @@ def create_service_booking_view(request):
                 'service_name': service.service_name,
                 'booking_date': booking.booking_date.strftime('%Y-%m-%d'),
                 'booking_time': booking.booking_time.strftime('%H:%M'),
+                'slot_id': booking.slot_id,
                 'status': booking.status,
             }
         }, status=status.HTTP_201_CREATED)
@@ -184,3 +218,186 @@ def create_service_booking_view(request):
             'error': f'An error occurred: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+
+
+@api_view(['GET', 'PUT'])
+@permission_classes([IsAuthenticated])
+def service_opening_hours_view(request, service_id):
+    """
+    Get (GET) or replace (PUT) a service's weekly opening hours
+    PUT body: {"opening_hours": [{"weekday": 0, "opens_at": "09:00", "closes_at": "17:00"}, ...]}
+    """
+    try:
+        cancelled_bookings = []
+        try:
+            service = BusinessService.objects.select_related('business_owner').get(id=service_id)
+        except BusinessService.DoesNotExist:
+            return Response({
+                'error': 'Service not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        if request.method == 'PUT':
+            if service.business_owner.user_id != request.user.id and not request.user.is_superuser:
+                return Response({
+                    'error': 'You can only manage opening hours for your own services'
+                }, status=status.HTTP_403_FORBIDDEN)
+            
+            windows = []
+            for entry in request.data.get('opening_hours', []):
+                try:
+                    weekday = int(entry.get('weekday'))
+                    opens_at = datetime.strptime(entry.get('opens_at', ''), '%H:%M').time()
+                    closes_at = datetime.strptime(entry.get('closes_at', ''), '%H:%M').time()
+                except (TypeError, ValueError, AttributeError):
+                    return Response({
+                        'error': 'Each entry needs weekday (0-6), opens_at and closes_at (HH:MM)'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                if not 0 <= weekday <= 6 or opens_at >= closes_at:
+                    return Response({
+                        'error': 'Weekday must be 0-6 and opens_at must be before closes_at'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                windows.append(ServiceOpeningHours(
+                    service=service, weekday=weekday, opens_at=opens_at, closes_at=closes_at
+                ))
+            
+            windows.sort(key=lambda window: (window.weekday, window.opens_at))
+            for previous, window in zip(windows, windows[1:]):
+                if window.weekday == previous.weekday and window.opens_at < previous.closes_at:
+                    return Response({
+                        'error': 'Opening windows on the same weekday must not overlap',
+                        'weekday': window.weekday,
+                    }, status=status.HTTP_400_BAD_REQUEST)
+            
+            with transaction.atomic():
+                ServiceOpeningHours.objects.filter(service=service).delete()
+                ServiceOpeningHours.objects.bulk_create(windows)
+                cancelled_bookings = rebuild_slots(service)
+            
+            # rebuild_slots cancels with .update(), which skips the signal that invalidates personal feeds
+            for user_id in {booking.citizen.user_id for booking in cancelled_bookings}:
+                bump_version(f'user:{user_id}')
+            
+            if cancelled_bookings:
+                try:
+                    CitizenNotification.objects.bulk_create([
+                        CitizenNotification(
+                            citizen=booking.citizen,
+                            notification_type='general',
+                            title='Service Booking Cancelled',
+                            message=f'"{service.service_name}" changed its opening hours, so your booking for '
+                                    f'{booking.booking_date} at {booking.booking_time.strftime("%H:%M")} was cancelled.',
+                        )
+                        for booking in cancelled_bookings
+                    ])
+                except Exception as e:
+                    logger.error(f"Error creating booking cancellation notifications: {str(e)}")
+        
+        hours = ServiceOpeningHours.objects.filter(service=service).order_by('weekday', 'opens_at')
+        return Response({
+            'service_id': service.id,
+            'slot_duration_minutes': service.slot_duration_minutes,
+            'slot_capacity': service.slot_capacity,
+            'opening_hours': [
+                {
+                    'weekday': window.weekday,
+                    'opens_at': window.opens_at.strftime('%H:%M'),
+                    'closes_at': window.closes_at.strftime('%H:%M'),
+                }
+                for window in hours
+            ],
+            'cancelled_booking_ids': [booking.id for booking in cancelled_bookings],
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Error managing service opening hours: {str(e)}")
+        return Response({
+            'error': f'An error occurred: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def service_availability_view(request, service_id):
+    """Free slots for a service - ?start=YYYY-MM-DD&end=YYYY-MM-DD (slots are written when hours change, never here)"""
+    try:
+        try:
+            service = BusinessService.objects.get(id=service_id, is_active=True)
+        except BusinessService.DoesNotExist:
+            return Response({
+                'error': 'Service not found or not available'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        try:
+            start_date = datetime.strptime(request.query_params.get('start', ''), '%Y-%m-%d').date()
+            end_param = request.query_params.get('end')
+            end_date = datetime.strptime(end_param, '%Y-%m-%d').date() if end_param else start_date + timedelta(days=6)
+        except ValueError:
+            return Response({
+                'error': 'start and end must be dates in YYYY-MM-DD format'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if end_date < start_date:
+            return Response({
+                'error': 'end must not be before start'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if (end_date - start_date).days >= MAX_AVAILABILITY_DAYS:
+            return Response({
+                'error': f'Date range cannot exceed {MAX_AVAILABILITY_DAYS} days'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        data = []
+        for slot in free_slots(service, start_date, end_date):
+            data.append({
+                'slot_id': slot.id,
+                'date': slot.date.strftime('%Y-%m-%d'),
+                'start_time': slot.start_time.strftime('%H:%M'),
+                'end_time': slot.end_time.strftime('%H:%M'),
+                'remaining': slot.capacity - slot.booked_count,
+            })
+        
+        return Response({
+            'service_id': service.id,
+            'start': start_date.strftime('%Y-%m-%d'),
+            'end': end_date.strftime('%Y-%m-%d'),
+            'slots': data,
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Error getting service availability: {str(e)}")
+        return Response({
+            'error': f'An error occurred: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['DELETE'])
+@permission_classes([IsAuthenticated])
+def cancel_service_booking_view(request, booking_id):
+    """Cancel a service booking and free its slot"""
+    try:
+        try:
+            booking = ServiceBooking.objects.select_related(
+                'citizen', 'service__business_owner'
+            ).get(id=booking_id)
+        except ServiceBooking.DoesNotExist:
+            return Response({
+                'error': 'Booking not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        is_owner = booking.citizen.user_id == request.user.id
+        is_provider = booking.service.business_owner.user_id == request.user.id
+        if not (is_owner or is_provider or request.user.is_superuser):
+            return Response({
+                'error': 'You can only cancel your own bookings'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        if not cancel_booking(booking):
+            return Response({
+                'error': 'Booking is not active'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'message': 'Booking cancelled successfully'
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Error cancelling service booking: {str(e)}")
+        return Response({
+            'error': f'An error occurred: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import CitizenProfile, CitizenComplaint, CitizenFeedback
+from django.db import transaction
+from .assignment import OPEN_STATUSES, sync_assignment_status
+from .models import CitizenProfile, CitizenComplaint, CitizenFeedback, ComplaintCluster, ComplaintSLAPolicy, ComplaintAssignment
 
 
 @admin.register(CitizenProfile)
@@ -33,10 +35,10 @@ class CitizenProfileAdmin(admin.ModelAdmin):
 
 @admin.register(CitizenComplaint)
 class CitizenComplaintAdmin(admin.ModelAdmin):
-    list_display = ('title', 'citizen', 'category', 'priority', 'status', 'created_at', 'updated_at')
+    list_display = ('title', 'citizen', 'category', 'priority', 'status', 'cluster', 'created_at', 'updated_at')
     list_filter = ('status', 'priority', 'category', 'created_at')
     search_fields = ('title', 'description', 'citizen__citizen_id', 'citizen__user__email')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('geohash', 'created_at', 'updated_at')
     ordering = ('-created_at',)
     date_hierarchy = 'created_at'
     
@@ -44,8 +46,14 @@ class CitizenComplaintAdmin(admin.ModelAdmin):
         ('Complaint Information', {
             'fields': ('citizen', 'title', 'description', 'category')
         }),
+        ('Location', {
+            'fields': ('location', 'latitude', 'longitude', 'geohash')
+        }),
         ('Status', {
-            'fields': ('priority', 'status')
+            'fields': ('priority', 'status', 'due_at', 'escalated_at')
+        }),
+        ('Duplicates', {
+            'fields': ('cluster', 'duplicate_score')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
@@ -54,20 +62,61 @@ class CitizenComplaintAdmin(admin.ModelAdmin):
     )
     
     actions = ['mark_as_resolved', 'mark_as_closed']
+
+    def _close(self, queryset, status):
+        """Set a closed status and release the complaints' open assignments"""
+        with transaction.atomic():
+            complaint_ids = list(queryset.values_list('id', flat=True))
+            count = queryset.model.objects.filter(id__in=complaint_ids).update(status=status)
+            sync_assignment_status(complaint_ids, is_open=False)
+        return count
+
+    def save_model(self, request, obj, form, change):
+        """Status edits on the change form move the open count as well"""
+        super().save_model(request, obj, form, change)
+        if change and 'status' in form.changed_data:
+            sync_assignment_status([obj.id], is_open=obj.status in OPEN_STATUSES)
     
     def mark_as_resolved(self, request, queryset):
         """Bulk mark complaints as resolved"""
-        count = queryset.update(status='resolved')
+        count = self._close(queryset, 'resolved')
         self.message_user(request, f"{count} complaints marked as resolved.")
     mark_as_resolved.short_description = "Mark selected as resolved"
     
     def mark_as_closed(self, request, queryset):
         """Bulk close complaints"""
-        count = queryset.update(status='closed')
+        count = self._close(queryset, 'closed')
         self.message_user(request, f"{count} complaints closed.")
     mark_as_closed.short_description = "Close selected complaints"
 
 
+@admin.register(ComplaintCluster)
+class ComplaintClusterAdmin(admin.ModelAdmin):
+    list_display = ('id', 'category', 'town', 'primary_complaint', 'created_at')
+    list_filter = ('town', 'category', 'created_at')
+    search_fields = ('category', 'primary_complaint__title')
+    readonly_fields = ('created_at', 'updated_at')
+    ordering = ('-created_at',)
+
+
+@admin.register(ComplaintSLAPolicy)
+class ComplaintSLAPolicyAdmin(admin.ModelAdmin):
+    list_display = ('town', 'category', 'priority', 'resolution_hours', 'updated_at')
+    list_filter = ('town', 'priority')
+    search_fields = ('town__name', 'category')
+    readonly_fields = ('created_at', 'updated_at')
+    ordering = ('town', 'category', 'priority')
+
+
+@admin.register(ComplaintAssignment)
+class ComplaintAssignmentAdmin(admin.ModelAdmin):
+    list_display = ('complaint', 'department', 'official', 'is_automatic', 'is_open', 'assigned_at')
+    list_filter = ('is_automatic', 'is_open', 'department')
+    search_fields = ('complaint__title', 'official__user__email', 'department__name')
+    readonly_fields = ('assigned_at',)
+    ordering = ('-assigned_at',)
+
+
 @admin.register(CitizenFeedback)
 class CitizenFeedbackAdmin(admin.ModelAdmin):
     list_display = ('service_name', 'citizen', 'rating', 'created_at')
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CitizenConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'citizen'
+
+    def ready(self):
+        """Connect signal handlers when app is ready"""
+        import citizen.signals  # noqa
@@ -0,0 +1,155 @@
+"""
+Complaint Assignment Engine
+Routes complaints to department work queues and balances load across officials
+"""
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+from government.models import ComplaintRoutingRule, Department, GovernmentOfficial
+from .models import CitizenComplaint, ComplaintAssignment
+
+OPEN_STATUSES = ['pending', 'in_progress']
+
+
+def get_routing_department(town, category):
+    """
+    Find the department responsible for a complaint category in a town.
+    A category-specific rule wins over the town-wide (blank category) rule.
+    """
+    if town is None:
+        return None
+    rules = {
+        rule.category: rule.department
+        for rule in ComplaintRoutingRule.objects.filter(
+            town=town, category__in=[category, '']
+        ).select_related('department')
+    }
+    return rules.get(category) or rules.get('')
+
+
+def pick_least_loaded_official(town, department):
+    """
+    Pick the official in a department with the fewest open assignments.
+    Reads the (town, department, open_assignment_count) index instead of counting complaints.
+    Must be called inside a transaction; the chosen row is locked until commit.
+    """
+    return GovernmentOfficial.objects.select_for_update(skip_locked=True).filter(
+        town=town,
+        department=department.name,
+        accepts_assignments=True,
+    ).order_by('open_assignment_count', 'id').first()
+
+
+def _release(assignment):
+    """Stop counting an assignment against its official"""
+    if not assignment.is_open:
+        return
+    if assignment.official_id:
+        GovernmentOfficial.objects.filter(
+            id=assignment.official_id, open_assignment_count__gt=0
+        ).update(open_assignment_count=F('open_assignment_count') - 1)
+    assignment.is_open = False
+
+
+def assign_complaint(complaint, official=None, department=None, assigned_by=None, automatic=False):
+    """
+    Assign a complaint to an official and/or department, moving the open count
+    from the previous assignee. Keeps the legacy assigned_to text in sync.
+    Returns: the ComplaintAssignment
+    """
+    if official is not None and department is None:
+        department = Department.objects.filter(name=official.department).first()
+    with transaction.atomic():
+        assignment = ComplaintAssignment.objects.select_for_update().filter(complaint=complaint).first()
+        if assignment is None:
+            assignment = ComplaintAssignment(complaint=complaint, is_open=False)
+        _release(assignment)
+
+        assignment.official = official
+        assignment.department = department
+        assignment.is_automatic = automatic
+        assignment.assigned_by = assigned_by
+        assignment.is_open = complaint.status in OPEN_STATUSES
+        assignment.save()
+
+        if official is not None and assignment.is_open:
+            GovernmentOfficial.objects.filter(id=official.id).update(
+                open_assignment_count=F('open_assignment_count') + 1
+            )
+
+        if official is not None:
+            complaint.assigned_to = official.user.get_full_name() or official.user.username
+        elif department is not None:
+            complaint.assigned_to = department.name
+        else:
+            complaint.assigned_to = ''
+        complaint.save(update_fields=['assigned_to', 'updated_at'])
+    return assignment
+
+
+def route_complaint(complaint, assigned_by=None):
+    """
+    Auto-assign a complaint using the town's routing rules.
+    Returns: the ComplaintAssignment, or None when no rule matches
+    """
+    department = get_routing_department(complaint.town, complaint.category)
+    if department is None:
+        return None
+    with transaction.atomic():
+        official = pick_least_loaded_official(complaint.town, department)
+        return assign_complaint(
+            complaint,
+            official=official,
+            department=department,
+            assigned_by=assigned_by,
+            automatic=True,
+        )
+
+
+def sync_assignment_status(complaint_ids, is_open):
+    """
+    Update open counters after complaints change status.
+    Closing releases open assignments; reopening counts them again. Set-based:
+    one UPDATE per affected official rather than per complaint.
+    Returns: number of assignments changed
+    """
+    with transaction.atomic():
+        locked_ids = list(
+            ComplaintAssignment.objects.select_for_update().filter(
+                complaint_id__in=complaint_ids, is_open=not is_open
+            ).values_list('id', flat=True)
+        )
+        if not locked_ids:
+            return 0
+        assignments = ComplaintAssignment.objects.filter(id__in=locked_ids)
+        per_official = list(
+            assignments.exclude(official=None).values('official_id').annotate(total=Count('id')).order_by()
+        )
+        changed = assignments.update(is_open=is_open)
+        for row in per_official:
+            officials = GovernmentOfficial.objects.filter(id=row['official_id'])
+            if is_open:
+                officials.update(open_assignment_count=F('open_assignment_count') + row['total'])
+            else:
+                officials.update(
+                    open_assignment_count=Greatest(F('open_assignment_count') - row['total'], 0)
+                )
+    return changed
+
+
+def reroute_complaints(complaint_ids):
+    """
+    Take complaints away from their current assignees and route them again.
+    Used when complaints move to another town, whose officials and rules now apply.
+    Returns: number of complaints routed to a department
+    """
+    with transaction.atomic():
+        sync_assignment_status(complaint_ids, is_open=False)
+        ComplaintAssignment.objects.filter(complaint_id__in=complaint_ids).update(official=None, department=None)
+        CitizenComplaint.objects.filter(id__in=complaint_ids).update(assigned_to='')
+        routed = 0
+        for complaint in CitizenComplaint.objects.filter(id__in=complaint_ids).select_related('town'):
+            if route_complaint(complaint) is not None:
+                routed += 1
+    return routed
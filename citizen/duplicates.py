@@ -0,0 +1,110 @@
+"""
+Duplicate Complaint Detection
+Finds recent open complaints that describe the same issue and links them into clusters
+"""
+
+import re
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
+from .models import CitizenComplaint, ComplaintCluster
+
+
+# Only complaints filed within this window are considered as duplicate candidates
+DUPLICATE_WINDOW_DAYS = 14
+
+# Upper bound on candidates compared per submission (most recent first)
+MAX_CANDIDATES = 200
+
+# Minimum trigram similarity (0-1) for a complaint to be flagged as a duplicate
+SIMILARITY_THRESHOLD = 0.5
+
+# Only the start of long descriptions is compared
+MAX_DESCRIPTION_CHARS = 500
+
+OPEN_STATUSES = ['pending', 'in_progress']
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_text(text):
+    """Lowercase text and collapse punctuation/whitespace to single spaces"""
+    return _NON_ALNUM.sub(' ', (text or '').lower()).strip()
+
+
+def trigrams(text):
+    """Return the set of character trigrams for each word in the text"""
+    grams = set()
+    for word in normalize_text(text).split():
+        padded = f'  {word} '
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+def complaint_trigrams(title, description, location):
+    """Build the trigram set used to compare two complaints"""
+    return (
+        trigrams(title)
+        | trigrams((description or '')[:MAX_DESCRIPTION_CHARS])
+        | trigrams(location)
+    )
+
+
+def similarity(grams_a, grams_b):
+    """Jaccard similarity between two trigram sets"""
+    if not grams_a or not grams_b:
+        return 0.0
+    return len(grams_a & grams_b) / len(grams_a | grams_b)
+
+
+def find_duplicate_candidates(town, category, title, description, location, exclude_id=None, limit=5):
+    """
+    Find open complaints in the same town and category that look like the same issue.
+    The candidate query is served by the (town, category, status, created_at) index.
+    Returns: list of (score, complaint) sorted by score descending
+    """
+    since = timezone.now() - timedelta(days=DUPLICATE_WINDOW_DAYS)
+    candidates = CitizenComplaint.objects.filter(
+        town=town,
+        category=category,
+        status__in=OPEN_STATUSES,
+        created_at__gte=since,
+    )
+    if exclude_id:
+        candidates = candidates.exclude(id=exclude_id)
+    candidates = candidates.only(
+        'id', 'title', 'description', 'location', 'cluster_id', 'created_at'
+    ).order_by('-created_at')[:MAX_CANDIDATES]
+
+    grams = complaint_trigrams(title, description, location)
+    matches = []
+    for candidate in candidates:
+        score = similarity(grams, complaint_trigrams(candidate.title, candidate.description, candidate.location))
+        if score >= SIMILARITY_THRESHOLD:
+            matches.append((round(score, 3), candidate))
+
+    matches.sort(key=lambda match: match[0], reverse=True)
+    return matches[:limit]
+
+
+def link_to_cluster(complaint, match, score):
+    """
+    Attach a complaint to the cluster of its best match, creating the cluster if needed.
+    Returns: ComplaintCluster
+    """
+    with transaction.atomic():
+        if match.cluster_id:
+            cluster = ComplaintCluster.objects.get(id=match.cluster_id)
+        else:
+            cluster = ComplaintCluster.objects.create(
+                town_id=complaint.town_id,
+                category=complaint.category,
+                primary_complaint=match,
+            )
+            CitizenComplaint.objects.filter(id=match.id).update(cluster=cluster)
+
+        CitizenComplaint.objects.filter(id=complaint.id).update(cluster=cluster, duplicate_score=score)
+        complaint.cluster = cluster
+        complaint.duplicate_score = score
+    return cluster
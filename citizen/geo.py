@@ -0,0 +1,124 @@
+"""
+Geospatial helpers for complaint locations
+Geohash encoding, bounding-box parsing and map zoom to grid precision mapping
+"""
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Geohash length stored on each complaint (~5m cells)
+GEOHASH_PRECISION = 9
+
+# Map zoom level -> geohash prefix length used as the aggregation tile
+ZOOM_PRECISION = [
+    (2, 1),
+    (4, 2),
+    (7, 3),
+    (10, 4),
+    (12, 5),
+    (15, 6),
+    (17, 7),
+]
+MAX_TILE_PRECISION = 8
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Encode a latitude/longitude pair as a geohash string"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(geohash) < precision:
+        if even:
+            mid = (lng_range[0] + lng_range[1]) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lng_range[0] = mid
+            else:
+                bits = bits << 1
+                lng_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits = bits << 1
+                lat_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            geohash.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(geohash)
+
+
+def decode_geohash(geohash):
+    """
+    Decode a geohash to the center of its cell
+    Returns: (latitude, longitude)
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = _BASE32.index(char)
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            target = lng_range if even else lat_range
+            mid = (target[0] + target[1]) / 2
+            if bit:
+                target[0] = mid
+            else:
+                target[1] = mid
+            even = not even
+    return (lat_range[0] + lat_range[1]) / 2, (lng_range[0] + lng_range[1]) / 2
+
+
+def precision_for_zoom(zoom):
+    """Map a web-map zoom level (0-22) to a geohash tile precision"""
+    for max_zoom, precision in ZOOM_PRECISION:
+        if zoom <= max_zoom:
+            return precision
+    return MAX_TILE_PRECISION
+
+
+def parse_coordinates(data):
+    """
+    Parse optional latitude/longitude values from request data
+    Returns: (latitude, longitude, error_message) - coordinates are None when not provided
+    """
+    latitude = data.get('latitude')
+    longitude = data.get('longitude')
+    if isinstance(latitude, list):
+        latitude = latitude[0] if latitude else None
+    if isinstance(longitude, list):
+        longitude = longitude[0] if longitude else None
+    if latitude in (None, '') and longitude in (None, ''):
+        return None, None, None
+    try:
+        latitude = float(latitude)
+        longitude = float(longitude)
+    except (TypeError, ValueError):
+        return None, None, 'Latitude and longitude must both be valid numbers'
+    if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
+        return None, None, 'Latitude must be between -90 and 90 and longitude between -180 and 180'
+    return latitude, longitude, None
+
+
+def parse_bbox(value):
+    """
+    Parse a "min_lng,min_lat,max_lng,max_lat" bounding box
+    Returns: (bbox, error_message)
+    """
+    if not value:
+        return None, None
+    try:
+        min_lng, min_lat, max_lng, max_lat = [float(part) for part in value.split(',')]
+    except ValueError:
+        return None, 'bbox must be "min_lng,min_lat,max_lng,max_lat"'
+    if min_lat > max_lat or min_lng > max_lng:
+        return None, 'bbox minimums must not exceed maximums'
+    return (min_lng, min_lat, max_lng, max_lat), None
@@ -0,0 +1,23 @@
+"""
+Escalate overdue complaints
+Run periodically (e.g. from cron) to bump the priority of complaints past their SLA deadline
+"""
+
+from django.core.management.base import BaseCommand
+from citizen.sla import escalate_overdue_complaints
+
+
+class Command(BaseCommand):
+    help = 'Escalate open complaints whose SLA deadline has passed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of complaints escalated per UPDATE (default: 500)',
+        )
+
+    def handle(self, *args, **options):
+        escalated = escalate_overdue_complaints(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Escalated {escalated} overdue complaint(s)'))
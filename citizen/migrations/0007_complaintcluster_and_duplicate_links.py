@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-19 12:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('citizen', '0006_citizennotification'),
+        ('towns', '0004_town_emergency_animal_control_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='citizencomplaint',
+            name='duplicate_score',
+            field=models.FloatField(blank=True, help_text='Similarity to the matched complaint when flagged as a duplicate', null=True),
+        ),
+        migrations.CreateModel(
+            name='ComplaintCluster',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('primary_complaint', models.ForeignKey(blank=True, help_text='First complaint filed about this issue', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='citizen.citizencomplaint')),
+                ('town', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='complaint_clusters', to='towns.town')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='citizencomplaint',
+            name='cluster',
+            field=models.ForeignKey(blank=True, help_text='Cluster of suspected duplicate complaints', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='complaints', to='citizen.complaintcluster'),
+        ),
+        migrations.AddIndex(
+            model_name='citizencomplaint',
+            index=models.Index(fields=['town', 'category', 'status', '-created_at'], name='citizen_cit_town_id_3ea0a2_idx'),
+        ),
+    ]
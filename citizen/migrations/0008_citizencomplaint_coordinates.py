@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-19 12:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('citizen', '0007_complaintcluster_and_duplicate_links'),
+        ('towns', '0004_town_emergency_animal_control_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='citizencomplaint',
+            name='geohash',
+            field=models.CharField(blank=True, help_text='Geohash of latitude/longitude, used for map tiles', max_length=12),
+        ),
+        migrations.AddField(
+            model_name='citizencomplaint',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='citizencomplaint',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='citizencomplaint',
+            index=models.Index(fields=['town', 'geohash'], name='citizen_cit_town_id_14b0c8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='citizencomplaint',
+            index=models.Index(fields=['town', 'latitude', 'longitude'], name='citizen_cit_town_id_f96891_idx'),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.7 on 2026-10-19 12:57
+
+import django.db.models.deletion
+from datetime import timedelta
+from django.db import migrations, models
+from django.db.models import F
+
+
+DEFAULT_RESOLUTION_HOURS = {'urgent': 24, 'high': 72, 'medium': 168, 'low': 336}
+
+
+def backfill_due_at(apps, schema_editor):
+    """Give existing open complaints a deadline from the default SLA targets"""
+    CitizenComplaint = apps.get_model('citizen', 'CitizenComplaint')
+    for priority, hours in DEFAULT_RESOLUTION_HOURS.items():
+        CitizenComplaint.objects.filter(
+            status__in=['pending', 'in_progress'], priority=priority, due_at__isnull=True
+        ).update(due_at=F('created_at') + timedelta(hours=hours))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('citizen', '0008_citizencomplaint_coordinates'),
+        ('towns', '0004_town_emergency_animal_control_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComplaintSLAPolicy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(blank=True, help_text='Leave blank to apply to every category', max_length=100)),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('urgent', 'Urgent')], max_length=10)),
+                ('resolution_hours', models.PositiveIntegerField(help_text='Hours allowed from submission to resolution')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Complaint SLA Policy',
+                'verbose_name_plural': 'Complaint SLA Policies',
+                'ordering': ['town', 'category', 'priority'],
+            },
+        ),
+        migrations.AddField(
+            model_name='citizencomplaint',
+            name='due_at',
+            field=models.DateTimeField(blank=True, help_text='SLA resolution deadline computed from town policy', null=True),
+        ),
+        migrations.AddField(
+            model_name='citizencomplaint',
+            name='escalated_at',
+            field=models.DateTimeField(blank=True, help_text='When the complaint was escalated for missing its SLA', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='citizencomplaint',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'in_progress'])), fields=['town', 'due_at'], name='citizen_open_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='citizencomplaint',
+            index=models.Index(condition=models.Q(('escalated_at__isnull', True), ('status__in', ['pending', 'in_progress'])), fields=['due_at'], name='citizen_escalation_due_idx'),
+        ),
+        migrations.AddField(
+            model_name='complaintslapolicy',
+            name='town',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='complaint_sla_policies', to='towns.town'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='complaintslapolicy',
+            unique_together={('town', 'category', 'priority')},
+        ),
+        migrations.RunPython(backfill_due_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-19 12:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('citizen', '0009_complaint_sla'),
+        ('government', '0010_complaint_routing_and_workload'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComplaintAssignment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_automatic', models.BooleanField(default=False)),
+                ('is_open', models.BooleanField(default=True, help_text="Counted in the official's open assignment total")),
+                ('assigned_at', models.DateTimeField(auto_now=True)),
+                ('assigned_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='complaint_assignments_made', to=settings.AUTH_USER_MODEL)),
+                ('complaint', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='assignment', to='citizen.citizencomplaint')),
+                ('department', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='complaint_assignments', to='government.department')),
+                ('official', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='complaint_assignments', to='government.governmentofficial')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['official', 'is_open'], name='citizen_com_officia_3e875f_idx'), models.Index(fields=['department', 'is_open'], name='citizen_com_departm_648d9f_idx')],
+            },
+        ),
+    ]
@@ -17,6 +17,21 @@ class CitizenProfile(models.Model):
         return f"{self.user.get_full_name()} - {self.citizen_id}"
 
 
+class ComplaintCluster(models.Model):
+    """Group of near-identical complaints about the same issue so officials can resolve them once"""
+    town = models.ForeignKey('towns.Town', on_delete=models.CASCADE, related_name='complaint_clusters')
+    category = models.CharField(max_length=100)
+    primary_complaint = models.ForeignKey('CitizenComplaint', on_delete=models.SET_NULL, null=True, blank=True, related_name='+', help_text="First complaint filed about this issue")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"Cluster #{self.id} - {self.category}"
+
+
 class CitizenComplaint(models.Model):
     """Model for citizen complaints and issues"""
     STATUS_CHOICES = [
@@ -39,18 +54,87 @@ class CitizenComplaint(models.Model):
     description = models.TextField()
     category = models.CharField(max_length=100)
     location = models.CharField(max_length=200, blank=True, help_text="Location of the issue")
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geohash = models.CharField(max_length=12, blank=True, help_text="Geohash of latitude/longitude, used for map tiles")
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default='medium')
     status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='pending')
     assigned_to = models.CharField(max_length=200, blank=True, help_text="Department or person assigned")
     estimated_resolution = models.CharField(max_length=200, blank=True)
+    due_at = models.DateTimeField(null=True, blank=True, help_text="SLA resolution deadline computed from town policy")
+    escalated_at = models.DateTimeField(null=True, blank=True, help_text="When the complaint was escalated for missing its SLA")
+    cluster = models.ForeignKey(ComplaintCluster, on_delete=models.SET_NULL, null=True, blank=True, related_name='complaints', help_text="Cluster of suspected duplicate complaints")
+    duplicate_score = models.FloatField(null=True, blank=True, help_text="Similarity to the matched complaint when flagged as a duplicate")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['town', 'category', 'status', '-created_at']),
+            models.Index(fields=['town', 'geohash']),
+            models.Index(fields=['town', 'latitude', 'longitude']),
+            models.Index(
+                fields=['town', 'due_at'],
+                name='citizen_open_due_idx',
+                condition=models.Q(status__in=['pending', 'in_progress']),
+            ),
+            models.Index(
+                fields=['due_at'],
+                name='citizen_escalation_due_idx',
+                condition=models.Q(status__in=['pending', 'in_progress'], escalated_at__isnull=True),
+            ),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.citizen.user.get_full_name()}"
+    
+    def set_coordinates(self, latitude, longitude):
+        """Set latitude/longitude and keep the geohash in sync"""
+        from .geo import encode_geohash
+        self.latitude = latitude
+        self.longitude = longitude
+        self.geohash = encode_geohash(latitude, longitude) if latitude is not None and longitude is not None else ''
+
+
+class ComplaintSLAPolicy(models.Model):
+    """Resolution target for a town's complaints by priority, optionally narrowed to one category"""
+    town = models.ForeignKey('towns.Town', on_delete=models.CASCADE, related_name='complaint_sla_policies')
+    category = models.CharField(max_length=100, blank=True, help_text="Leave blank to apply to every category")
+    priority = models.CharField(max_length=10, choices=CitizenComplaint.PRIORITY_CHOICES)
+    resolution_hours = models.PositiveIntegerField(help_text="Hours allowed from submission to resolution")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['town', 'category', 'priority']
+        unique_together = [['town', 'category', 'priority']]
+        verbose_name = 'Complaint SLA Policy'
+        verbose_name_plural = 'Complaint SLA Policies'
+    
+    def __str__(self):
+        return f"{self.town.name} - {self.category or 'All categories'} ({self.priority}): {self.resolution_hours}h"
+
+
+class ComplaintAssignment(models.Model):
+    """Current work-queue assignment of a complaint to a department and/or official"""
+    complaint = models.OneToOneField(CitizenComplaint, on_delete=models.CASCADE, related_name='assignment')
+    department = models.ForeignKey('government.Department', on_delete=models.SET_NULL, null=True, blank=True, related_name='complaint_assignments')
+    official = models.ForeignKey('government.GovernmentOfficial', on_delete=models.SET_NULL, null=True, blank=True, related_name='complaint_assignments')
+    is_automatic = models.BooleanField(default=False)
+    is_open = models.BooleanField(default=True, help_text="Counted in the official's open assignment total")
+    assigned_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='complaint_assignments_made')
+    assigned_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['official', 'is_open']),
+            models.Index(fields=['department', 'is_open']),
+        ]
+    
+    def __str__(self):
+        assignee = self.official or self.department or 'unassigned'
+        return f"Complaint #{self.complaint_id} -> {assignee}"
 
 
 class ComplaintAttachment(models.Model):
@@ -0,0 +1,15 @@
+"""
+Citizen Signals
+Keep officials' open assignment counts in step with deleted assignments
+"""
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from .assignment import _release
+from .models import ComplaintAssignment
+
+
+@receiver(post_delete, sender=ComplaintAssignment)
+def release_deleted_assignment(sender, instance, **kwargs):
+    """Deleting a complaint cascades to its assignment; stop counting it against the official"""
+    _release(instance)
@@ -0,0 +1,118 @@
+"""
+Complaint SLA Engine
+Computes resolution deadlines from town policies and escalates overdue complaints
+"""
+
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Case, F, When, Value
+from django.utils import timezone
+from .models import CitizenComplaint, ComplaintComment, ComplaintSLAPolicy
+
+
+# Resolution targets used when a town has no matching ComplaintSLAPolicy
+DEFAULT_RESOLUTION_HOURS = {
+    'urgent': 24,
+    'high': 72,
+    'medium': 168,
+    'low': 336,
+}
+
+# Open complaints due within this window are reported as "at risk"
+AT_RISK_HOURS = 24
+
+# Priority an overdue complaint is bumped to when escalated
+ESCALATED_PRIORITY = {
+    'low': 'medium',
+    'medium': 'high',
+    'high': 'urgent',
+    'urgent': 'urgent',
+}
+
+OPEN_STATUSES = ['pending', 'in_progress']
+
+
+def get_resolution_hours(town, category, priority):
+    """
+    Resolve the SLA target in hours for a complaint.
+    A category-specific policy wins over the town-wide policy, which wins over the default.
+    """
+    if town is not None:
+        policies = {
+            policy.category: policy.resolution_hours
+            for policy in ComplaintSLAPolicy.objects.filter(
+                town=town, priority=priority, category__in=[category, '']
+            )
+        }
+        if category in policies:
+            return policies[category]
+        if '' in policies:
+            return policies['']
+    return DEFAULT_RESOLUTION_HOURS.get(priority, DEFAULT_RESOLUTION_HOURS['medium'])
+
+
+def apply_sla(complaint):
+    """Set complaint.due_at from its town, category and priority (does not save)"""
+    start = complaint.created_at or timezone.now()
+    hours = get_resolution_hours(complaint.town, complaint.category, complaint.priority)
+    complaint.due_at = start + timedelta(hours=hours)
+    return complaint.due_at
+
+
+def get_sla_state(complaint, now=None):
+    """Return 'overdue', 'at_risk', 'on_track' or None for closed/untracked complaints"""
+    if complaint.status not in OPEN_STATUSES or not complaint.due_at:
+        return None
+    now = now or timezone.now()
+    if complaint.due_at <= now:
+        return 'overdue'
+    if complaint.due_at <= now + timedelta(hours=AT_RISK_HOURS):
+        return 'at_risk'
+    return 'on_track'
+
+
+def escalate_overdue_complaints(now=None, batch_size=500):
+    """
+    Escalate open complaints whose deadline has passed.
+    Only the partial due_at index is scanned; each batch bumps priority with a single UPDATE
+    and records a system comment on every escalated complaint.
+    Returns: number of complaints escalated
+    """
+    now = now or timezone.now()
+    escalated = 0
+    priority_bump = Case(
+        *[When(priority=current, then=Value(bumped)) for current, bumped in ESCALATED_PRIORITY.items()],
+        default=F('priority'),
+    )
+
+    while True:
+        with transaction.atomic():
+            batch = list(
+                CitizenComplaint.objects.filter(
+                    status__in=OPEN_STATUSES,
+                    escalated_at__isnull=True,
+                    due_at__lte=now,
+                ).order_by('due_at').values_list('id', 'due_at')[:batch_size]
+            )
+            if not batch:
+                break
+
+            ids = [complaint_id for complaint_id, _ in batch]
+            CitizenComplaint.objects.filter(id__in=ids).update(
+                priority=priority_bump,
+                escalated_at=now,
+                updated_at=now,
+            )
+            ComplaintComment.objects.bulk_create([
+                ComplaintComment(
+                    complaint_id=complaint_id,
+                    comment_text=f"Escalated automatically: resolution was due {due_at.strftime('%Y-%m-%d %H:%M')}.",
+                    is_notification=False,
+                )
+                for complaint_id, due_at in batch
+            ])
+        escalated += len(batch)
+        if len(batch) < batch_size:
+            break
+
+    return escalated
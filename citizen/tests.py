@@ -0,0 +1,299 @@
+"""
+Citizen Tests
+Officials' open assignment counts across assignment, admin actions, deletes and town moves (citizen.assignment)
+Trigram duplicate scoring and candidate selection (citizen.duplicates)
+Geohash cells, zoom precision and map tiles (citizen.geo, citizen.views_map)
+SLA deadlines: the due_at backfill, the overdue queue and escalation (citizen.sla)
+"""
+
+import importlib
+from datetime import timedelta
+from unittest import mock
+from django.apps import apps
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from authentication.authentication import issue_token
+from authentication.models import UserProfile
+from government.models import ComplaintRoutingRule, Department, GovernmentOfficial
+from towns.models import Town, TownChangeRequest
+from towns.town_changes import complete_town_changes
+from .admin import CitizenComplaintAdmin
+from .assignment import assign_complaint, route_complaint, sync_assignment_status
+from .duplicates import SIMILARITY_THRESHOLD, complaint_trigrams, find_duplicate_candidates, similarity, trigrams
+from .geo import decode_geohash, encode_geohash, parse_bbox, precision_for_zoom
+from .models import CitizenComplaint, CitizenProfile, ComplaintAssignment, ComplaintComment, ComplaintSLAPolicy
+from .sla import DEFAULT_RESOLUTION_HOURS, apply_sla, escalate_overdue_complaints
+
+
+class OpenAssignmentCountTests(TestCase):
+
+    def setUp(self):
+        self.town = Town.objects.create(name='Springfield', slug='springfield', state='NJ')
+        self.other_town = Town.objects.create(name='Shelbyville', slug='shelbyville', state='NJ')
+        self.department = Department.objects.create(name='Public Works', description='Roads')
+        self.official = self.add_official('official@example.com', self.town)
+        self.other_official = self.add_official('other@example.com', self.other_town)
+        for town in (self.town, self.other_town):
+            ComplaintRoutingRule.objects.create(town=town, category='', department=self.department)
+        user = User.objects.create_user('citizen@example.com', 'citizen@example.com', 'pw')
+        self.citizen = CitizenProfile.objects.create(user=user, citizen_id='C1')
+        self.complaints = [self.add_complaint(f'Pothole {number}') for number in range(3)]
+        for complaint in self.complaints:
+            route_complaint(complaint)
+
+    def add_official(self, email, town):
+        user = User.objects.create_user(email, email, 'pw')
+        return GovernmentOfficial.objects.create(
+            user=user, employee_id=email, department='Public Works', position='Inspector', town=town,
+        )
+
+    def add_complaint(self, title):
+        return CitizenComplaint.objects.create(
+            citizen=self.citizen, town=self.town, title=title, description='Deep', category='roads',
+        )
+
+    def open_count(self, official):
+        official.refresh_from_db()
+        return official.open_assignment_count
+
+    def test_routing_counts_open_assignments(self):
+        self.assertEqual(self.open_count(self.official), 3)
+
+    def test_reassigning_moves_the_count(self):
+        assign_complaint(self.complaints[0], official=self.other_official)
+        self.assertEqual(self.open_count(self.official), 2)
+        self.assertEqual(self.open_count(self.other_official), 1)
+
+    def test_admin_actions_release_assignments(self):
+        model_admin = CitizenComplaintAdmin(CitizenComplaint, admin.site)
+        queryset = CitizenComplaint.objects.filter(id__in=[self.complaints[0].id, self.complaints[1].id])
+        with mock.patch.object(model_admin, 'message_user'):
+            model_admin.mark_as_resolved(None, queryset)
+            # Already released: closing again must not take the count below the open work
+            model_admin.mark_as_closed(None, queryset)
+        self.assertEqual(self.open_count(self.official), 1)
+        self.assertEqual(ComplaintAssignment.objects.filter(is_open=True).count(), 1)
+
+    def test_deleting_a_complaint_releases_its_assignment(self):
+        self.complaints[0].delete()
+        self.assertEqual(self.open_count(self.official), 2)
+
+    def test_deleting_a_closed_complaint_keeps_the_count(self):
+        model_admin = CitizenComplaintAdmin(CitizenComplaint, admin.site)
+        with mock.patch.object(model_admin, 'message_user'):
+            model_admin.mark_as_closed(None, CitizenComplaint.objects.filter(id=self.complaints[0].id))
+        self.complaints[0].delete()
+        self.assertEqual(self.open_count(self.official), 2)
+
+    def test_town_move_reroutes_open_complaints(self):
+        CitizenComplaint.objects.filter(id=self.complaints[2].id).update(status='resolved')
+        sync_assignment_status([self.complaints[2].id], is_open=False)
+        request = TownChangeRequest.objects.create(
+            user=self.citizen.user, current_town=self.town, requested_town=self.other_town,
+            billing_address={}, status='approved_current',
+        )
+
+        complete_town_changes([request.id], self.other_town, None)
+
+        self.assertEqual(self.open_count(self.official), 0)
+        self.assertEqual(self.open_count(self.other_official), 2)
+        moved = ComplaintAssignment.objects.filter(complaint__town=self.other_town)
+        self.assertEqual(moved.count(), 2)
+        self.assertEqual(set(moved.values_list('official_id', flat=True)), {self.other_official.id})
+
+
+class TrigramSimilarityTests(SimpleTestCase):
+
+    def test_words_are_padded_and_normalized(self):
+        self.assertEqual(trigrams('Pot-HOLE'), {'  p', ' po', 'pot', 'ot ', '  h', ' ho', 'hol', 'ole', 'le '})
+
+    def test_reworded_report_scores_above_threshold(self):
+        first = complaint_trigrams('Pothole on Main Street', 'Deep pothole near the school', 'Main St')
+        second = complaint_trigrams('Big pothole Main Street', 'deep pothole by the school!', 'Main St.')
+        self.assertGreaterEqual(similarity(first, second), SIMILARITY_THRESHOLD)
+
+    def test_unrelated_report_scores_below_threshold(self):
+        first = complaint_trigrams('Pothole on Main Street', 'Deep pothole near the school', 'Main St')
+        other = complaint_trigrams('Broken streetlight', 'Lamp out since Monday', 'Oak Avenue')
+        self.assertLess(similarity(first, other), SIMILARITY_THRESHOLD)
+
+    def test_empty_text_never_matches(self):
+        self.assertEqual(similarity(set(), trigrams('pothole')), 0.0)
+
+
+class DuplicateCandidateTests(TestCase):
+
+    def setUp(self):
+        self.town = Town.objects.create(name='Springfield', slug='springfield', state='NJ')
+        user = User.objects.create_user('citizen@example.com', 'citizen@example.com', 'pw')
+        self.citizen = CitizenProfile.objects.create(user=user, citizen_id='C1')
+
+    def add_complaint(self, title, **extra):
+        fields = {'category': 'roads', 'description': 'Deep pothole near the school', 'location': 'Main St'}
+        fields.update(extra)
+        return CitizenComplaint.objects.create(citizen=self.citizen, town=self.town, title=title, **fields)
+
+    def find(self):
+        return find_duplicate_candidates(
+            self.town, 'roads', 'Pothole on Main Street', 'Deep pothole near the school', 'Main St',
+        )
+
+    def test_best_match_first(self):
+        close = self.add_complaint('Pothole on Main Street')
+        looser = self.add_complaint('Main Street pothole', description='Pothole near school, very deep')
+        self.add_complaint('Broken streetlight', description='Lamp out since Monday', location='Oak Avenue')
+
+        matches = self.find()
+
+        self.assertEqual([complaint for _, complaint in matches], [close, looser])
+        self.assertEqual(matches[0][0], 1.0)
+
+    def test_only_recent_open_complaints_in_category_are_candidates(self):
+        self.add_complaint('Pothole on Main Street', status='resolved')
+        self.add_complaint('Pothole on Main Street', category='parks')
+        old = self.add_complaint('Pothole on Main Street')
+        CitizenComplaint.objects.filter(id=old.id).update(created_at=timezone.now() - timedelta(days=15))
+
+        self.assertEqual(self.find(), [])
+
+
+class GeohashTests(SimpleTestCase):
+
+    def test_encodes_known_cell(self):
+        self.assertEqual(encode_geohash(57.64911, 10.40744, precision=11), 'u4pruydqqvj')
+
+    def test_cell_center_is_within_cell_size(self):
+        # A precision-5 cell is about 0.044 degrees of latitude by 0.044 of longitude
+        latitude, longitude = decode_geohash(encode_geohash(40.7128, -74.0060, precision=5))
+        self.assertAlmostEqual(latitude, 40.7128, delta=0.022)
+        self.assertAlmostEqual(longitude, -74.0060, delta=0.022)
+
+    def test_tiles_are_prefixes_of_finer_cells(self):
+        fine = encode_geohash(40.7128, -74.0060)
+        self.assertEqual(encode_geohash(40.7128, -74.0060, precision=4), fine[:4])
+
+    def test_zoom_maps_to_precision(self):
+        self.assertEqual([precision_for_zoom(zoom) for zoom in (0, 3, 12, 13, 22)], [1, 2, 5, 6, 8])
+
+    def test_bbox_must_be_ordered(self):
+        self.assertEqual(parse_bbox('-75,40,-73,41'), ((-75.0, 40.0, -73.0, 41.0), None))
+        self.assertIsNone(parse_bbox('-73,40,-75,41')[0])
+
+
+class ComplaintMapTests(TestCase):
+
+    def setUp(self):
+        town = Town.objects.create(name='Springfield', slug='springfield', state='NJ')
+        self.citizens = []
+        for number in range(2):
+            user = User.objects.create_user(f'citizen{number}@example.com', f'citizen{number}@example.com', 'pw')
+            UserProfile.objects.create(user=user, role='citizen', town=town, is_approved=True)
+            self.citizens.append(CitizenProfile.objects.create(user=user, citizen_id=f'C{number}'))
+        # Two complaints a few hundred metres apart, and one across town
+        for citizen, (latitude, longitude) in zip(
+            self.citizens + self.citizens[:1], [(40.71280, -74.00600), (40.71500, -74.00900), (40.80000, -74.10000)]
+        ):
+            complaint = CitizenComplaint(citizen=citizen, town=town, title='Pothole', description='Deep', category='roads')
+            complaint.set_coordinates(latitude, longitude)
+            complaint.save()
+        official_user = User.objects.create_user('official@example.com', 'official@example.com', 'pw')
+        UserProfile.objects.create(user=official_user, role='government', town=town, is_approved=True)
+        self.official_headers = {'HTTP_AUTHORIZATION': f'Token {issue_token(official_user).key}'}
+        self.resident_headers = {'HTTP_AUTHORIZATION': f'Token {issue_token(self.citizens[1].user).key}'}
+
+    def tiles(self, headers, zoom):
+        response = self.client.get(f'/api/citizen/complaints/tiles/?zoom={zoom}', **headers)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_official_tiles_follow_zoom(self):
+        data = self.tiles(self.official_headers, 17)
+        self.assertEqual(data['precision'], 7)
+        self.assertEqual(sorted(tile['count'] for tile in data['tiles']), [1, 1, 1])
+        self.assertEqual(sorted(tile['count'] for tile in self.tiles(self.official_headers, 12)['tiles']), [1, 2])
+
+    def test_resident_tiles_are_coarse_and_without_coordinates(self):
+        data = self.tiles(self.resident_headers, 17)
+        self.assertEqual(data['precision'], 5)
+        for tile in data['tiles']:
+            self.assertEqual(len(tile['tile']), 5)
+            self.assertNotIn('latitude', tile)
+
+    def test_resident_map_lists_only_own_points(self):
+        response = self.client.get('/api/citizen/complaints/map/?bbox=-75,40,-73,41', **self.resident_headers)
+        self.assertEqual(len(response.json()['points']), 1)
+        response = self.client.get('/api/citizen/complaints/map/?bbox=-75,40,-73,41', **self.official_headers)
+        self.assertEqual(len(response.json()['points']), 3)
+
+
+class ComplaintSLATests(TestCase):
+
+    def setUp(self):
+        self.town = Town.objects.create(name='Springfield', slug='springfield', state='NJ')
+        user = User.objects.create_user('citizen@example.com', 'citizen@example.com', 'pw')
+        self.citizen = CitizenProfile.objects.create(user=user, citizen_id='C1')
+        official_user = User.objects.create_user('official@example.com', 'official@example.com', 'pw')
+        UserProfile.objects.create(user=official_user, role='government', town=self.town, is_approved=True)
+        self.headers = {'HTTP_AUTHORIZATION': f'Token {issue_token(official_user).key}'}
+        self.now = timezone.now()
+
+    def add_complaint(self, title, due_in_hours=None, **extra):
+        complaint = CitizenComplaint.objects.create(
+            citizen=self.citizen, town=self.town, title=title, description='Deep', category='roads', **extra
+        )
+        if due_in_hours is not None:
+            CitizenComplaint.objects.filter(id=complaint.id).update(due_at=self.now + timedelta(hours=due_in_hours))
+        return complaint
+
+    def test_category_policy_wins_over_town_policy_and_default(self):
+        complaint = self.add_complaint('Pothole', priority='high')
+        self.assertEqual(apply_sla(complaint), complaint.created_at + timedelta(hours=DEFAULT_RESOLUTION_HOURS['high']))
+        ComplaintSLAPolicy.objects.create(town=self.town, category='', priority='high', resolution_hours=48)
+        self.assertEqual(apply_sla(complaint), complaint.created_at + timedelta(hours=48))
+        ComplaintSLAPolicy.objects.create(town=self.town, category='roads', priority='high', resolution_hours=12)
+        self.assertEqual(apply_sla(complaint), complaint.created_at + timedelta(hours=12))
+
+    def test_backfill_sets_deadlines_of_open_complaints_only(self):
+        backfill_due_at = importlib.import_module('citizen.migrations.0009_complaint_sla').backfill_due_at
+        urgent = self.add_complaint('Gas leak', priority='urgent')
+        closed = self.add_complaint('Old pothole', status='closed')
+        kept = self.add_complaint('Pothole', due_in_hours=5)
+        CitizenComplaint.objects.update(due_at=None)
+        CitizenComplaint.objects.filter(id=kept.id).update(due_at=self.now)
+
+        backfill_due_at(apps, None)
+
+        self.assertEqual(
+            CitizenComplaint.objects.get(id=urgent.id).due_at, urgent.created_at + timedelta(hours=24)
+        )
+        self.assertIsNone(CitizenComplaint.objects.get(id=closed.id).due_at)
+        self.assertEqual(CitizenComplaint.objects.get(id=kept.id).due_at, self.now)
+
+    def test_queue_selects_by_state_in_deadline_order(self):
+        later = self.add_complaint('Overdue later', due_in_hours=-1)
+        earlier = self.add_complaint('Overdue earlier', due_in_hours=-5)
+        at_risk = self.add_complaint('At risk', due_in_hours=5)
+        self.add_complaint('On track', due_in_hours=100)
+        self.add_complaint('Resolved', due_in_hours=-10, status='resolved')
+
+        def queue(state):
+            response = self.client.get(f'/api/citizen/complaints/sla-queue/?state={state}', **self.headers)
+            self.assertEqual(response.status_code, 200)
+            return [(item['id'], item['slaState']) for item in response.json()['complaints']]
+
+        self.assertEqual(queue('overdue'), [(earlier.id, 'overdue'), (later.id, 'overdue')])
+        self.assertEqual(queue('at_risk'), [(at_risk.id, 'at_risk')])
+        self.assertEqual([complaint_id for complaint_id, _ in queue('all')], [earlier.id, later.id, at_risk.id])
+
+    def test_escalation_bumps_priority_once(self):
+        overdue = self.add_complaint('Overdue', due_in_hours=-1, priority='medium')
+        self.add_complaint('At risk', due_in_hours=5)
+
+        self.assertEqual(escalate_overdue_complaints(self.now, batch_size=1), 1)
+        self.assertEqual(escalate_overdue_complaints(self.now), 0)
+
+        overdue.refresh_from_db()
+        self.assertEqual((overdue.priority, overdue.escalated_at), ('high', self.now))
+        self.assertEqual(ComplaintComment.objects.filter(complaint=overdue).count(), 1)
@@ -3,6 +3,8 @@ from . import (
     views_complaints,
     views_comments,
     views_notifications,
+    views_map,
+    views_assignment,
 )
 
 urlpatterns = [
@@ -11,8 +13,27 @@ urlpatterns = [
     # POST /citizen/complaints/ - Create complaint
     # PATCH/PUT /citizen/complaints/<id>/ - Update complaint
     path('complaints/', views_complaints.list_complaints_view, name='complaints_list'),
+    
+    # Complaint Map - RESTful
+    # GET /citizen/complaints/map/?bbox=min_lng,min_lat,max_lng,max_lat - Complaint points in a bounding box
+    # GET /citizen/complaints/tiles/?zoom=<z>&bbox=... - Complaint counts aggregated per map tile
+    path('complaints/map/', views_map.complaints_in_bbox_view, name='complaints_map'),
+    path('complaints/tiles/', views_map.complaint_tiles_view, name='complaints_tiles'),
+    
+    # Complaint SLA - RESTful
+    # GET /citizen/complaints/sla-queue/?state=overdue|at_risk|all - Open complaints by SLA deadline
+    path('complaints/sla-queue/', views_complaints.complaint_sla_queue_view, name='complaints_sla_queue'),
     path('complaints/<int:complaint_id>/', views_complaints.update_complaint_view, name='complaint_detail'),
     
+    # Complaint Assignment - RESTful
+    # GET /citizen/complaints/<id>/assignment/ - Get current assignment
+    # POST /citizen/complaints/<id>/assignment/ - Assign to official/department or auto-route
+    path('complaints/<int:complaint_id>/assignment/', views_assignment.complaint_assignment_view, name='complaint_assignment'),
+    
+    # Duplicate clusters - RESTful
+    # GET /citizen/complaint-clusters/<id>/ - List complaints in a duplicate cluster
+    path('complaint-clusters/<int:cluster_id>/', views_complaints.complaint_cluster_view, name='complaint_cluster_detail'),
+    
     # Comments - RESTful
     # POST /citizen/complaints/<id>/comments/ - Add comment
     path('complaints/<int:complaint_id>/comments/', views_comments.add_complaint_comment_view, name='complaint_comments_create'),
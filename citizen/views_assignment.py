@@ -0,0 +1,116 @@
+"""
+Complaint Assignment Views
+Manual and automatic routing of complaints to department work queues
+"""
+
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from .models import CitizenComplaint, ComplaintAssignment
+from .assignment import assign_complaint, route_complaint
+from government.models import Department, GovernmentOfficial
+from government.utils import filter_by_town
+from government.views_utils import check_government_access
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def format_assignment_response(assignment):
+    """Format assignment data for API response"""
+    if assignment is None:
+        return None
+    official = assignment.official
+    return {
+        'department_id': assignment.department_id,
+        'department_name': assignment.department.name if assignment.department else None,
+        'official_id': assignment.official_id,
+        'official_name': (official.user.get_full_name() or official.user.username) if official else None,
+        'is_automatic': assignment.is_automatic,
+        'is_open': assignment.is_open,
+        'assigned_at': assignment.assigned_at.isoformat(),
+    }
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def complaint_assignment_view(request, complaint_id):
+    """
+    Get (GET) or set (POST) a complaint's assignment (government only)
+    POST body: {"official_id": <id>} or {"department_id": <id>} or {"auto": true}
+    """
+    try:
+        is_government, _ = check_government_access(request.user)
+        if not is_government:
+            return Response({
+                'error': 'Only government officials can manage complaint assignments'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        try:
+            complaint = filter_by_town(CitizenComplaint.objects.all(), request.user).get(id=complaint_id)
+        except CitizenComplaint.DoesNotExist:
+            return Response({
+                'error': 'Complaint not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        if request.method == 'GET':
+            assignment = ComplaintAssignment.objects.select_related(
+                'department', 'official__user'
+            ).filter(complaint=complaint).first()
+            return Response({
+                'complaint_id': complaint.id,
+                'assignment': format_assignment_response(assignment),
+            }, status=status.HTTP_200_OK)
+        
+        if str(request.data.get('auto', '')).lower() in ('true', '1', 'yes'):
+            assignment = route_complaint(complaint, assigned_by=request.user)
+            if assignment is None:
+                return Response({
+                    'error': f'No routing rule matches category "{complaint.category}" in this town'
+                }, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            official = None
+            department = None
+            official_id = request.data.get('official_id')
+            department_id = request.data.get('department_id')
+            if not official_id and not department_id:
+                return Response({
+                    'error': 'official_id, department_id or auto is required'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            if official_id:
+                try:
+                    official = filter_by_town(
+                        GovernmentOfficial.objects.select_related('user'), request.user
+                    ).get(id=official_id)
+                except (GovernmentOfficial.DoesNotExist, ValueError):
+                    return Response({
+                        'error': 'Official not found in your town'
+                    }, status=status.HTTP_404_NOT_FOUND)
+            if department_id:
+                try:
+                    department = Department.objects.get(id=department_id)
+                except (Department.DoesNotExist, ValueError):
+                    return Response({
+                        'error': 'Department not found'
+                    }, status=status.HTTP_404_NOT_FOUND)
+            
+            assignment = assign_complaint(
+                complaint,
+                official=official,
+                department=department,
+                assigned_by=request.user,
+            )
+        
+        return Response({
+            'message': 'Complaint assigned successfully',
+            'complaint_id': complaint.id,
+            'assigned_to': complaint.assigned_to,
+            'assignment': format_assignment_response(assignment),
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Error assigning complaint: {str(e)}")
+        return Response({
+            'error': f'An error occurred: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,40 @@
+"""
+Citizen Async Views
+Async-native version of the notification list endpoint (ASGI only)
+"""
+
+from django.http import JsonResponse
+from townhall_project.async_api import async_api_view
+from townhall_project.db_routers import replica_reads
+from .models import CitizenProfile, CitizenNotification
+from .views_notifications import list_notifications_view, format_citizen_notification
+
+
+@async_api_view(list_notifications_view)
+@replica_reads
+async def list_notifications_async_view(request, user):
+    """GET /citizen/notifications/ - same filters and output as list_notifications_view"""
+    citizen_profile = await CitizenProfile.objects.filter(user=user).afirst()
+    if not citizen_profile:
+        return JsonResponse({
+            'error': 'Citizen profile not found'
+        }, status=403)
+    
+    is_read = request.GET.get('is_read')
+    notification_type = request.GET.get('type')
+    
+    notifications = CitizenNotification.objects.filter(citizen=citizen_profile)
+    
+    if is_read is not None:
+        notifications = notifications.filter(is_read=is_read.lower() == 'true')
+    if notification_type:
+        notifications = notifications.filter(notification_type=notification_type)
+    
+    notifications = notifications.select_related('complaint', 'complaint__citizen').order_by('-created_at')
+    
+    data = [format_citizen_notification(notification) async for notification in notifications.aiterator()]
+    
+    return JsonResponse({
+        'notifications': data,
+        'unread_count': await CitizenNotification.objects.filter(citizen=citizen_profile, is_read=False).acount(),
+    })
@@ -7,11 +7,18 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from .models import CitizenProfile, CitizenComplaint, ComplaintAttachment
+from .models import CitizenProfile, CitizenComplaint, ComplaintAttachment, ComplaintCluster
 from authentication.models import UserProfile
 from government.utils import get_user_town, filter_by_town
 from .file_validator import validate_uploaded_file, sanitize_filename
 from .views_utils import check_citizen_access, get_citizen_profile, validate_required_field
+from .duplicates import find_duplicate_candidates, link_to_cluster
+from .geo import parse_coordinates
+from .assignment import route_complaint, sync_assignment_status
+from .sla import apply_sla, get_sla_state, AT_RISK_HOURS, OPEN_STATUSES
+from townhall_project.db_routers import replica_reads
+from django.utils import timezone
+from datetime import timedelta
 import os
 import logging
 
@@ -20,6 +27,7 @@ logger = logging.getLogger(__name__)
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def list_complaints_view(request):
     """List complaints (GET) or create complaint (POST)"""
     if request.method == 'GET':
@@ -82,12 +90,18 @@ def list_complaints_view(request):
                     'created': complaint.created_at.strftime('%Y-%m-%d'),
                     'category': complaint.category,
                     'location': complaint.location or '',
+                    'latitude': complaint.latitude,
+                    'longitude': complaint.longitude,
                     'assignedTo': complaint.assigned_to or '',
                     'estimatedResolution': complaint.estimated_resolution or '',
+                    'dueAt': complaint.due_at.isoformat() if complaint.due_at else None,
+                    'slaState': get_sla_state(complaint),
                     'attachments': attachments,
                     'comments': comments,
                     'citizenName': complaint.citizen.user.get_full_name() or complaint.citizen.user.username,
                     'citizenEmail': complaint.citizen.user.email,
+                    'clusterId': complaint.cluster_id,
+                    'duplicateScore': complaint.duplicate_score,
                 })
             
             return Response(data, status=status.HTTP_200_OK)
@@ -98,13 +112,18 @@ def list_complaints_view(request):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     elif request.method == 'POST':
-        return create_complaint_view(request)
+        return create_complaint(request)
 
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def create_complaint_view(request):
     """Create a new complaint"""
+    return create_complaint(request)
+
+
+def create_complaint(request):
+    """Create a complaint from an authenticated DRF request (shared by the POST views)"""
     try:
         is_citizen, profile = check_citizen_access(request.user)
         if not is_citizen:
@@ -156,7 +175,11 @@ def create_complaint_view(request):
             estimated_resolution = estimated_resolution[0] if estimated_resolution else ''
         estimated_resolution = str(estimated_resolution).strip()
         
-        complaint = CitizenComplaint.objects.create(
+        latitude, longitude, error = parse_coordinates(request.data)
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        
+        complaint = CitizenComplaint(
             citizen=citizen_profile,
             town=town,
             title=title,
@@ -168,6 +191,27 @@ def create_complaint_view(request):
             assigned_to=assigned_to,
             estimated_resolution=estimated_resolution,
         )
+        complaint.set_coordinates(latitude, longitude)
+        apply_sla(complaint)
+        complaint.save()
+        
+        # Only the count is returned: the matches are other residents' complaints
+        possible_duplicate_count = 0
+        try:
+            matches = find_duplicate_candidates(town, category, title, description, location, exclude_id=complaint.id)
+            if matches:
+                best_score, best_match = matches[0]
+                link_to_cluster(complaint, best_match, best_score)
+                possible_duplicate_count = len(matches)
+        except Exception as e:
+            logger.error(f"Error checking duplicate complaints: {str(e)}")
+        
+        # Route to a department work queue unless an assignee was given explicitly
+        if not assigned_to:
+            try:
+                route_complaint(complaint)
+            except Exception as e:
+                logger.error(f"Error auto-assigning complaint: {str(e)}")
         
         attachments = []
         if request.FILES:
@@ -213,8 +257,14 @@ def create_complaint_view(request):
                 'priority': complaint.priority,
                 'created': complaint.created_at.strftime('%Y-%m-%d'),
                 'category': complaint.category,
+                'latitude': complaint.latitude,
+                'longitude': complaint.longitude,
+                'due_at': complaint.due_at.isoformat() if complaint.due_at else None,
+                'assigned_to': complaint.assigned_to or '',
                 'attachments': attachments,
-            }
+                'cluster_id': complaint.cluster_id,
+            },
+            'possible_duplicate_count': possible_duplicate_count,
         }, status=status.HTTP_201_CREATED)
     except Exception as e:
         logger.error(f"Error creating complaint: {str(e)}")
@@ -249,6 +299,8 @@ def update_complaint_view(request, complaint_id):
                     'error': 'You can only update your own complaints'
                 }, status=status.HTTP_403_FORBIDDEN)
         
+        previous_status = complaint.status
+        
         if 'title' in request.data:
             complaint.title = request.data.get('title', '').strip()
         if 'description' in request.data:
@@ -257,6 +309,11 @@ def update_complaint_view(request, complaint_id):
             complaint.category = request.data.get('category', '').strip()
         if 'location' in request.data:
             complaint.location = request.data.get('location', '').strip()
+        if 'latitude' in request.data or 'longitude' in request.data:
+            latitude, longitude, error = parse_coordinates(request.data)
+            if error:
+                return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+            complaint.set_coordinates(latitude, longitude)
         if 'priority' in request.data:
             complaint.priority = request.data.get('priority', 'medium')
         if 'status' in request.data and profile.role == 'government':
@@ -265,9 +322,27 @@ def update_complaint_view(request, complaint_id):
             complaint.assigned_to = request.data.get('assigned_to', '').strip()
         if 'estimated_resolution' in request.data and profile.role == 'government':
             complaint.estimated_resolution = request.data.get('estimated_resolution', '').strip()
+        if 'priority' in request.data or 'category' in request.data:
+            apply_sla(complaint)
         
         complaint.save()
         
+        # Resolving one complaint in a duplicate cluster resolves the whole cluster
+        cluster_updated = 0
+        apply_to_cluster = str(request.data.get('apply_to_cluster', 'true')).lower() not in ('false', '0', 'no')
+        changed_ids = [complaint.id]
+        if 'status' in request.data and profile.role == 'government' and complaint.cluster_id and apply_to_cluster:
+            cluster_complaints = CitizenComplaint.objects.filter(
+                cluster_id=complaint.cluster_id
+            ).exclude(id=complaint.id)
+            changed_ids += list(cluster_complaints.values_list('id', flat=True))
+            cluster_updated = cluster_complaints.update(status=complaint.status, updated_at=timezone.now())
+        
+        # Keep per-official open assignment counters in step with the status change
+        is_open = complaint.status in OPEN_STATUSES
+        if is_open != (previous_status in OPEN_STATUSES) or cluster_updated:
+            sync_assignment_status(changed_ids, is_open)
+        
         return Response({
             'message': 'Complaint updated successfully',
             'complaint': {
@@ -275,7 +350,9 @@ def update_complaint_view(request, complaint_id):
                 'title': complaint.title,
                 'status': complaint.status,
                 'priority': complaint.priority,
-            }
+                'cluster_id': complaint.cluster_id,
+            },
+            'cluster_updated': cluster_updated,
         }, status=status.HTTP_200_OK)
     except Exception as e:
         logger.error(f"Error updating complaint: {str(e)}")
@@ -283,3 +360,128 @@ def update_complaint_view(request, complaint_id):
             'error': f'An error occurred: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def complaint_cluster_view(request, cluster_id):
+    """List the complaints linked into a duplicate cluster (government only)"""
+    try:
+        try:
+            profile = UserProfile.objects.get(user=request.user)
+        except UserProfile.DoesNotExist:
+            return Response({
+                'error': 'User profile not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        if profile.role != 'government' and not request.user.is_superuser:
+            return Response({
+                'error': 'Only government officials can view complaint clusters'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        clusters = filter_by_town(ComplaintCluster.objects.all(), request.user)
+        try:
+            cluster = clusters.select_related('primary_complaint').get(id=cluster_id)
+        except ComplaintCluster.DoesNotExist:
+            return Response({
+                'error': 'Complaint cluster not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        complaints = cluster.complaints.select_related('citizen', 'citizen__user').order_by('created_at')
+        
+        return Response({
+            'id': cluster.id,
+            'category': cluster.category,
+            'primary_complaint_id': cluster.primary_complaint_id,
+            'created_at': cluster.created_at.strftime('%Y-%m-%d %H:%M'),
+            'complaints': [
+                {
+                    'id': complaint.id,
+                    'title': complaint.title,
+                    'location': complaint.location or '',
+                    'status': complaint.status,
+                    'priority': complaint.priority,
+                    'duplicate_score': complaint.duplicate_score,
+                    'created': complaint.created_at.strftime('%Y-%m-%d'),
+                    'citizenName': complaint.citizen.user.get_full_name() or complaint.citizen.user.username,
+                }
+                for complaint in complaints
+            ],
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Error getting complaint cluster: {str(e)}")
+        return Response({
+            'error': f'An error occurred: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def complaint_sla_queue_view(request):
+    """Overdue and at-risk open complaints ordered by SLA deadline (government only)"""
+    try:
+        try:
+            profile = UserProfile.objects.get(user=request.user)
+        except UserProfile.DoesNotExist:
+            return Response({
+                'error': 'User profile not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        if profile.role != 'government' and not request.user.is_superuser:
+            return Response({
+                'error': 'Only government officials can view the SLA queue'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        state = request.query_params.get('state', 'all')
+        if state not in ['overdue', 'at_risk', 'all']:
+            return Response({
+                'error': 'state must be "overdue", "at_risk" or "all"'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 100)), 500))
+        except (TypeError, ValueError):
+            limit = 100
+        
+        now = timezone.now()
+        at_risk_until = now + timedelta(hours=AT_RISK_HOURS)
+        
+        queue = filter_by_town(CitizenComplaint.objects.all(), request.user).filter(
+            status__in=OPEN_STATUSES,
+            due_at__isnull=False,
+        )
+        if state == 'overdue':
+            queue = queue.filter(due_at__lte=now)
+        elif state == 'at_risk':
+            queue = queue.filter(due_at__gt=now, due_at__lte=at_risk_until)
+        else:
+            queue = queue.filter(due_at__lte=at_risk_until)
+        
+        complaints = queue.select_related('citizen', 'citizen__user').order_by('due_at')[:limit]
+        
+        data = []
+        for complaint in complaints:
+            data.append({
+                'id': complaint.id,
+                'title': complaint.title,
+                'category': complaint.category,
+                'priority': complaint.priority,
+                'status': complaint.status,
+                'assignedTo': complaint.assigned_to or '',
+                'created': complaint.created_at.strftime('%Y-%m-%d'),
+                'dueAt': complaint.due_at.isoformat(),
+                'slaState': get_sla_state(complaint, now),
+                'escalated': complaint.escalated_at is not None,
+                'citizenName': complaint.citizen.user.get_full_name() or complaint.citizen.user.username,
+            })
+        
+        return Response({
+            'state': state,
+            'complaints': data,
+            'as_of': now.isoformat(),
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Error getting complaint SLA queue: {str(e)}")
+        return Response({
+            'error': f'An error occurred: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
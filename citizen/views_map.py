@@ -0,0 +1,155 @@
+"""
+Complaint Map Views
+Bounding-box queries and pre-aggregated map tiles for complaint locations
+"""
+
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from django.db.models import Avg, Count
+from django.db.models.functions import Substr
+from .models import CitizenComplaint
+from .geo import parse_bbox, precision_for_zoom, decode_geohash
+from government.utils import filter_by_town
+from authentication.models import UserProfile
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Maximum number of individual points returned by a bounding-box query
+MAX_MAP_POINTS = 1000
+
+# Finest tile precision shown to residents (about 5 km x 5 km), so a tile never pinpoints one complaint
+RESIDENT_MAX_TILE_PRECISION = 5
+
+
+def _is_official(user):
+    """Government officials and superusers see town-wide complaint locations"""
+    if user.is_superuser:
+        return True
+    return UserProfile.objects.filter(user=user, role='government').exists()
+
+
+def _located_complaints(request, own_only=False):
+    """Town-scoped complaints that have coordinates, with status/category filters applied"""
+    complaints = filter_by_town(CitizenComplaint.objects.all(), request.user).exclude(geohash='')
+    if own_only:
+        complaints = complaints.filter(citizen__user=request.user)
+
+    status_filter = request.query_params.get('status', None)
+    if status_filter and status_filter != 'all':
+        complaints = complaints.filter(status=status_filter)
+
+    category_filter = request.query_params.get('category', None)
+    if category_filter and category_filter != 'all':
+        complaints = complaints.filter(category=category_filter)
+
+    return complaints
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def complaints_in_bbox_view(request):
+    """
+    List complaint points inside a bounding box - ?bbox=min_lng,min_lat,max_lng,max_lat
+    Officials get every complaint in their town; residents only their own
+    """
+    try:
+        bbox, error = parse_bbox(request.query_params.get('bbox'))
+        if error or not bbox:
+            return Response({
+                'error': error or 'bbox is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        min_lng, min_lat, max_lng, max_lat = bbox
+        complaints = _located_complaints(request, own_only=not _is_official(request.user)).filter(
+            latitude__gte=min_lat,
+            latitude__lte=max_lat,
+            longitude__gte=min_lng,
+            longitude__lte=max_lng,
+        ).order_by('-created_at').values_list(
+            'id', 'latitude', 'longitude', 'category', 'status', 'priority'
+        )[:MAX_MAP_POINTS + 1]
+
+        rows = list(complaints)
+        truncated = len(rows) > MAX_MAP_POINTS
+
+        return Response({
+            'fields': ['id', 'latitude', 'longitude', 'category', 'status', 'priority'],
+            'points': rows[:MAX_MAP_POINTS],
+            'truncated': truncated,
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Error querying complaints by bounding box: {str(e)}")
+        return Response({
+            'error': f'An error occurred: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def complaint_tiles_view(request):
+    """
+    Aggregated complaint counts per map tile - ?zoom=<0-22>&bbox=min_lng,min_lat,max_lng,max_lat
+    Residents get town-wide counts on coarse tiles, without the averaged coordinates
+    """
+    try:
+        try:
+            zoom = int(request.query_params.get('zoom', 12))
+        except (TypeError, ValueError):
+            return Response({
+                'error': 'zoom must be an integer'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        zoom = max(0, min(zoom, 22))
+        precision = precision_for_zoom(zoom)
+        is_official = _is_official(request.user)
+        if not is_official:
+            precision = min(precision, RESIDENT_MAX_TILE_PRECISION)
+
+        bbox, error = parse_bbox(request.query_params.get('bbox'))
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+
+        complaints = _located_complaints(request)
+        if bbox:
+            min_lng, min_lat, max_lng, max_lat = bbox
+            complaints = complaints.filter(
+                latitude__gte=min_lat,
+                latitude__lte=max_lat,
+                longitude__gte=min_lng,
+                longitude__lte=max_lng,
+            )
+
+        tiles = complaints.annotate(
+            tile=Substr('geohash', 1, precision)
+        ).values('tile').annotate(
+            count=Count('id'),
+            latitude=Avg('latitude'),
+            longitude=Avg('longitude'),
+        ).order_by()
+
+        data = []
+        for tile in tiles:
+            center_lat, center_lng = decode_geohash(tile['tile'])
+            item = {
+                'tile': tile['tile'],
+                'count': tile['count'],
+                'center': [round(center_lat, 6), round(center_lng, 6)],
+            }
+            if is_official:
+                item['latitude'] = round(tile['latitude'], 6)
+                item['longitude'] = round(tile['longitude'], 6)
+            data.append(item)
+
+        return Response({
+            'zoom': zoom,
+            'precision': precision,
+            'tiles': data,
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Error aggregating complaint tiles: {str(e)}")
+        return Response({
+            'error': f'An error occurred: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
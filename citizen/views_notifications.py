@@ -11,13 +11,32 @@ from .models import CitizenProfile, CitizenNotification, CitizenComplaint, Compl
 from government.models import GovernmentOfficial
 from government.utils import get_user_town
 from .views_utils import get_citizen_profile
+from townhall_project.db_routers import replica_reads
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def format_citizen_notification(notification):
+    """
+    Format a citizen notification for API response
+    Expects complaint to be loaded
+    """
+    return {
+        'id': notification.id,
+        'type': notification.notification_type,
+        'title': notification.title,
+        'message': notification.message,
+        'is_read': notification.is_read,
+        'created_at': notification.created_at.strftime('%Y-%m-%d %H:%M'),
+        'complaint_id': notification.complaint.id if notification.complaint else None,
+        'complaint_title': notification.complaint.title if notification.complaint else None,
+    }
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def list_notifications_view(request):
     """List notifications for the authenticated citizen"""
     try:
@@ -41,16 +60,7 @@ def list_notifications_view(request):
         
         data = []
         for notification in notifications:
-            data.append({
-                'id': notification.id,
-                'type': notification.notification_type,
-                'title': notification.title,
-                'message': notification.message,
-                'is_read': notification.is_read,
-                'created_at': notification.created_at.strftime('%Y-%m-%d %H:%M'),
-                'complaint_id': notification.complaint.id if notification.complaint else None,
-                'complaint_title': notification.complaint.title if notification.complaint else None,
-            })
+            data.append(format_citizen_notification(notification))
         
         return Response({
             'notifications': data,
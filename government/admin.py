@@ -1,7 +1,7 @@
 from django.contrib import admin
 from .models import (
     GovernmentOfficial, Department, Position, Service, Announcement, 
-    ComplaintResponse, BillProposal, BillComment, BillVote
+    ComplaintResponse, BillProposal, BillComment, BillVote, ComplaintRoutingRule
 )
 
 
@@ -10,7 +10,7 @@ class GovernmentOfficialAdmin(admin.ModelAdmin):
     list_display = ('user', 'employee_id', 'department', 'position', 'town', 'can_view_users', 'can_approve_users', 'created_at')
     list_filter = ('department', 'position', 'town', 'can_view_users', 'can_approve_users', 'created_at')
     search_fields = ('employee_id', 'user__email', 'user__first_name', 'user__last_name', 'department', 'position')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('open_assignment_count', 'created_at', 'updated_at')
     ordering = ('-created_at',)
     
     fieldsets = (
@@ -20,6 +20,9 @@ class GovernmentOfficialAdmin(admin.ModelAdmin):
         ('Contact', {
             'fields': ('phone_number', 'office_address', 'town')
         }),
+        ('Work Queue', {
+            'fields': ('accepts_assignments', 'open_assignment_count')
+        }),
         ('Permissions', {
             'fields': ('can_view_users', 'can_approve_users'),
             'description': 'Grant permissions to this government official. can_view_users allows viewing citizen/business owner details. can_approve_users allows approving/rejecting users from their town.'
@@ -251,3 +254,12 @@ class BillVoteAdmin(admin.ModelAdmin):
     search_fields = ('bill__title', 'user__email')
     readonly_fields = ('created_at', 'updated_at')
     ordering = ('-created_at',)
+
+
+@admin.register(ComplaintRoutingRule)
+class ComplaintRoutingRuleAdmin(admin.ModelAdmin):
+    list_display = ('town', 'category', 'department', 'updated_at')
+    list_filter = ('town', 'department')
+    search_fields = ('town__name', 'category', 'department__name')
+    readonly_fields = ('created_at', 'updated_at')
+    ordering = ('town', 'category')
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.7 on 2026-10-19 12:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('government', '0009_billproposal_billcomment_billvote'),
+        ('towns', '0004_town_emergency_animal_control_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComplaintRoutingRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(blank=True, help_text='Leave blank to route every unmatched category', max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['town', 'category'],
+            },
+        ),
+        migrations.AddField(
+            model_name='governmentofficial',
+            name='accepts_assignments',
+            field=models.BooleanField(default=True, help_text='If False, the auto-router skips this official'),
+        ),
+        migrations.AddField(
+            model_name='governmentofficial',
+            name='open_assignment_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of open complaints currently assigned (maintained by the assignment engine)'),
+        ),
+        migrations.AddIndex(
+            model_name='governmentofficial',
+            index=models.Index(fields=['town', 'department', 'open_assignment_count'], name='gov_official_workload_idx'),
+        ),
+        migrations.AddField(
+            model_name='complaintroutingrule',
+            name='department',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='routing_rules', to='government.department'),
+        ),
+        migrations.AddField(
+            model_name='complaintroutingrule',
+            name='town',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='complaint_routing_rules', to='towns.town'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='complaintroutingrule',
+            unique_together={('town', 'category')},
+        ),
+    ]
@@ -22,9 +22,24 @@ class GovernmentOfficial(models.Model):
         help_text="If True, this government official can approve/reject citizens and business owners from their town"
     )
     
+    # Complaint work queue
+    accepts_assignments = models.BooleanField(
+        default=True,
+        help_text="If False, the auto-router skips this official"
+    )
+    open_assignment_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of open complaints currently assigned (maintained by the assignment engine)"
+    )
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['town', 'department', 'open_assignment_count'], name='gov_official_workload_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.position}"
 
@@ -43,6 +58,22 @@ class Department(models.Model):
         return self.name
 
 
+class ComplaintRoutingRule(models.Model):
+    """Routes complaints of a category in a town to a department's work queue"""
+    town = models.ForeignKey('towns.Town', on_delete=models.CASCADE, related_name='complaint_routing_rules')
+    category = models.CharField(max_length=100, blank=True, help_text="Leave blank to route every unmatched category")
+    department = models.ForeignKey(Department, on_delete=models.CASCADE, related_name='routing_rules')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['town', 'category']
+        unique_together = [['town', 'category']]
+    
+    def __str__(self):
+        return f"{self.town} / {self.category or 'all categories'} -> {self.department.name}"
+
+
 class Position(models.Model):
     """Model for government positions/job titles"""
     name = models.CharField(max_length=200)
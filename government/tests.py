@@ -0,0 +1,249 @@
+"""
+Government Tests
+Query budgets of list endpoints, enforced with QUERY_BUDGET_STRICT (townhall_project.query_budget)
+Bulk license review (government.views_licenses)
+Leased license review queue: order, disjoint claims, lapsed leases and release (government.license_queue)
+Unified complaint feed: one UNION ALL, ordered and paginated in SQL (government.views_complaints)
+"""
+
+from datetime import timedelta
+from unittest import mock
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from authentication.authentication import issue_token
+from authentication.models import UserProfile
+from townhall_project.query_budget import QueryBudgetExceeded
+from citizen.models import CitizenComplaint, CitizenProfile
+from businessowner.models import BusinessComplaint, BusinessLicense, BusinessNotification, BusinessOwnerProfile
+from towns.models import Town
+from .license_queue import claim_licenses, is_claimed_by_other, release_claims
+from .models import BillComment, BillProposal, BillVote, Department, GovernmentOfficial
+from .views_bills import bills_list_create_view
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class BillListQueryBudgetTests(TestCase):
+
+    def setUp(self):
+        self.town = Town.objects.create(name='Springfield', slug='springfield', state='NJ')
+        official_user = User.objects.create_user('official@example.com', 'official@example.com', 'pw')
+        self.official = GovernmentOfficial.objects.create(
+            user=official_user, employee_id='E1', department='Clerk', position='Clerk', town=self.town,
+        )
+        self.department = Department.objects.create(name='Clerk', description='Records')
+        citizen = User.objects.create_user('citizen@example.com', 'citizen@example.com', 'pw')
+        UserProfile.objects.create(user=citizen, role='citizen', town=self.town, is_approved=True)
+        self.voters = [citizen] + [
+            User.objects.create_user(f'voter{number}@example.com', f'voter{number}@example.com', 'pw')
+            for number in range(3)
+        ]
+        self.headers = {'HTTP_AUTHORIZATION': f'Token {issue_token(citizen).key}'}
+        # Loads the token into the token cache, so measured requests all take the cached path
+        self.list_bills()
+
+    def add_bills(self, count):
+        for number in range(count):
+            bill = BillProposal.objects.create(
+                title=f'Bill {number}', description='Text', department=self.department,
+                town=self.town, created_by=self.official, status='published',
+            )
+            for voter in self.voters:
+                BillVote.objects.create(bill=bill, user=voter, vote_type='support')
+            BillComment.objects.create(bill=bill, user=self.voters[1], comment_text='Agreed')
+
+    def list_bills(self, query=''):
+        response = self.client.get(f'/api/government/bills/{query}', **self.headers)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_query_count_does_not_grow_with_bills(self):
+        self.add_bills(2)
+        few = self.list_bills().wsgi_request.query_stats.count
+        self.add_bills(8)
+        response = self.list_bills()
+        self.assertEqual(len(response.json()), 10)
+        self.assertEqual(response.wsgi_request.query_stats.count, few)
+
+    def test_sorted_by_votes_within_budget(self):
+        self.add_bills(5)
+        self.list_bills('?sort=votes')
+
+    def test_strict_mode_fails_the_request_over_budget(self):
+        # The same request under a budget one below what it runs: proves the checks above can fail
+        self.add_bills(2)
+        used = self.list_bills().wsgi_request.query_stats.count
+        with mock.patch.object(bills_list_create_view, 'query_budget', used - 1):
+            with self.assertLogs('townhall_project.middleware', 'WARNING'), self.assertRaises(QueryBudgetExceeded):
+                self.client.get('/api/government/bills/', **self.headers)
+
+
+class BulkLicenseReviewTests(TestCase):
+
+    def setUp(self):
+        town = Town.objects.create(name='Springfield', slug='springfield', state='NJ')
+        owner_user = User.objects.create_user('owner@example.com', 'owner@example.com', 'pw')
+        UserProfile.objects.create(user=owner_user, role='business', town=town, is_approved=True)
+        owner = BusinessOwnerProfile.objects.create(
+            user=owner_user, business_name='Cafe', business_registration_number='R1',
+            business_type='cafe', business_address='1 Main St',
+        )
+        self.licenses = [
+            BusinessLicense.objects.create(
+                business_owner=owner, license_type='Retail License', license_number=f'L{number}', status=license_status,
+            )
+            for number, license_status in enumerate(['pending', 'pending', 'approved'])
+        ]
+        official_user = User.objects.create_user('official@example.com', 'official@example.com', 'pw')
+        UserProfile.objects.create(user=official_user, role='government', town=town, is_approved=True)
+        GovernmentOfficial.objects.create(
+            user=official_user, employee_id='E1', department='Clerk', position='Clerk', town=town,
+        )
+        self.headers = {'HTTP_AUTHORIZATION': f'Token {issue_token(official_user).key}'}
+
+    def test_reject_skips_reviewed_licenses_and_notifies_once_each(self):
+        response = self.client.post(
+            '/api/government/licenses/bulk-review/',
+            {'license_ids': [license_obj.id for license_obj in self.licenses], 'action': 'reject'},
+            content_type='application/json', **self.headers,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['message'], '2 license application(s) rejected')
+        self.assertEqual(response.json()['skipped'], [self.licenses[2].id])
+        self.assertEqual(
+            list(BusinessNotification.objects.values_list('notification_type', 'title')),
+            [('application_rejected', 'License Application Rejected')] * 2,
+        )
+        self.licenses[2].refresh_from_db()
+        self.assertEqual(self.licenses[2].status, 'approved')
+
+
+class ComplaintFeedTests(TestCase):
+
+    def setUp(self):
+        town = Town.objects.create(name='Springfield', slug='springfield', state='NJ')
+        other_town = Town.objects.create(name='Shelbyville', slug='shelbyville', state='NJ')
+        citizen_user = User.objects.create_user('citizen@example.com', 'citizen@example.com', 'pw')
+        citizen_user.first_name, citizen_user.last_name = 'Marge', 'Simpson'
+        citizen_user.save()
+        citizen = CitizenProfile.objects.create(user=citizen_user, citizen_id='C1')
+        owner_user = User.objects.create_user('owner@example.com', 'owner@example.com', 'pw')
+        owner = BusinessOwnerProfile.objects.create(
+            user=owner_user, business_name='Cafe', business_registration_number='R1',
+            business_type='cafe', business_address='1 Main St',
+        )
+        now = timezone.now()
+        # Newest first: citizen, business, citizen, business, citizen
+        self.expected = []
+        for age, (model, submitter) in enumerate([
+            (CitizenComplaint, {'citizen': citizen}), (BusinessComplaint, {'business_owner': owner}),
+        ] * 2 + [(CitizenComplaint, {'citizen': citizen})]):
+            complaint = model.objects.create(
+                town=town, title=f'Complaint {age}', description='Text', category='roads',
+                status='resolved' if age == 1 else 'pending', **submitter,
+            )
+            model.objects.filter(id=complaint.id).update(created_at=now - timedelta(hours=age))
+            self.expected.append(('citizen' if model is CitizenComplaint else 'business', complaint.id))
+        CitizenComplaint.objects.create(citizen=citizen, town=other_town, title='Elsewhere', description='Text', category='roads')
+        official_user = User.objects.create_user('official@example.com', 'official@example.com', 'pw')
+        UserProfile.objects.create(user=official_user, role='government', town=town, is_approved=True)
+        self.headers = {'HTTP_AUTHORIZATION': f'Token {issue_token(official_user).key}'}
+
+    def feed(self, query):
+        response = self.client.get(f'/api/government/complaints/feed/?{query}', **self.headers)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_pages_interleave_both_sources_by_date(self):
+        pages = [self.feed(f'page={page}&page_size=2') for page in (1, 2, 3)]
+        self.assertEqual(
+            [(item['type'], item['id']) for page in pages for item in page['complaints']], self.expected
+        )
+        self.assertEqual([page['has_next'] for page in pages], [True, True, False])
+        self.assertEqual(pages[0]['complaints'][0]['submitter'], 'Marge Simpson')
+        self.assertEqual(pages[0]['complaints'][1]['submitter'], 'Cafe')
+
+    def test_filters_apply_to_both_sides(self):
+        data = self.feed('status=pending&page_size=10')
+        self.assertEqual([(item['type'], item['id']) for item in data['complaints']], self.expected[:1] + self.expected[2:])
+
+    def test_type_selects_one_side(self):
+        data = self.feed('type=business')
+        self.assertEqual({item['type'] for item in data['complaints']}, {'business'})
+        self.assertEqual(len(data['complaints']), 2)
+
+
+class LicenseReviewQueueTests(TestCase):
+
+    def setUp(self):
+        self.town = Town.objects.create(name='Springfield', slug='springfield', state='NJ')
+        other_town = Town.objects.create(name='Shelbyville', slug='shelbyville', state='NJ')
+        self.owner = self.add_owner('owner@example.com', self.town)
+        self.outsider = self.add_owner('outsider@example.com', other_town)
+        self.reviewers = [self.add_reviewer(f'reviewer{number}@example.com') for number in range(2)]
+        today = timezone.localdate()
+        # (name, license type, fee paid, days since submission); expected queue order below
+        self.licenses = {
+            name: self.add_license(name, license_type, fee_paid, today - timedelta(days=age))
+            for name, license_type, fee_paid, age in [
+                ('retail_old', 'Retail License', False, 3),
+                ('health_new', 'Health Department Permit', False, 1),
+                ('retail_new', 'Retail License', False, 1),
+                ('paid_new', 'Retail License', True, 0),
+            ]
+        }
+        self.add_license('elsewhere', 'Retail License', True, today - timedelta(days=9), owner=self.outsider)
+        self.expected_order = ['paid_new', 'retail_old', 'health_new', 'retail_new']
+
+    def add_owner(self, email, town):
+        user = User.objects.create_user(email, email, 'pw')
+        UserProfile.objects.create(user=user, role='business', town=town, is_approved=True)
+        return BusinessOwnerProfile.objects.create(
+            user=user, business_name=email, business_registration_number=email,
+            business_type='shop', business_address='1 Main St',
+        )
+
+    def add_reviewer(self, email):
+        user = User.objects.create_user(email, email, 'pw')
+        UserProfile.objects.create(user=user, role='government', town=self.town, is_approved=True)
+        return GovernmentOfficial.objects.create(
+            user=user, employee_id=email, department='Clerk', position='Clerk', town=self.town,
+        )
+
+    def add_license(self, name, license_type, fee_paid, submitted_on, owner=None):
+        return BusinessLicense.objects.create(
+            business_owner=owner or self.owner, license_type=license_type, license_number=name,
+            fee_paid=fee_paid, submitted_on=submitted_on,
+        )
+
+    def claim(self, reviewer, count):
+        return claim_licenses(reviewer, reviewer.user, self.town, count)
+
+    def names(self, ids):
+        by_id = {license_obj.id: name for name, license_obj in self.licenses.items()}
+        return [by_id[license_id] for license_id in ids]
+
+    def test_claims_follow_queue_order_and_never_overlap(self):
+        first = self.claim(self.reviewers[0], 2)
+        second = self.claim(self.reviewers[1], 5)
+
+        self.assertEqual(self.names(first + second), self.expected_order)
+        self.assertEqual(self.claim(self.reviewers[0], 1), [])
+
+    def test_lapsed_lease_can_be_claimed_again(self):
+        claimed = self.claim(self.reviewers[0], 1)
+        license_obj = BusinessLicense.objects.get(id=claimed[0])
+        self.assertTrue(is_claimed_by_other(license_obj, self.reviewers[1]))
+
+        BusinessLicense.objects.filter(id__in=claimed).update(claim_expires_at=timezone.now() - timedelta(seconds=1))
+        license_obj.refresh_from_db()
+
+        self.assertFalse(is_claimed_by_other(license_obj, self.reviewers[1]))
+        self.assertEqual(self.claim(self.reviewers[1], 1), claimed)
+
+    def test_released_claims_return_to_the_queue(self):
+        claimed = self.claim(self.reviewers[0], 2)
+        self.assertEqual(release_claims(self.reviewers[0], claimed[:1]), 1)
+        self.assertEqual(self.claim(self.reviewers[1], 1), claimed[:1])
+        self.assertEqual(release_claims(self.reviewers[0]), 1)
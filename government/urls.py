@@ -7,6 +7,8 @@ from . import (
     views_officials,
     views_bills,
     views_licenses,
+    views_routing,
+    views_complaints,
 )
 
 urlpatterns = [
@@ -44,9 +46,22 @@ urlpatterns = [
     # GET /government/officials/ - List officials
     # GET /government/officials/<id>/ - Get official
     # PATCH /government/officials/<id>/ - Update official permissions
+    # GET /government/officials/workload/ - Open complaint assignments per official
     path('officials/', views_officials.list_government_officials_view, name='officials_list'),
+    path('officials/workload/', views_officials.officials_workload_view, name='officials_workload'),
     path('officials/<int:official_id>/', views_officials.update_government_official_permissions_view, name='official_detail'),
     
+    # Complaint Feed - RESTful
+    # GET /government/complaints/feed/ - Unified citizen + business complaint inbox (paginated)
+    path('complaints/feed/', views_complaints.complaint_feed_view, name='complaint_feed'),
+    
+    # Complaint Routing Rules - RESTful
+    # GET /government/complaint-routing-rules/ - List routing rules for the user's town
+    # POST /government/complaint-routing-rules/ - Create or replace a routing rule
+    # DELETE /government/complaint-routing-rules/<id>/ - Delete routing rule
+    path('complaint-routing-rules/', views_routing.routing_rules_view, name='complaint_routing_rules'),
+    path('complaint-routing-rules/<int:rule_id>/', views_routing.delete_routing_rule_view, name='complaint_routing_rule_detail'),
+    
     # Bill Proposals - RESTful
     # GET /government/bills/ - List bills
     # POST /government/bills/ - Create bill
@@ -68,9 +83,16 @@ urlpatterns = [
     # GET /government/licenses/<id>/ - Get license details
     # PATCH /government/licenses/<id>/review/ - Review and approve/reject license
     # GET /government/licenses/statistics/ - Get license statistics
+    # GET /government/licenses/queue/ - Get own review claims
+    # POST /government/licenses/queue/ - Claim the next licenses to review (leased)
+    # POST /government/licenses/queue/release/ - Release claims
+    # POST /government/licenses/bulk-review/ - Approve/reject many licenses
     path('licenses/', views_licenses.list_licenses_view, name='government_licenses_list'),
     path('licenses/<int:license_id>/', views_licenses.get_license_detail_view, name='government_license_detail'),
     path('licenses/<int:license_id>/review/', views_licenses.review_license_view, name='government_license_review'),
     path('licenses/statistics/', views_licenses.license_statistics_view, name='government_license_statistics'),
+    path('licenses/queue/', views_licenses.license_review_queue_view, name='government_license_queue'),
+    path('licenses/queue/release/', views_licenses.release_license_claims_view, name='government_license_queue_release'),
+    path('licenses/bulk-review/', views_licenses.bulk_review_licenses_view, name='government_license_bulk_review'),
 ]
 
@@ -22,6 +22,15 @@ def get_user_town(user):
             return None
 
 
+async def aget_user_town(user):
+    """Async variant of get_user_town (for async views under ASGI)"""
+    profile = await UserProfile.objects.select_related('town').filter(user=user).afirst()
+    if profile is not None:
+        return profile.town
+    official = await GovernmentOfficial.objects.select_related('town').filter(user=user).afirst()
+    return official.town if official is not None else None
+
+
 def filter_by_town(queryset, user, allow_superuser=True):
     """
     Filter a queryset by the user's town.
@@ -13,13 +13,45 @@ from .views_utils import check_government_access
 from .utils import get_user_town
 from .views_utils import validate_required_field
 from django.utils import timezone
+from townhall_project.db_routers import replica_reads
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def format_announcement_list_item(announcement, total_questions, answered_questions):
+    """
+    Format an announcement for the list endpoint
+    Expects town, department and created_by__user to be loaded
+    """
+    return {
+        'id': announcement.id,
+        'title': announcement.title,
+        'description': announcement.description or announcement.content[:200],
+        'content': announcement.content,
+        'date': announcement.created_at.strftime('%Y-%m-%d'),
+        'priority': announcement.priority,
+        'type': announcement.type,
+        'status': 'published' if announcement.is_published else 'draft',
+        'views': announcement.views,
+        'author': announcement.created_by.user.get_full_name() or announcement.created_by.user.username,
+        'department': announcement.department.name,
+        'tags': announcement.tags or [],
+        'lastUpdated': announcement.updated_at.strftime('%Y-%m-%d'),
+        'publishDate': announcement.published_at.strftime('%Y-%m-%d') if announcement.published_at else None,
+        'expiryDate': announcement.expiry_date.strftime('%Y-%m-%d') if announcement.expiry_date else None,
+        'town_id': announcement.town.id if announcement.town else None,
+        'town_name': announcement.town.name if announcement.town else None,
+        'is_published': announcement.is_published,
+        'question_count': total_questions,
+        'answered_count': answered_questions,
+        'pending_count': total_questions - answered_questions,
+    }
+
+
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def list_announcements_view(request):
     """List announcements (GET) or create announcement (POST)"""
     if request.method == 'GET':
@@ -48,33 +80,8 @@ def list_announcements_view(request):
             data = []
             for announcement in announcements:
                 questions_list = list(announcement.questions.all())
-                total_questions = len(questions_list)
                 answered_questions = sum(1 for q in questions_list if q.is_answered)
-                pending_questions = total_questions - answered_questions
-                
-                data.append({
-                    'id': announcement.id,
-                    'title': announcement.title,
-                    'description': announcement.description or announcement.content[:200],
-                    'content': announcement.content,
-                    'date': announcement.created_at.strftime('%Y-%m-%d'),
-                    'priority': announcement.priority,
-                    'type': announcement.type,
-                    'status': 'published' if announcement.is_published else 'draft',
-                    'views': announcement.views,
-                    'author': announcement.created_by.user.get_full_name() or announcement.created_by.user.username,
-                    'department': announcement.department.name,
-                    'tags': announcement.tags or [],
-                    'lastUpdated': announcement.updated_at.strftime('%Y-%m-%d'),
-                    'publishDate': announcement.published_at.strftime('%Y-%m-%d') if announcement.published_at else None,
-                    'expiryDate': announcement.expiry_date.strftime('%Y-%m-%d') if announcement.expiry_date else None,
-                    'town_id': announcement.town.id if announcement.town else None,
-                    'town_name': announcement.town.name if announcement.town else None,
-                    'is_published': announcement.is_published,
-                    'question_count': total_questions,
-                    'answered_count': answered_questions,
-                    'pending_count': pending_questions,
-                })
+                data.append(format_announcement_list_item(announcement, len(questions_list), answered_questions))
             
             return Response(data, status=status.HTTP_200_OK)
         except Exception as e:
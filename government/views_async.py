@@ -0,0 +1,86 @@
+"""
+Government Async Views
+Async-native versions of the announcement and bill list endpoints (ASGI only)
+"""
+
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.http import JsonResponse
+from townhall_project.async_api import async_api_view
+from townhall_project.db_routers import replica_reads
+from .models import Announcement, BillProposal, BillVote
+from .utils import aget_user_town
+from .views_announcements import list_announcements_view, format_announcement_list_item
+from .views_bills import bills_list_create_view, format_bill_list_item
+
+
+@async_api_view(list_announcements_view)
+@replica_reads
+async def list_announcements_async_view(request, user):
+    """GET /government/announcements/ - same filters and output as list_announcements_view"""
+    user_town = await aget_user_town(user)
+    announcements = Announcement.objects.all()
+    
+    if user_town:
+        announcements = announcements.filter(town_id=user_town.id)
+    elif not user.is_superuser:
+        announcements = announcements.none()
+    
+    status_filter = request.GET.get('status', None)
+    if status_filter:
+        if status_filter == 'published':
+            announcements = announcements.filter(is_published=True)
+        elif status_filter == 'draft':
+            announcements = announcements.filter(is_published=False)
+    
+    type_filter = request.GET.get('type', None)
+    if type_filter and type_filter != 'all':
+        announcements = announcements.filter(type=type_filter)
+    
+    # Question counts come from annotations; prefetch_related is not available on aiterator()
+    announcements = announcements.select_related('town', 'department', 'created_by', 'created_by__user').annotate(
+        total_questions=Count('questions'),
+        answered_questions=Count('questions', filter=Q(questions__is_answered=True)),
+    ).order_by('-created_at')
+    
+    data = [
+        format_announcement_list_item(announcement, announcement.total_questions, announcement.answered_questions)
+        async for announcement in announcements.aiterator()
+    ]
+    return JsonResponse(data, safe=False)
+
+
+@async_api_view(bills_list_create_view)
+@replica_reads
+async def bills_list_async_view(request, user):
+    """GET /government/bills/ - same filters and output as bills_list_create_view"""
+    user_town = await aget_user_town(user)
+    bills = BillProposal.objects.all()
+    
+    if user_town:
+        bills = bills.filter(town=user_town)
+    elif not user.is_superuser:
+        bills = bills.none()
+    
+    status_filter = request.GET.get('status', None)
+    if status_filter and status_filter != 'all':
+        bills = bills.filter(status=status_filter)
+    
+    priority_filter = request.GET.get('priority', None)
+    if priority_filter and priority_filter != 'all':
+        bills = bills.filter(priority=priority_filter)
+    
+    sort_by = request.GET.get('sort', '-created_at')
+    if sort_by == 'votes':
+        bills = bills.order_by('-support_count', '-oppose_count')
+    elif sort_by == 'comments':
+        bills = bills.order_by('-comment_count')
+    else:
+        bills = bills.order_by(sort_by)
+    
+    # The caller's vote is joined in as a subquery instead of one query per bill
+    bills = bills.select_related('department', 'town', 'created_by', 'created_by__user').annotate(
+        user_vote=Subquery(BillVote.objects.filter(bill=OuterRef('pk'), user=user).values('vote_type')[:1])
+    )
+    
+    data = [format_bill_list_item(bill, bill.user_vote) async for bill in bills.aiterator()]
+    return JsonResponse(data, safe=False)
@@ -12,16 +12,48 @@ from authentication.models import UserProfile
 from .views_utils import check_government_access, validate_required_field
 from .utils import get_user_town
 from django.utils import timezone
-from django.db.models import Q, Count, F
+from django.db.models import Q, F, OuterRef, Subquery
 from django.db import transaction
 from django.conf import settings
+from townhall_project.db_routers import replica_reads
+from townhall_project.query_budget import query_budget
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def format_bill_list_item(bill, user_vote=None):
+    """
+    Format a bill for the list endpoint
+    Expects department and created_by__user to be loaded
+    """
+    return {
+        'id': bill.id,
+        'title': bill.title,
+        'description': bill.description,
+        'summary': bill.summary or bill.description[:200],
+        'status': bill.status,
+        'priority': bill.priority,
+        'department': bill.department.name,
+        'created_by': bill.created_by.user.get_full_name() or bill.created_by.user.username,
+        'support_count': bill.support_count,
+        'oppose_count': bill.oppose_count,
+        'total_votes': bill.get_total_votes(),
+        'support_percentage': bill.get_support_percentage(),
+        'comment_count': bill.comment_count,
+        'views': bill.views,
+        'created_at': bill.created_at.strftime('%Y-%m-%d'),
+        'published_at': bill.published_at.strftime('%Y-%m-%d %H:%M') if bill.published_at else None,
+        'review_deadline': bill.review_deadline.strftime('%Y-%m-%d') if bill.review_deadline else None,
+        'user_vote': user_vote,
+        'tags': bill.tags or [],
+    }
+
+
+@query_budget(8)
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def bills_list_create_view(request):
     """List bills (GET) or create bill (POST)"""
     if request.method == 'GET':
@@ -53,42 +85,14 @@ def bills_list_create_view(request):
             else:
                 bills = bills.order_by(sort_by)
             
+            # The caller's vote is joined in as a subquery instead of one query per bill
             bills = bills.select_related('department', 'town', 'created_by', 'created_by__user').annotate(
-                total_votes=Count('votes')
+                user_vote=Subquery(
+                    BillVote.objects.filter(bill=OuterRef('pk'), user=request.user).values('vote_type')[:1]
+                ),
             )
             
-            data = []
-            for bill in bills:
-                # Check if current user has voted
-                user_vote = None
-                if request.user.is_authenticated:
-                    try:
-                        vote = BillVote.objects.get(bill=bill, user=request.user)
-                        user_vote = vote.vote_type
-                    except BillVote.DoesNotExist:
-                        pass
-                
-                data.append({
-                    'id': bill.id,
-                    'title': bill.title,
-                    'description': bill.description,
-                    'summary': bill.summary or bill.description[:200],
-                    'status': bill.status,
-                    'priority': bill.priority,
-                    'department': bill.department.name,
-                    'created_by': bill.created_by.user.get_full_name() or bill.created_by.user.username,
-                    'support_count': bill.support_count,
-                    'oppose_count': bill.oppose_count,
-                    'total_votes': bill.get_total_votes(),
-                    'support_percentage': bill.get_support_percentage(),
-                    'comment_count': bill.comment_count,
-                    'views': bill.views,
-                    'created_at': bill.created_at.strftime('%Y-%m-%d'),
-                    'published_at': bill.published_at.strftime('%Y-%m-%d %H:%M') if bill.published_at else None,
-                    'review_deadline': bill.review_deadline.strftime('%Y-%m-%d') if bill.review_deadline else None,
-                    'user_vote': user_vote,
-                    'tags': bill.tags or [],
-                })
+            data = [format_bill_list_item(bill, bill.user_vote) for bill in bills]
             
             return Response(data, status=status.HTTP_200_OK)
         except Exception as e:
@@ -304,6 +308,7 @@ def bill_detail_view(request, bill_id):
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def bill_comments_list_create_view(request, bill_id):
     """List comments (GET) or create comment (POST) for a bill"""
     try:
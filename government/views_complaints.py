@@ -0,0 +1,133 @@
+"""
+Government Complaint Feed Views
+Unified triage inbox across citizen and business complaints
+"""
+
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.settings import api_settings
+from django.db.models import CharField, F, Value
+from django.db.models.functions import Concat
+from citizen.models import CitizenComplaint
+from businessowner.models import BusinessComplaint
+from .utils import filter_by_town
+from .views_utils import check_government_access
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Upper bound for ?page_size on the unified feed
+MAX_FEED_PAGE_SIZE = 100
+
+# Common projection shared by both sides of the UNION (order matters)
+FEED_FIELDS = [
+    'id', 'source', 'title', 'category', 'status', 'priority',
+    'assigned_to', 'submitter', 'town_id', 'created_at', 'updated_at',
+]
+
+
+def _apply_feed_filters(queryset, params):
+    """Apply the shared status/priority/category filters to one side of the feed"""
+    for field in ('status', 'priority', 'category'):
+        value = params.get(field, None)
+        if value and value != 'all':
+            queryset = queryset.filter(**{field: value})
+    return queryset
+
+
+def _citizen_feed(request):
+    """Citizen complaints projected onto FEED_FIELDS"""
+    complaints = _apply_feed_filters(
+        filter_by_town(CitizenComplaint.objects.all(), request.user), request.query_params
+    )
+    return complaints.annotate(
+        source=Value('citizen', output_field=CharField()),
+        submitter=Concat(
+            F('citizen__user__first_name'), Value(' '), F('citizen__user__last_name'),
+            output_field=CharField()
+        ),
+    ).values(*FEED_FIELDS).order_by()
+
+
+def _business_feed(request):
+    """Business complaints projected onto FEED_FIELDS"""
+    complaints = _apply_feed_filters(
+        filter_by_town(BusinessComplaint.objects.all(), request.user), request.query_params
+    )
+    return complaints.annotate(
+        source=Value('business', output_field=CharField()),
+        submitter=F('business_owner__business_name'),
+    ).values(*FEED_FIELDS).order_by()
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def complaint_feed_view(request):
+    """
+    Unified complaint feed for officials (government only)
+    One ordered, paginated UNION ALL across citizen and business complaints
+    Query params: type=all|citizen|business, status, priority, category, page, page_size
+    """
+    try:
+        is_government, _ = check_government_access(request.user)
+        if not is_government:
+            return Response({
+                'error': 'Only government officials can view the complaint feed'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            page = max(int(request.query_params.get('page', 1)), 1)
+            page_size = int(request.query_params.get('page_size', api_settings.PAGE_SIZE or 20))
+        except (TypeError, ValueError):
+            return Response({
+                'error': 'page and page_size must be integers'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        page_size = max(1, min(page_size, MAX_FEED_PAGE_SIZE))
+
+        feed_type = request.query_params.get('type', 'all')
+        if feed_type == 'citizen':
+            feed = _citizen_feed(request)
+        elif feed_type == 'business':
+            feed = _business_feed(request)
+        elif feed_type == 'all':
+            feed = _citizen_feed(request).union(_business_feed(request), all=True)
+        else:
+            return Response({
+                'error': 'type must be "all", "citizen" or "business"'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # Fetch one extra row to know whether another page exists
+        offset = (page - 1) * page_size
+        rows = list(feed.order_by('-created_at', '-id')[offset:offset + page_size + 1])
+        has_next = len(rows) > page_size
+
+        data = []
+        for row in rows[:page_size]:
+            data.append({
+                'id': row['id'],
+                'type': row['source'],
+                'title': row['title'],
+                'category': row['category'],
+                'status': row['status'],
+                'priority': row['priority'],
+                'assignedTo': row['assigned_to'] or '',
+                'submitter': (row['submitter'] or '').strip(),
+                'townId': row['town_id'],
+                'created_at': row['created_at'].isoformat(),
+                'updated_at': row['updated_at'].isoformat(),
+            })
+
+        return Response({
+            'complaints': data,
+            'page': page,
+            'page_size': page_size,
+            'has_next': has_next,
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Error getting complaint feed: {str(e)}")
+        return Response({
+            'error': f'An error occurred: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
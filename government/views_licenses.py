@@ -8,12 +8,19 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from businessowner.models import BusinessLicense
-from businessowner.utils import format_license_response
+from businessowner.utils import format_license_response, bulk_create_license_notifications
 from .utils import get_user_town
-from .views_utils import check_government_access
+from .views_utils import check_government_access, parse_bulk_ids
 from .models import GovernmentOfficial
+from .license_queue import (
+    available_licenses, claim_licenses, release_claims, is_claimed_by_other,
+    DEFAULT_LEASE_MINUTES, MAX_LEASE_MINUTES, MAX_CLAIM_COUNT
+)
+from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 from datetime import date, timedelta
+from townhall_project.db_routers import replica_reads
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,6 +28,7 @@ logger = logging.getLogger(__name__)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def list_licenses_view(request):
     """List all licenses/permits for government review (filtered by town)"""
     try:
@@ -165,6 +173,12 @@ def review_license_view(request, license_id):
                 'error': 'Government official profile not found'
             }, status=status.HTTP_404_NOT_FOUND)
         
+        if is_claimed_by_other(license_obj, government_official):
+            return Response({
+                'error': 'This license is claimed by another reviewer',
+                'claim_expires_at': license_obj.claim_expires_at.isoformat(),
+            }, status=status.HTTP_409_CONFLICT)
+        
         action = request.data.get('action', '').lower()
         if action not in ['approve', 'reject']:
             return Response({
@@ -191,6 +205,8 @@ def review_license_view(request, license_id):
         license_obj.reviewed_by = government_official
         license_obj.review_comment = review_comment
         license_obj.review_date = timezone.now()
+        license_obj.claimed_by = None
+        license_obj.claim_expires_at = None
         license_obj.save()
         
         # Create notification for business owner
@@ -210,6 +226,7 @@ def review_license_view(request, license_id):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def license_statistics_view(request):
     """Get statistics about licenses for government dashboard"""
     try:
@@ -274,3 +291,197 @@ def license_statistics_view(request):
             'error': f'An error occurred: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def license_review_queue_view(request):
+    """
+    GET: the reviewer's active claims and the number of licenses still available
+    POST: claim the next licenses - {"count": N, "lease_minutes": M}
+    """
+    try:
+        is_government, profile = check_government_access(request.user)
+        
+        if not is_government:
+            return Response({
+                'error': 'Only government officials can review licenses'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        try:
+            government_official = GovernmentOfficial.objects.get(user=request.user)
+        except GovernmentOfficial.DoesNotExist:
+            return Response({
+                'error': 'Government official profile not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        user_town = get_user_town(request.user)
+        if not user_town and not request.user.is_superuser:
+            return Response({
+                'error': 'You must be associated with a town to review licenses'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        claimed_ids = None
+        if request.method == 'POST':
+            try:
+                count = int(request.data.get('count', 1))
+                lease_minutes = int(request.data.get('lease_minutes', DEFAULT_LEASE_MINUTES))
+            except (TypeError, ValueError):
+                return Response({
+                    'error': 'count and lease_minutes must be integers'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            count = max(1, min(count, MAX_CLAIM_COUNT))
+            lease_minutes = max(1, min(lease_minutes, MAX_LEASE_MINUTES))
+            claimed_ids = claim_licenses(government_official, request.user, user_town, count, lease_minutes)
+        
+        now = timezone.now()
+        claims = BusinessLicense.objects.filter(
+            claimed_by=government_official,
+            status='pending',
+            claim_expires_at__gt=now,
+        ).select_related(
+            'business_owner',
+            'business_owner__user',
+            'reviewed_by',
+            'reviewed_by__user'
+        ).order_by('claim_expires_at', 'id')
+        
+        data = []
+        for license_obj in claims:
+            license_data = format_license_response(license_obj, include_government_details=True)
+            license_data['claim_expires_at'] = license_obj.claim_expires_at.isoformat()
+            data.append(license_data)
+        
+        return Response({
+            'claimed': claimed_ids,
+            'claims': data,
+            'available': available_licenses(request.user, user_town, now).count(),
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Error managing license review queue: {str(e)}")
+        return Response({
+            'error': f'An error occurred: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def release_license_claims_view(request):
+    """Release the reviewer's claims - {"license_ids": [...]} or all claims when omitted"""
+    try:
+        is_government, profile = check_government_access(request.user)
+        
+        if not is_government:
+            return Response({
+                'error': 'Only government officials can review licenses'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        try:
+            government_official = GovernmentOfficial.objects.get(user=request.user)
+        except GovernmentOfficial.DoesNotExist:
+            return Response({
+                'error': 'Government official profile not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        license_ids = request.data.get('license_ids', None)
+        if license_ids is not None and not isinstance(license_ids, list):
+            return Response({
+                'error': 'license_ids must be a list'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        released = release_claims(government_official, license_ids)
+        
+        return Response({
+            'message': f'Released {released} claim(s)',
+            'released': released,
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Error releasing license claims: {str(e)}")
+        return Response({
+            'error': f'An error occurred: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_review_licenses_view(request):
+    """
+    Approve or reject many pending licenses at once
+    Body: {"license_ids": [...], "action": "approve" | "reject", "expiry_days": 365, "review_comment": ""}
+    Licenses outside the reviewer's town, already reviewed, or claimed by another reviewer are skipped.
+    """
+    try:
+        is_government, profile = check_government_access(request.user)
+        
+        if not is_government:
+            return Response({
+                'error': 'Only government officials can review licenses'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        action = request.data.get('action', '').lower()
+        if action not in ['approve', 'reject']:
+            return Response({
+                'error': 'Action must be "approve" or "reject"'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        license_ids, error = parse_bulk_ids(request.data, 'license_ids')
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            expiry_days = int(request.data.get('expiry_days', 365))  # Default 1 year
+        except (TypeError, ValueError):
+            return Response({
+                'error': 'expiry_days must be an integer'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        review_comment = request.data.get('review_comment', '').strip()
+        
+        try:
+            government_official = GovernmentOfficial.objects.get(user=request.user)
+        except GovernmentOfficial.DoesNotExist:
+            return Response({
+                'error': 'Government official profile not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        now = timezone.now()
+        new_status = 'approved' if action == 'approve' else 'rejected'
+        # Applied again after locking: a license may be reviewed or claimed in the meantime
+        reviewable = Q(status='pending') & (
+            Q(claimed_by__isnull=True) | Q(claimed_by=government_official) | Q(claim_expires_at__lte=now)
+        )
+        licenses = BusinessLicense.objects.filter(reviewable, id__in=license_ids)
+        if not request.user.is_superuser:
+            licenses = licenses.filter(business_owner__user__userprofile__town=get_user_town(request.user))
+        
+        with transaction.atomic():
+            rows = list(
+                BusinessLicense.objects.select_for_update(of=('self',)).filter(
+                    reviewable, id__in=licenses.values('id')
+                ).values('id', 'business_owner_id', 'license_type')
+            )
+            updates = {
+                'status': new_status,
+                'reviewed_by': government_official,
+                'review_comment': review_comment,
+                'review_date': now,
+                'claimed_by': None,
+                'claim_expires_at': None,
+                'updated_at': now,
+            }
+            if action == 'approve':
+                updates['issue_date'] = date.today()
+                updates['expiry_date'] = date.today() + timedelta(days=expiry_days)
+            BusinessLicense.objects.filter(id__in=[row['id'] for row in rows]).update(**updates)
+            bulk_create_license_notifications(rows, new_status)
+        
+        processed = {row['id'] for row in rows}
+        return Response({
+            'message': f'{len(processed)} license application(s) {new_status}',
+            'processed': sorted(processed),
+            'skipped': [license_id for license_id in license_ids if license_id not in processed],
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Error bulk reviewing licenses: {str(e)}")
+        return Response({
+            'error': f'An error occurred: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -8,14 +8,19 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from .models import GovernmentOfficial
-from authentication.models import UserProfile
+from .utils import filter_by_town
+from .views_utils import check_government_access
+from townhall_project.db_routers import replica_reads
+from townhall_project.query_budget import query_budget
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@query_budget(6)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def list_government_officials_view(request):
     """List all government officials (admin/superuser only)"""
     try:
@@ -24,36 +29,35 @@ def list_government_officials_view(request):
                 'error': 'Only administrators can view government officials'
             }, status=status.HTTP_403_FORBIDDEN)
         
-        officials = GovernmentOfficial.objects.select_related('user', 'town').all().order_by('-created_at')
+        # Officials without a user profile are skipped, as before; the profile is joined in
+        officials = GovernmentOfficial.objects.select_related('user', 'user__userprofile', 'town').filter(
+            user__userprofile__isnull=False
+        ).order_by('-created_at')
         
         data = []
         for official in officials:
-            try:
-                profile = UserProfile.objects.get(user=official.user)
-                data.append({
-                    'id': official.id,
-                    'user_id': official.user.id,
-                    'email': official.user.email,
-                    'first_name': official.user.first_name,
-                    'last_name': official.user.last_name,
-                    'employee_id': official.employee_id,
-                    'department': official.department,
-                    'position': official.position,
-                    'phone_number': official.phone_number,
-                    'office_address': official.office_address,
-                    'town': {
-                        'id': official.town.id,
-                        'name': official.town.name,
-                        'state': official.town.state
-                    } if official.town else None,
-                    'can_view_users': official.can_view_users,
-                    'can_approve_users': official.can_approve_users,
-                    'is_approved': profile.is_approved,
-                    'created_at': official.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                    'updated_at': official.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
-                })
-            except UserProfile.DoesNotExist:
-                continue
+            data.append({
+                'id': official.id,
+                'user_id': official.user.id,
+                'email': official.user.email,
+                'first_name': official.user.first_name,
+                'last_name': official.user.last_name,
+                'employee_id': official.employee_id,
+                'department': official.department,
+                'position': official.position,
+                'phone_number': official.phone_number,
+                'office_address': official.office_address,
+                'town': {
+                    'id': official.town.id,
+                    'name': official.town.name,
+                    'state': official.town.state
+                } if official.town else None,
+                'can_view_users': official.can_view_users,
+                'can_approve_users': official.can_approve_users,
+                'is_approved': official.user.userprofile.is_approved,
+                'created_at': official.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                'updated_at': official.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
+            })
         
         return Response(data, status=status.HTTP_200_OK)
     except Exception as e:
@@ -122,3 +126,38 @@ def update_government_official_permissions_view(request, official_id):
 
 
 
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def officials_workload_view(request):
+    """Open complaint assignment counts per official in the user's town (government only)"""
+    try:
+        is_government, _ = check_government_access(request.user)
+        if not is_government:
+            return Response({
+                'error': 'Only government officials can view workload'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        officials = filter_by_town(GovernmentOfficial.objects.select_related('user'), request.user)
+        department = request.query_params.get('department', None)
+        if department and department != 'all':
+            officials = officials.filter(department=department)
+        
+        data = []
+        for official in officials.order_by('department', 'open_assignment_count', 'id'):
+            data.append({
+                'id': official.id,
+                'name': official.user.get_full_name() or official.user.username,
+                'department': official.department,
+                'position': official.position,
+                'accepts_assignments': official.accepts_assignments,
+                'open_assignments': official.open_assignment_count,
+            })
+        
+        return Response(data, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Error getting official workload: {str(e)}")
+        return Response({
+            'error': f'An error occurred: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -13,6 +13,7 @@ from citizen.models import CitizenProfile
 from .views_utils import check_government_access, validate_required_field
 from .utils import get_user_town
 from django.utils import timezone
+from townhall_project.db_routers import replica_reads
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,6 +21,7 @@ logger = logging.getLogger(__name__)
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def list_announcement_questions_view(request, announcement_id):
     """List questions (GET) or create question (POST) for an announcement"""
     if request.method == 'GET':
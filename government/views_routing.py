@@ -0,0 +1,104 @@
+"""
+Complaint Routing Rule Views
+Manages which department receives each complaint category in a town
+"""
+
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from .models import ComplaintRoutingRule, Department
+from .utils import get_user_town, filter_by_town
+from .views_utils import check_government_access
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def format_routing_rule_response(rule):
+    """Format routing rule data for API response"""
+    return {
+        'id': rule.id,
+        'category': rule.category,
+        'department_id': rule.department_id,
+        'department_name': rule.department.name,
+        'updated_at': rule.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def routing_rules_view(request):
+    """List (GET) or create/replace (POST) complaint routing rules for the user's town"""
+    try:
+        is_government, _ = check_government_access(request.user)
+        if not is_government:
+            return Response({
+                'error': 'Only government officials can manage routing rules'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        if request.method == 'GET':
+            rules = filter_by_town(
+                ComplaintRoutingRule.objects.select_related('department'), request.user
+            )
+            return Response(
+                [format_routing_rule_response(rule) for rule in rules],
+                status=status.HTTP_200_OK
+            )
+        
+        town = get_user_town(request.user)
+        if not town:
+            return Response({
+                'error': 'You must be assigned to a town to manage routing rules'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        category = str(request.data.get('category', '')).strip()
+        try:
+            department = Department.objects.get(id=request.data.get('department_id'))
+        except (Department.DoesNotExist, ValueError, TypeError):
+            return Response({
+                'error': 'Department not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        rule, created = ComplaintRoutingRule.objects.update_or_create(
+            town=town,
+            category=category,
+            defaults={'department': department},
+        )
+        
+        return Response(
+            format_routing_rule_response(rule),
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        )
+    except Exception as e:
+        logger.error(f"Error managing routing rules: {str(e)}")
+        return Response({
+            'error': f'An error occurred: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['DELETE'])
+@permission_classes([IsAuthenticated])
+def delete_routing_rule_view(request, rule_id):
+    """Delete a complaint routing rule"""
+    try:
+        is_government, _ = check_government_access(request.user)
+        if not is_government:
+            return Response({
+                'error': 'Only government officials can manage routing rules'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        deleted, _ = filter_by_town(ComplaintRoutingRule.objects.all(), request.user).filter(id=rule_id).delete()
+        if not deleted:
+            return Response({
+                'error': 'Routing rule not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        return Response({
+            'message': 'Routing rule deleted successfully'
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Error deleting routing rule: {str(e)}")
+        return Response({
+            'error': f'An error occurred: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -13,6 +13,10 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+# Largest number of ids accepted by a single bulk action request
+MAX_BULK_ITEMS = 5000
+
+
 def check_government_access(user):
     """
     Check if user is a government official
@@ -55,6 +59,23 @@ def validate_required_field(data, field_name):
     return True, value, None
 
 
+def parse_bulk_ids(data, field_name, max_items=MAX_BULK_ITEMS):
+    """
+    Parse a list of integer ids for a bulk action
+    Returns: (ids, error_message)
+    """
+    values = data.get(field_name)
+    if not isinstance(values, list) or not values:
+        return None, f'{field_name} must be a non-empty list'
+    if len(values) > max_items:
+        return None, f'At most {max_items} ids can be processed per request'
+    try:
+        ids = sorted({int(value) for value in values})
+    except (TypeError, ValueError):
+        return None, f'{field_name} must contain integer ids'
+    return ids, None
+
+
 def format_department_response(department):
     """Format department data for API response"""
     return {
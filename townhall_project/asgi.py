@@ -12,5 +12,10 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'townhall_project.settings')
+# Serve the async-native read views (run with: uvicorn townhall_project.asgi:application)
+os.environ.setdefault('ROOT_URLCONF', 'townhall_project.urls_asgi')
+# Each request may run sync code on a different short-lived thread, so persistent per-thread
+# connections pile up (one per thread, each held for DB_CONN_MAX_AGE); share a pool instead
+os.environ.setdefault('DB_CONN_MODE', 'pool')
 
 application = get_asgi_application()
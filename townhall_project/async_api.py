@@ -0,0 +1,85 @@
+"""
+Async API Views
+Authentication, throttling and error handling for async-native read endpoints served under ASGI
+"""
+
+import functools
+import logging
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.settings import api_settings
+from authentication.authentication import CachedTokenAuthentication
+
+logger = logging.getLogger(__name__)
+
+
+async def aauthenticate(request):
+    """
+    Resolve the caller the same way the DRF views do: token first, then session.
+    Returns: (user or None, error_message)
+    """
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    if header.startswith('Token '):
+        key = header.split(' ', 1)[1].strip()
+        try:
+            user, _ = await sync_to_async(CachedTokenAuthentication().authenticate_credentials)(key)
+        except AuthenticationFailed as e:
+            return None, str(e.detail)
+        return user, None
+    user = await request.auser()
+    if user.is_authenticated and user.is_active:
+        return user, None
+    return None, None
+
+
+async def acheck_throttles(request):
+    """Run the default DRF throttles; returns seconds to wait, or None when allowed"""
+    waits = []
+    for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES:
+        throttle = throttle_class()
+        if not await sync_to_async(throttle.allow_request)(request, None):
+            waits.append(throttle.wait() or 0)
+    return max(waits) if waits else None
+
+
+def async_api_view(sync_view, require_auth=True):
+    """
+    Serve GET requests with the decorated coroutine and hand every other method to
+    `sync_view` (the existing DRF view), so one URL keeps its full behaviour under ASGI.
+    The coroutine receives (request, user, **kwargs) and returns a JsonResponse.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return await sync_to_async(sync_view)(request, *args, **kwargs)
+
+            # Status codes match the DRF views (SessionAuthentication first -> 403)
+            user, error = await aauthenticate(request)
+            if error:
+                return JsonResponse({'detail': error}, status=403)
+            if require_auth and user is None:
+                return JsonResponse({
+                    'detail': 'Authentication credentials were not provided.'
+                }, status=403)
+            if user is not None:
+                request.user = user
+
+            wait = await acheck_throttles(request)
+            if wait is not None:
+                response = JsonResponse({
+                    'detail': f'Request was throttled. Expected available in {int(wait)} seconds.'
+                }, status=429)
+                response['Retry-After'] = str(int(wait))
+                return response
+
+            try:
+                return await view(request, user, *args, **kwargs)
+            except Exception as e:
+                logger.error(f"Error in async view {view.__name__}: {str(e)}")
+                return JsonResponse({
+                    'error': f'An error occurred: {str(e)}'
+                }, status=500)
+        return wrapper
+    return decorator
@@ -0,0 +1,29 @@
+"""
+Cache Helpers
+Tell caches shared by every worker process apart from per-process ones
+"""
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS
+
+# Backends whose entries live inside a single process
+PROCESS_LOCAL_BACKENDS = [
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+]
+
+
+def is_shared(alias=DEFAULT_CACHE_ALIAS):
+    """True when every worker process reads and writes the same entries (e.g. Redis, Memcached, database)"""
+    return settings.CACHES[alias]['BACKEND'] not in PROCESS_LOCAL_BACKENDS
+
+
+def versioned_timeout(timeout, alias=DEFAULT_CACHE_ALIAS):
+    """
+    Lifetime for entries invalidated by bumping a version key.
+    A bump only reaches other workers through a shared cache; with a per-process
+    cache, LOCAL_CACHE_TIMEOUT bounds how long they keep serving the old entry.
+    """
+    if is_shared(alias):
+        return timeout
+    return min(timeout, settings.LOCAL_CACHE_TIMEOUT)
@@ -0,0 +1,69 @@
+"""
+Database Connection Stats
+Connection settings and psycopg pool saturation for each configured database
+"""
+
+from django.db import connections
+
+# psycopg_pool counters reported alongside the pool size (absent counters are reported as 0)
+POOL_COUNTERS = [
+    'requests_num',        # connections requested from the pool
+    'requests_queued',     # requests that had to wait for a free connection
+    'requests_wait_ms',    # total time spent waiting
+    'requests_errors',     # requests that timed out or failed
+    'connections_num',     # connections opened to the server
+    'connections_ms',      # total time spent opening them
+    'connections_errors',  # failed connection attempts
+    'connections_lost',    # connections found broken by the health check
+]
+
+
+def pool_stats(connection):
+    """
+    Saturation of one connection's pool, or None when it is not pooled.
+    Pools are per process, so these numbers describe the worker that serves the request.
+    """
+    pool = getattr(connection, 'pool', None)  # Only the PostgreSQL backend has pools
+    if pool is None:
+        return None
+
+    raw = pool.get_stats()
+    size = raw.get('pool_size', 0)
+    available = raw.get('pool_available', 0)
+    max_size = raw.get('pool_max', 0)
+    in_use = size - available
+    stats = {
+        'min_size': raw.get('pool_min', 0),
+        'max_size': max_size,
+        'size': size,
+        'in_use': in_use,
+        'available': available,
+        'waiting': raw.get('requests_waiting', 0),
+        'saturation': round(in_use / max_size, 3) if max_size else 0.0,
+    }
+    stats.update({counter: raw.get(counter, 0) for counter in POOL_COUNTERS})
+    return stats
+
+
+def connection_mode(settings_dict, pool):
+    if pool is not None:
+        return 'pool'
+    # CONN_MAX_AGE=None keeps connections open indefinitely
+    return 'none' if settings_dict.get('CONN_MAX_AGE', 0) == 0 else 'persistent'
+
+
+def connection_stats():
+    """Connection mode of every configured database, with pool stats where pooling is enabled"""
+    stats = {}
+    for alias in connections:
+        connection = connections[alias]
+        settings_dict = connection.settings_dict
+        pool = pool_stats(connection)
+        stats[alias] = {
+            'vendor': connection.vendor,
+            'mode': connection_mode(settings_dict, pool),
+            'conn_max_age': settings_dict.get('CONN_MAX_AGE'),
+            'health_checks': settings_dict.get('CONN_HEALTH_CHECKS'),
+            'pool': pool,
+        }
+    return stats
@@ -0,0 +1,86 @@
+"""
+Read Replica Routing
+Sends reads inside replica_reads views to a read replica; everything else uses the primary
+"""
+
+import random
+from contextvars import ContextVar
+from functools import wraps
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Database alias that reads go to for the current request (None = primary).
+# A ContextVar follows the request across threads and sync_to_async calls.
+_read_database = ContextVar('read_database', default=None)
+
+# HTTP methods whose views can safely read from a lagging replica
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def replica_aliases():
+    """Configured replica aliases that exist in DATABASES"""
+    return [alias for alias in getattr(settings, 'REPLICA_DATABASES', []) if alias in settings.DATABASES]
+
+
+def choose_replica(request):
+    """
+    Replica for this request, or None to stay on the primary.
+    Non-safe methods and requests pinned by ReplicaStickinessMiddleware read the primary.
+    """
+    if request.method not in SAFE_METHODS or getattr(request, 'use_primary', False):
+        return None
+    aliases = replica_aliases()
+    return random.choice(aliases) if aliases else None
+
+
+def replica_reads(view):
+    """
+    Route the view's ORM reads to a replica for safe requests.
+    Apply below @api_view/@permission_classes; works on sync and async views.
+    Writes still go to the primary through ReplicaRouter.db_for_write.
+    """
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            token = _read_database.set(choose_replica(request))
+            try:
+                return await view(request, *args, **kwargs)
+            finally:
+                _read_database.reset(token)
+        return markcoroutinefunction(async_wrapper)
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        token = _read_database.set(choose_replica(request))
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _read_database.reset(token)
+    return wrapper
+
+
+class ReplicaRouter:
+    """
+    Reads use the replica chosen by replica_reads, otherwise the primary.
+    Writes and migrations always target the primary; replicas are kept up to date
+    by PostgreSQL replication.
+    """
+
+    def db_for_read(self, model, **hints):
+        # Explicit, so objects loaded from a replica don't pull their relations from it later
+        return _read_database.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replica_aliases():
+            return False
+        return None
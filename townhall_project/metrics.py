@@ -0,0 +1,284 @@
+"""
+Metrics
+Prometheus-style counters and histograms with per-thread shards and multiprocess aggregation
+"""
+
+import atexit
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Request latency buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Queries-per-request buckets
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+# Shards of finished threads are folded together once this many are registered
+MAX_SHARDS = 64
+
+
+class Registry:
+    """
+    Metric definitions plus their values for this process.
+    Each thread writes to its own dict, so recording never takes a lock;
+    readers merge the shards (dict copies are atomic under the GIL).
+    """
+
+    def __init__(self):
+        self.metrics = {}
+        self.collectors = []
+        self._local = threading.local()
+        self._shards = []  # (thread, values)
+        self._retired = {}  # values of threads that have exited
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def register(self, metric):
+        self.metrics.setdefault(metric.name, metric)
+        return self.metrics[metric.name]
+
+    def register_collector(self, collector):
+        """collector() returns [(name, type, help, [(labels dict, value), ...]), ...] at scrape time"""
+        self.collectors.append(collector)
+        return collector
+
+    def shard(self):
+        try:
+            return self._local.values
+        except AttributeError:
+            values = self._local.values = {}
+            with self._lock:
+                self._shards.append((threading.current_thread(), values))
+                if len(self._shards) > MAX_SHARDS:
+                    self._fold_finished()
+            return values
+
+    def _fold_finished(self):
+        live = []
+        for thread, values in self._shards:
+            if thread.is_alive():
+                live.append((thread, values))
+            else:
+                merge_values(self._retired, values.copy())
+        self._shards = live
+
+    def values(self):
+        """Merged {(name, labels): value} for this process"""
+        with self._lock:
+            self._fold_finished()
+            merged = {key: copy_value(value) for key, value in self._retired.items()}
+            for _, values in self._shards:
+                merge_values(merged, values.copy())
+        return merged
+
+    # Multiprocess aggregation: every worker writes its values to METRICS_MULTIPROC_DIR
+
+    def maybe_flush(self):
+        """
+        Write this process's values if METRICS_FLUSH_SECONDS have passed (cheap no-op otherwise).
+        Called on the request path, so it never waits for another thread's flush and never raises.
+        """
+        if not settings.METRICS_MULTIPROC_DIR:
+            return
+        if time.monotonic() - self._last_flush < settings.METRICS_FLUSH_SECONDS:
+            return
+        if not self._flush_lock.acquire(blocking=False):
+            return  # Another thread is flushing right now
+        try:
+            self._write()
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {settings.METRICS_MULTIPROC_DIR}: {str(e)}")
+        finally:
+            self._flush_lock.release()
+
+    def flush(self):
+        with self._flush_lock:
+            self._write()
+
+    def _write(self):
+        directory = settings.METRICS_MULTIPROC_DIR
+        if not directory:
+            return
+        self._last_flush = time.monotonic()
+        rows = [[name, list(labels), value] for (name, labels), value in self.values().items()]
+        path = os.path.join(directory, f'{os.getpid()}.json')
+        # Unique per thread, so a concurrent explicit flush never renames this file away
+        temporary = f'{path}.{threading.get_ident()}.tmp'
+        with open(temporary, 'w') as handle:
+            json.dump(rows, handle)
+        os.replace(temporary, path)
+
+    def aggregated_values(self):
+        """Values summed over every worker on the host (or just this process without a shared directory)"""
+        directory = settings.METRICS_MULTIPROC_DIR
+        if not directory:
+            return self.values()
+        self.flush()
+        merged = {}
+        for path in glob.glob(os.path.join(directory, '*.json')):
+            try:
+                with open(path) as handle:
+                    rows = json.load(handle)
+            except (OSError, ValueError):
+                continue  # Being replaced by its worker right now
+            merge_values(merged, {(name, tuple(labels)): value for name, labels, value in rows})
+        return merged
+
+
+def copy_value(value):
+    return list(value) if isinstance(value, list) else value
+
+
+def merge_values(target, source):
+    """Add source into target; counters are numbers, histograms are lists of bucket counts + sum + count"""
+    for key, value in source.items():
+        current = target.get(key)
+        if current is None:
+            target[key] = copy_value(value)
+        elif isinstance(current, list):
+            target[key] = [a + b for a, b in zip(current, value)]
+        else:
+            target[key] = current + value
+
+
+registry = Registry()
+
+
+class Counter:
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.type = 'counter'
+
+    def inc(self, *labels, amount=1):
+        values = registry.shard()
+        key = (self.name, labels)
+        values[key] = values.get(key, 0) + amount
+
+    def local_values(self):
+        """{labels: value} in this process"""
+        return {labels: value for (name, labels), value in registry.values().items() if name == self.name}
+
+    def aggregated_values(self):
+        """{labels: value} summed over every worker on the host (see Registry.aggregated_values)"""
+        return {labels: value for (name, labels), value in registry.aggregated_values().items() if name == self.name}
+
+
+class Histogram:
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.type = 'histogram'
+
+    def observe(self, value, *labels):
+        values = registry.shard()
+        key = (self.name, labels)
+        entry = values.get(key)
+        if entry is None:
+            # One slot per bucket plus +Inf, then sum and count
+            entry = values[key] = [0] * (len(self.buckets) + 3)
+        entry[bisect_left(self.buckets, value)] += 1
+        entry[-2] += value
+        entry[-1] += 1
+
+
+def counter(name, help_text, labelnames=()):
+    return registry.register(Counter(name, help_text, labelnames))
+
+
+def histogram(name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+    return registry.register(Histogram(name, help_text, labelnames, buckets))
+
+
+# Metrics recorded by townhall_project.middleware.MetricsMiddleware
+http_requests = counter(
+    'townhall_http_requests_total', 'HTTP responses by route, method and status code',
+    ['route', 'method', 'status'],
+)
+http_latency = histogram(
+    'townhall_http_request_duration_seconds', 'Time to produce the response, by route',
+    ['route', 'method'],
+)
+db_queries = histogram(
+    'townhall_db_queries_per_request', 'SQL statements executed per request, by route',
+    ['route'], buckets=QUERY_COUNT_BUCKETS,
+)
+db_time = counter(
+    'townhall_db_query_seconds_total', 'Time spent executing SQL, by route',
+    ['route'],
+)
+
+# Recorded by the caches themselves (see record_cache)
+cache_requests = counter(
+    'townhall_cache_requests_total', 'Cache lookups by cache and result (hit/miss)',
+    ['cache', 'result'],
+)
+
+
+def record_cache(name, hit, count=1):
+    cache_requests.inc(name, 'hit' if hit else 'miss', amount=count)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def render():
+    """All metrics in the Prometheus text exposition format (0.0.4)"""
+    values = registry.aggregated_values()
+    by_metric = {}
+    for (name, labels), value in values.items():
+        by_metric.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for name, metric in sorted(registry.metrics.items()):
+        lines.append(f'# HELP {name} {metric.help_text}')
+        lines.append(f'# TYPE {name} {metric.type}')
+        for labels, value in sorted(by_metric.get(name, []), key=lambda item: item[0]):
+            if metric.type == 'histogram':
+                cumulative = 0
+                bounds = [_number(bound) for bound in metric.buckets] + ['+Inf']
+                for bound, count in zip(bounds, value):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_labels(metric.labelnames, labels, [("le", bound)])} {cumulative}')
+                lines.append(f'{name}_sum{_labels(metric.labelnames, labels)} {_number(value[-2])}')
+                lines.append(f'{name}_count{_labels(metric.labelnames, labels)} {value[-1]}')
+            else:
+                lines.append(f'{name}{_labels(metric.labelnames, labels)} {_number(value)}')
+
+    for collector in registry.collectors:
+        for name, metric_type, help_text, samples in collector():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            for labels, value in samples:
+                lines.append(f'{name}{_labels(labels.keys(), labels.values())} {_number(value)}')
+
+    return '\n'.join(lines) + '\n'
+
+
+atexit.register(registry.flush)
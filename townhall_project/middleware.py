@@ -0,0 +1,192 @@
+"""
+Project Middleware
+Request handling shared by every app
+"""
+
+import hashlib
+import logging
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.deprecation import MiddlewareMixin
+from authentication.models import ThrottleCounter
+from authentication.throttling import DatabaseThrottleBackend
+from . import metrics
+from .caches import is_shared
+from .db_routers import SAFE_METHODS, replica_aliases
+from .query_budget import QueryBudgetExceeded, collect_queries, default_budget, recent_violations
+
+logger = logging.getLogger(__name__)
+
+
+class TokenAwareSessionMiddleware(SessionMiddleware):
+    """
+    SessionMiddleware that leaves sessions alone for token-authenticated API calls.
+    Such requests get an empty, unsaved session: no session row is read, the
+    SESSION_SAVE_EVERY_REQUEST write is skipped and no session cookie is set.
+    Browser traffic (admin, session logins) is handled exactly as before.
+    """
+
+    def uses_token_auth(self, request):
+        if not getattr(settings, 'SESSIONLESS_TOKEN_API', True):
+            return False
+        if not request.path.startswith(tuple(getattr(settings, 'SESSIONLESS_PATH_PREFIXES', ['/api/']))):
+            return False
+        return request.META.get('HTTP_AUTHORIZATION', '').startswith('Token ')
+
+    def process_request(self, request):
+        if self.uses_token_auth(request):
+            # A session without a key never touches the session store
+            request.session = self.SessionStore(None)
+            request._sessionless = True
+            return
+        super().process_request(request)
+
+    def process_response(self, request, response):
+        if getattr(request, '_sessionless', False):
+            return response
+        return super().process_response(request, response)
+
+
+class ReplicaStickinessMiddleware(MiddlewareMixin):
+    """
+    Read-your-writes for replica routing: after a client sends a write (POST, PUT,
+    PATCH, DELETE), its requests read the primary for REPLICA_STICKY_SECONDS so it
+    never sees a replica that has not caught up with its own change.
+    The pin is kept per API token or session cookie, in REPLICA_STICKY_CACHE when that
+    cache is shared by the workers. A per-process cache would only pin the worker that
+    handled the write, so without one the pin is a ThrottleCounter row on the primary
+    (window_start holds the time of the last write; purge_throttle_counters removes it).
+    """
+
+    def client_key(self, request):
+        credential = request.META.get('HTTP_AUTHORIZATION', '')
+        if not credential.startswith('Token '):
+            credential = request.COOKIES.get(settings.SESSION_COOKIE_NAME, '')
+        if not credential:
+            return None
+        digest = hashlib.sha256(credential.encode('utf-8')).hexdigest()
+        return f'replica:pin:{digest}'
+
+    def is_pinned(self, request):
+        key = self.client_key(request)
+        if not key:
+            return False
+        if is_shared(settings.REPLICA_STICKY_CACHE):
+            return bool(caches[settings.REPLICA_STICKY_CACHE].get(key))
+        return ThrottleCounter.objects.using(DEFAULT_DB_ALIAS).filter(
+            bucket_key=key, window_start__gte=int(time.time()) - settings.REPLICA_STICKY_SECONDS
+        ).exists()
+
+    def process_request(self, request):
+        if not replica_aliases():
+            return
+        request.use_primary = request.method not in SAFE_METHODS or self.is_pinned(request)
+
+    def process_response(self, request, response):
+        if request.method in SAFE_METHODS or not replica_aliases():
+            return response
+        key = self.client_key(request)
+        if not key:
+            return response
+        if is_shared(settings.REPLICA_STICKY_CACHE):
+            caches[settings.REPLICA_STICKY_CACHE].set(key, True, settings.REPLICA_STICKY_SECONDS)
+        else:
+            # One-second windows: the upsert moves window_start to the latest write
+            DatabaseThrottleBackend().hit(key, int(time.time()), 1)
+        return response
+
+
+class QueryBudgetMiddleware:
+    """
+    Counts the SQL statements, database time and repeated statements of each request.
+    - SERVER_TIMING adds them to a Server-Timing header (visible in browser dev tools).
+    - Requests over the view's @query_budget (or QUERY_BUDGET) are logged and kept
+      in recent_violations; with QUERY_BUDGET_STRICT a view over its declared
+      budget raises QueryBudgetExceeded, failing the test that made the request.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with collect_queries() as stats:
+            request.query_stats = stats
+            response = self.get_response(request)
+        return self.finish(request, response, stats, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with collect_queries() as stats:
+            request.query_stats = stats
+            response = await self.get_response(request)
+        return self.finish(request, response, stats, time.perf_counter() - started)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = getattr(view_func, 'query_budget', None)
+
+    def finish(self, request, response, stats, total):
+        if getattr(settings, 'SERVER_TIMING', False):
+            response['Server-Timing'] = stats.server_timing(total)
+
+        declared = getattr(request, 'query_budget', None)
+        budget = declared if declared is not None else default_budget()
+        if stats.count <= budget:
+            return response
+
+        message = (
+            f"{request.method} {request.path} ran {stats.count} queries (budget {budget}, "
+            f"{stats.duplicates} repeated) in {stats.duration * 1000:.1f}ms"
+        )
+        recent_violations.record({
+            'method': request.method,
+            'path': request.path,
+            'queries': stats.count,
+            'budget': budget,
+            'repeated': stats.duplicates,
+            'db_ms': round(stats.duration * 1000, 1),
+            'most_repeated': [{'sql': sql, 'count': count} for sql, count in stats.most_repeated()],
+        })
+        logger.warning(message + ''.join(f"\n  {count}x {sql}" for sql, count in stats.most_repeated()))
+        if declared is not None and getattr(settings, 'QUERY_BUDGET_STRICT', False):
+            raise QueryBudgetExceeded(message)
+        return response
+
+
+class MetricsMiddleware(MiddlewareMixin):
+    """
+    Records latency, status code and SQL usage per route for /metrics.
+    Routes are URL patterns (api/government/bills/<int:bill_id>/), not raw paths,
+    so label cardinality stays bounded. Sits outside QueryBudgetMiddleware to read its stats.
+    """
+
+    def process_request(self, request):
+        request.metrics_started = time.perf_counter()
+
+    def process_response(self, request, response):
+        started = getattr(request, 'metrics_started', None)
+        if started is None:
+            return response
+        match = getattr(request, 'resolver_match', None)
+        route = match.route if match is not None else 'unmatched'
+
+        metrics.http_requests.inc(route, request.method, str(response.status_code))
+        metrics.http_latency.observe(time.perf_counter() - started, route, request.method)
+        stats = getattr(request, 'query_stats', None)
+        if stats is not None:
+            metrics.db_queries.observe(stats.count, route)
+            metrics.db_time.inc(route, amount=stats.duration)
+        metrics.registry.maybe_flush()
+        return response
@@ -0,0 +1,135 @@
+"""
+Query Budget
+Per-request SQL instrumentation: query count, database time and repeated statements
+"""
+
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+# Over-budget requests kept per process for /auth/admin/query-budget/
+RECENT_VIOLATIONS_SIZE = 50
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised in strict mode when a view runs more queries than it declared"""
+
+
+class QueryStats:
+    """
+    Database execute wrapper that records every statement of one request.
+    Statements are counted by SQL text (parameters excluded), so an N+1 loop
+    shows up as one statement repeated N times.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.statements[sql] += 1
+
+    @property
+    def duplicates(self):
+        """Executions beyond the first of each distinct statement"""
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    def most_repeated(self, limit=3):
+        return [(sql, count) for sql, count in self.statements.most_common(limit) if count > 1]
+
+    def server_timing(self, total):
+        """Server-Timing header value (durations in milliseconds)"""
+        return (
+            f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries, {self.duplicates} repeated", '
+            f'app;dur={total * 1000:.1f}'
+        )
+
+
+# Stats of the request being served; a ContextVar so queries run through sync_to_async
+# (async views) are attributed to the right request
+_current_stats = ContextVar('query_stats', default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper installed on every connection; records into the current request's stats"""
+    stats = _current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats(execute, sql, params, many, context)
+
+
+def install_recorder(connection):
+    # First in the list, so a temporary connection.execute_wrapper() block pops its own wrapper
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    install_recorder(connection)
+
+
+connection_created.connect(_on_connection_created, dispatch_uid='query_budget_recorder')
+
+
+@contextmanager
+def collect_queries():
+    """Record the queries run inside the block, in this thread and in sync_to_async calls"""
+    # Connections opened before this module was imported never sent connection_created
+    for connection in connections.all(initialized_only=True):
+        install_recorder(connection)
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def query_budget(max_queries):
+    """
+    Declare how many queries a view may run per request.
+    Apply above @api_view so the middleware can see it:
+
+        @query_budget(8)
+        @api_view(['GET'])
+        def some_list_view(request): ...
+    """
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+
+def default_budget():
+    return getattr(settings, 'QUERY_BUDGET', 50)
+
+
+class ViolationLog:
+    """Bounded, thread-safe record of the latest over-budget requests in this process"""
+
+    def __init__(self, size):
+        self._entries = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, entry):
+        with self._lock:
+            self._entries.append(entry)
+
+    def snapshot(self):
+        with self._lock:
+            return list(reversed(self._entries))
+
+
+recent_violations = ViolationLog(RECENT_VIOLATIONS_SIZE)
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -55,7 +56,10 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'townhall_project.middleware.MetricsMiddleware',
+    'townhall_project.middleware.QueryBudgetMiddleware',
+    'townhall_project.middleware.TokenAwareSessionMiddleware',
+    'townhall_project.middleware.ReplicaStickinessMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -75,7 +79,8 @@ if not DEBUG:
     SECURE_BROWSER_XSS_FILTER = True
     X_FRAME_OPTIONS = 'DENY'
 
-ROOT_URLCONF = 'townhall_project.urls'
+# townhall_project.asgi switches this to townhall_project.urls_asgi (async read views)
+ROOT_URLCONF = os.getenv('ROOT_URLCONF', 'townhall_project.urls')
 
 TEMPLATES = [
     {
@@ -98,6 +103,24 @@ WSGI_APPLICATION = 'townhall_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Connection management (DB_CONN_MODE):
+# 'persistent' (default under WSGI) reuses each worker thread's connection for DB_CONN_MAX_AGE seconds;
+# 'pool' (default under ASGI, set in asgi.py) uses Django's psycopg 3 connection pool, since ASGI threads are short-lived;
+# 'none' opens and closes a connection for every request.
+# Pool saturation is reported at /auth/admin/db-connections/ (townhall_project.db_connections).
+DB_CONN_MODE = os.getenv('DB_CONN_MODE', 'persistent')
+DB_CONN_MAX_AGE = {
+    'persistent': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+    'pool': 0,  # Pooled connections are returned to the pool instead of being kept open
+    'none': 0,
+}[DB_CONN_MODE]
+DB_POOL_OPTIONS = {
+    'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+    'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+    # Seconds a request waits for a free connection before failing
+    'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -106,9 +129,69 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT'),
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        # Check reused connections before handing them out, so a dropped connection costs a reconnect, not a 500
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True').lower() == 'true',
+        'OPTIONS': {'pool': DB_POOL_OPTIONS} if DB_CONN_MODE == 'pool' else {},
     }
 }
 
+# Read replicas (optional): DB_REPLICA_HOSTS is a comma-separated list of hosts streaming from
+# the primary, added as aliases 'replica', 'replica_2', ... with the primary's credentials.
+# Views decorated with townhall_project.db_routers.replica_reads (admin reports and list
+# endpoints) read from a random replica on GET; all writes and other views use the primary.
+REPLICA_DATABASES = []
+for _index, _host in enumerate(filter(None, os.getenv('DB_REPLICA_HOSTS', '').split(','))):
+    _alias = 'replica' if _index == 0 else f'replica_{_index + 1}'
+    DATABASES[_alias] = {
+        **DATABASES['default'],
+        'HOST': _host.strip(),
+        'PORT': os.getenv('DB_REPLICA_PORT', os.getenv('DB_PORT')),
+        'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+        # Tests read and write one database
+        'TEST': {'MIRROR': 'default'},
+    }
+    REPLICA_DATABASES.append(_alias)
+
+DATABASE_ROUTERS = ['townhall_project.db_routers.ReplicaRouter']
+
+# After a write, that client reads the primary for this many seconds (read-your-writes).
+# Should exceed typical replication lag. The pin is kept in REPLICA_STICKY_CACHE when that
+# cache is shared by the workers (see CACHE_URL), otherwise in the ThrottleCounter table.
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', '10'))
+REPLICA_STICKY_CACHE = os.getenv('REPLICA_STICKY_CACHE', 'default')
+
+# Caches
+# CACHE_URL (e.g. redis://127.0.0.1:6379/0) gives all worker processes one shared cache.
+# Without it each process keeps its own in-memory cache, so invalidation in one worker is
+# invisible to the others: version-invalidated entries (calendar feeds, town payloads) then
+# live at most LOCAL_CACHE_TIMEOUT seconds (townhall_project.caches).
+CACHE_URL = os.getenv('CACHE_URL', '')
+if CACHE_URL:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': CACHE_URL}}
+else:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+LOCAL_CACHE_TIMEOUT = int(os.getenv('LOCAL_CACHE_TIMEOUT', '60'))
+
+# Query budget (townhall_project.middleware.QueryBudgetMiddleware)
+# Requests running more than QUERY_BUDGET queries, or more than their view's @query_budget, are logged.
+# QUERY_BUDGET_STRICT makes a view over its declared budget raise instead (enable it for test runs).
+QUERY_BUDGET = int(os.getenv('QUERY_BUDGET', '50'))
+QUERY_BUDGET_STRICT = os.getenv('QUERY_BUDGET_STRICT', 'False').lower() == 'true'
+# Server-Timing response header with query count and database time (on by default in DEBUG)
+SERVER_TIMING = os.getenv('SERVER_TIMING', str(DEBUG)).lower() == 'true'
+
+# Metrics (GET /metrics, Prometheus text format; townhall_project.metrics)
+# With several worker processes (gunicorn -w N), point METRICS_MULTIPROC_DIR at a directory
+# shared by the workers on the host: each writes its counters there every METRICS_FLUSH_SECONDS
+# and a scrape sums them. Empty the directory when the server starts.
+METRICS_MULTIPROC_DIR = os.getenv('METRICS_MULTIPROC_DIR', '')
+METRICS_FLUSH_SECONDS = float(os.getenv('METRICS_FLUSH_SECONDS', '5'))
+# When set, scrapers must send "Authorization: Bearer <METRICS_TOKEN>"; required when DEBUG is off
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+# Work-queue depth gauges are recomputed at most this often (they cost a few COUNT queries)
+METRICS_QUEUE_DEPTH_SECONDS = int(os.getenv('METRICS_QUEUE_DEPTH_SECONDS', '15'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -129,6 +212,31 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# PASSWORD_HASHER picks the algorithm for new passwords: 'pbkdf2' (default), 'argon2'
+# (pip install argon2-cffi) or 'bcrypt' (pip install bcrypt). Hashes made by the other
+# algorithms still verify and are upgraded transparently on the next successful login.
+PASSWORD_HASHER_CHOICES = {
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'bcrypt': 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+}
+_preferred_hasher = PASSWORD_HASHER_CHOICES[os.getenv('PASSWORD_HASHER', 'pbkdf2')]
+PASSWORD_HASHERS = [_preferred_hasher] + [
+    hasher for hasher in [
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+        'django.contrib.auth.hashers.Argon2PasswordHasher',
+        'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+        'django.contrib.auth.hashers.ScryptPasswordHasher',
+    ] if hasher != _preferred_hasher
+]
+
+# Failed logins are remembered here (authentication.login); when it is not shared between
+# workers (see CACHE_URL) the per-account counters are kept in the database instead
+LOGIN_FAILURE_CACHE = os.getenv('LOGIN_FAILURE_CACHE', 'default')
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -159,7 +267,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        'authentication.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -170,8 +278,8 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'authentication.throttling.SlidingAnonRateThrottle',
+        'authentication.throttling.SlidingUserRateThrottle'
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/hour',
@@ -182,6 +290,12 @@ REST_FRAMEWORK = {
     }
 }
 
+# Throttle counters must be shared by all worker processes (authentication.throttling)
+# 'database' uses the ThrottleCounter table (one upsert per check); 'cache' uses THROTTLE_CACHE,
+# which must be a shared cache (see CACHE_URL); a per-process one falls back to 'database'
+THROTTLE_BACKEND = os.getenv('THROTTLE_BACKEND', 'database')
+THROTTLE_CACHE = os.getenv('THROTTLE_CACHE', 'default')
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -214,6 +328,16 @@ LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
 
 # Session Configuration
+# Backend: 'cached_db' (reads served from cache), 'db', or 'signed_cookies' (no server storage).
+# cached_db is the default only with a shared CACHE_URL: with per-process caches, logging out on one
+# worker would evict only that worker's copy and the others would keep honouring the session.
+SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'cached_db' if CACHE_URL else 'db')
+if SESSION_BACKEND == 'cached_db' and not CACHE_URL:
+    raise ImproperlyConfigured('SESSION_BACKEND=cached_db needs a cache shared by all workers; set CACHE_URL or use db')
+SESSION_ENGINE = f"django.contrib.sessions.backends.{SESSION_BACKEND}"
+# Token-authenticated /api/ requests skip session load/save entirely (see townhall_project.middleware)
+SESSIONLESS_TOKEN_API = os.getenv('SESSIONLESS_TOKEN_API', 'True').lower() == 'true'
+SESSIONLESS_PATH_PREFIXES = ['/api/']
 # Session cookie age: 12 hours (43200 seconds)
 SESSION_COOKIE_AGE = 43200  # 12 hours
 SESSION_SAVE_EVERY_REQUEST = True  # Extend session on each request
@@ -221,6 +345,14 @@ SESSION_EXPIRE_AT_BROWSER_CLOSE = False  # Keep session after browser close
 SESSION_COOKIE_HTTPONLY = True  # Prevent JavaScript access to session cookie
 SESSION_COOKIE_SAMESITE = 'Lax'  # CSRF protection
 
-# Token Authentication (DRF tokens don't expire by default)
-# If you want token expiration, you would need to implement custom token handling
-# For now, tokens persist until explicitly deleted (on logout)
+# Token Authentication (authentication.authentication.CachedTokenAuthentication)
+# Tokens expire this many hours after issue and are rotated on the next login (0 = never expire)
+TOKEN_EXPIRY_HOURS = int(os.getenv('TOKEN_EXPIRY_HOURS', '168'))
+# Per-process LRU of token lookups; the TTL bounds staleness across worker processes
+TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', '10000'))
+TOKEN_CACHE_TTL = int(os.getenv('TOKEN_CACHE_TTL', '30'))
+# UserProfile.last_seen_at is recorded at most once per resolution per user and written in batches
+# every LAST_SEEN_FLUSH_SECONDS (0 writes on every request)
+LAST_SEEN_RESOLUTION_SECONDS = 300
+LAST_SEEN_FLUSH_SECONDS = 30
+LAST_SEEN_MAX_PENDING = 500
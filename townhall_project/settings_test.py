@@ -0,0 +1,42 @@
+"""
+Test settings
+Runs the suite on SQLite so it needs no PostgreSQL server:
+
+    python manage.py test --settings=townhall_project.settings_test
+"""
+
+import os
+import tempfile
+from .settings import *  # noqa: F401,F403
+
+TEST_DB_DIR = os.getenv('TEST_DB_DIR', tempfile.gettempdir())
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(TEST_DB_DIR, 'townhall_test.sqlite3'),
+        # IMMEDIATE transactions make concurrent writers wait for the lock instead of failing
+        'OPTIONS': {'timeout': 30, 'transaction_mode': 'IMMEDIATE'},
+        # A file rather than in-memory, so threaded tests share the database
+        'TEST': {'NAME': os.path.join(TEST_DB_DIR, 'townhall_test.sqlite3')},
+    },
+    # A separate file, not a mirror, so tests can tell which database a read went to.
+    # Not in REPLICA_DATABASES: it is migrated like the primary, and tests that exercise
+    # routing add it with override_settings(REPLICA_DATABASES=['replica']).
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(TEST_DB_DIR, 'townhall_test_replica.sqlite3'),
+        'OPTIONS': {'timeout': 30},
+        'TEST': {'NAME': os.path.join(TEST_DB_DIR, 'townhall_test_replica.sqlite3'), 'MIRROR': None},
+    },
+}
+REPLICA_DATABASES = []
+
+# A view running more queries than its @query_budget fails the test that requested it
+QUERY_BUDGET_STRICT = True
+
+# Write last-seen timestamps inside the test that records them, not after the test database is gone
+LAST_SEEN_FLUSH_SECONDS = 0
+
+# Fast hashing; the tests do not measure password cost
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
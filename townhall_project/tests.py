@@ -0,0 +1,264 @@
+"""
+Project Tests
+Read replica routing and read-your-writes stickiness (townhall_project.db_routers, ReplicaStickinessMiddleware)
+Multiprocess metrics files and the /metrics endpoint (townhall_project.metrics)
+Async-native ASGI read views return the same payloads as the DRF views (townhall_project.urls_asgi)
+Connection stats for pooled and non-pooled databases (townhall_project.db_connections)
+"""
+
+import os
+import tempfile
+import threading
+from unittest import mock
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import F
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory, SimpleTestCase, TestCase, override_settings
+from authentication.authentication import issue_token
+from authentication.models import ThrottleCounter, UserProfile
+from businessowner.models import BusinessNotification, BusinessOwnerProfile
+from citizen.models import CitizenNotification, CitizenProfile
+from government.models import Announcement, BillProposal, Department, GovernmentOfficial
+from towns.models import Town
+from . import metrics
+from .db_connections import POOL_COUNTERS, connection_stats, pool_stats
+from .db_routers import ReplicaRouter, replica_reads
+from .middleware import ReplicaStickinessMiddleware
+
+# The primary and the replica hold different counts for this key, so a response shows where it read
+MARKER = 'replica-test-marker'
+PRIMARY_COUNT = 1
+REPLICA_COUNT = 2
+
+SHARED_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': tempfile.mkdtemp()},
+}
+
+
+@replica_reads
+def marker_view(request):
+    if request.method == 'GET':
+        return HttpResponse(str(ThrottleCounter.objects.get(bucket_key=MARKER).current_count))
+    ThrottleCounter.objects.filter(bucket_key=MARKER).update(previous_count=1)
+    return HttpResponse('written')
+
+
+@override_settings(REPLICA_DATABASES=['replica'])
+class ReplicaTestCase(TestCase):
+    databases = {DEFAULT_DB_ALIAS, 'replica'}
+
+    def setUp(self):
+        ThrottleCounter.objects.create(bucket_key=MARKER, window_start=0, current_count=PRIMARY_COUNT)
+        ThrottleCounter.objects.using('replica').create(bucket_key=MARKER, window_start=0, current_count=REPLICA_COUNT)
+        self.factory = RequestFactory()
+
+
+class ReplicaRouterTests(ReplicaTestCase):
+
+    def test_reads_outside_replica_views_use_primary(self):
+        self.assertEqual(ThrottleCounter.objects.get(bucket_key=MARKER).current_count, PRIMARY_COUNT)
+
+    def test_safe_requests_read_replica(self):
+        self.assertEqual(marker_view(self.factory.get('/')).content, str(REPLICA_COUNT).encode())
+
+    def test_writes_go_to_primary(self):
+        marker_view(self.factory.post('/'))
+        self.assertEqual(ThrottleCounter.objects.get(bucket_key=MARKER).previous_count, 1)
+        self.assertEqual(ThrottleCounter.objects.using('replica').get(bucket_key=MARKER).previous_count, 0)
+
+    def test_pinned_request_reads_primary(self):
+        request = self.factory.get('/')
+        request.use_primary = True
+        self.assertEqual(marker_view(request).content, str(PRIMARY_COUNT).encode())
+
+    def test_replica_is_never_migrated(self):
+        self.assertFalse(ReplicaRouter().allow_migrate('replica', 'authentication'))
+        self.assertIsNone(ReplicaRouter().allow_migrate(DEFAULT_DB_ALIAS, 'authentication'))
+
+
+class ReplicaStickinessTests(ReplicaTestCase):
+    """After a write, the same client reads the primary; other clients keep using the replica"""
+
+    TOKEN = 'Token 0123456789abcdef'
+
+    def setUp(self):
+        super().setUp()
+        self.middleware = ReplicaStickinessMiddleware(marker_view)
+
+    def read(self, **extra):
+        return int(self.middleware(self.factory.get('/', **extra)).content)
+
+    def test_without_write_reads_replica(self):
+        self.assertEqual(self.read(HTTP_AUTHORIZATION=self.TOKEN), REPLICA_COUNT)
+
+    @override_settings(CACHES=SHARED_CACHES, REPLICA_STICKY_CACHE='default')
+    def test_shared_cache_pins_client_after_write(self):
+        self.middleware(self.factory.post('/', HTTP_AUTHORIZATION=self.TOKEN))
+
+        self.assertFalse(ThrottleCounter.objects.filter(bucket_key__startswith='replica:pin:').exists())
+        self.assertEqual(self.read(HTTP_AUTHORIZATION=self.TOKEN), PRIMARY_COUNT)
+        self.assertEqual(self.read(HTTP_AUTHORIZATION='Token another-client'), REPLICA_COUNT)
+
+    @override_settings(REPLICA_STICKY_CACHE='default')
+    def test_process_local_cache_pins_in_database(self):
+        # Token clients send no cookies, so every worker must find the pin by token
+        self.middleware(self.factory.post('/', HTTP_AUTHORIZATION=self.TOKEN))
+
+        self.assertEqual(self.read(HTTP_AUTHORIZATION=self.TOKEN), PRIMARY_COUNT)
+        self.assertEqual(self.read(HTTP_AUTHORIZATION='Token another-client'), REPLICA_COUNT)
+
+    @override_settings(REPLICA_STICKY_CACHE='default', REPLICA_STICKY_SECONDS=10)
+    def test_database_pin_expires(self):
+        self.middleware(self.factory.post('/', HTTP_AUTHORIZATION=self.TOKEN))
+        ThrottleCounter.objects.filter(bucket_key__startswith='replica:pin:').update(window_start=F('window_start') - 11)
+
+        self.assertEqual(self.read(HTTP_AUTHORIZATION=self.TOKEN), REPLICA_COUNT)
+
+
+class MetricsFlushTests(SimpleTestCase):
+
+    def test_concurrent_flushes_never_fail(self):
+        errors = []
+
+        def flush_repeatedly():
+            try:
+                for _ in range(50):
+                    metrics.registry._last_flush = 0
+                    metrics.registry.maybe_flush()
+                    metrics.registry.flush()
+            except Exception as e:
+                errors.append(e)
+
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_MULTIPROC_DIR=directory):
+            threads = [threading.Thread(target=flush_repeatedly) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(errors, [])
+            self.assertEqual(os.listdir(directory), [f'{os.getpid()}.json'])
+
+    def test_unwritable_directory_does_not_fail_requests(self):
+        with override_settings(METRICS_MULTIPROC_DIR=os.path.join(tempfile.gettempdir(), 'missing', 'metrics')):
+            metrics.registry._last_flush = 0
+            with self.assertLogs('townhall_project.metrics', 'WARNING'):
+                metrics.registry.maybe_flush()
+
+
+class MetricsEndpointTests(TestCase):
+
+    @override_settings(DEBUG=False, METRICS_TOKEN='')
+    def test_refused_in_production_without_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+
+    @override_settings(DEBUG=False, METRICS_TOKEN='secret')
+    def test_token_required_when_configured(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'townhall_http_requests_total', response.content)
+
+    @override_settings(DEBUG=True, METRICS_TOKEN='')
+    def test_open_in_debug_without_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+
+class AsyncViewParityTests(TestCase):
+    """Each async view answers a GET exactly like the DRF view it replaces under ASGI"""
+
+    def setUp(self):
+        town = Town.objects.create(name='Springfield', slug='springfield', state='NJ', zip_codes=['07001'])
+        Town.objects.create(name='Shelbyville', slug='shelbyville', state='NJ')
+        official_user = User.objects.create_user('official@example.com', 'official@example.com', 'pw')
+        official = GovernmentOfficial.objects.create(
+            user=official_user, employee_id='E1', department='Clerk', position='Clerk', town=town,
+        )
+        department = Department.objects.create(name='Clerk', description='Records')
+        Announcement.objects.create(
+            title='Road closure', content='Main St closed', department=department, town=town,
+            created_by=official, is_published=True,
+        )
+        BillProposal.objects.create(
+            title='Budget', description='Annual budget', department=department, town=town,
+            created_by=official, status='published',
+        )
+        citizen_user = User.objects.create_user('citizen@example.com', 'citizen@example.com', 'pw')
+        UserProfile.objects.create(user=citizen_user, role='citizen', town=town, is_approved=True)
+        citizen = CitizenProfile.objects.create(user=citizen_user, citizen_id='C1')
+        for number in range(2):
+            CitizenNotification.objects.create(citizen=citizen, title=f'Update {number}', message='Text', is_read=bool(number))
+        owner_user = User.objects.create_user('owner@example.com', 'owner@example.com', 'pw')
+        UserProfile.objects.create(user=owner_user, role='business', town=town, is_approved=True)
+        owner = BusinessOwnerProfile.objects.create(
+            user=owner_user, business_name='Cafe', business_registration_number='R1',
+            business_type='cafe', business_address='1 Main St',
+        )
+        BusinessNotification.objects.create(business_owner=owner, title='Welcome', message='Text')
+        self.citizen_auth = f'Token {issue_token(citizen_user).key}'
+        self.owner_auth = f'Token {issue_token(owner_user).key}'
+
+    async def assertSamePayload(self, path, authorization=None):
+        headers = {'Authorization': authorization} if authorization else {}
+        sync_response = await AsyncClient().get(path, headers=headers)
+        with override_settings(ROOT_URLCONF='townhall_project.urls_asgi'):
+            async_response = await AsyncClient().get(path, headers=headers)
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(sync_response.status_code, 200)
+        self.assertEqual(async_response.json(), sync_response.json())
+        self.assertTrue(sync_response.json())
+
+    async def test_active_towns(self):
+        await self.assertSamePayload('/api/towns/active/')
+        await self.assertSamePayload('/api/towns/active/?fields=name,zip_codes')
+
+    async def test_announcements(self):
+        await self.assertSamePayload('/api/government/announcements/', self.citizen_auth)
+
+    async def test_bills(self):
+        await self.assertSamePayload('/api/government/bills/', self.citizen_auth)
+        await self.assertSamePayload('/api/government/bills/?sort=votes', self.citizen_auth)
+
+    async def test_citizen_notifications(self):
+        await self.assertSamePayload('/api/citizen/notifications/', self.citizen_auth)
+        await self.assertSamePayload('/api/citizen/notifications/?is_read=false', self.citizen_auth)
+
+    async def test_business_notifications(self):
+        await self.assertSamePayload('/api/business/notifications/', self.owner_auth)
+
+    async def test_authentication_errors_match(self):
+        sync_response = await AsyncClient().get('/api/citizen/notifications/', headers={'Authorization': 'Token unknown'})
+        with override_settings(ROOT_URLCONF='townhall_project.urls_asgi'):
+            async_response = await AsyncClient().get('/api/citizen/notifications/', headers={'Authorization': 'Token unknown'})
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(async_response.json(), sync_response.json())
+
+
+class ConnectionStatsTests(TestCase):
+
+    def test_non_pooled_aliases_report_no_pool(self):
+        stats = connection_stats()
+        self.assertEqual(set(stats), {DEFAULT_DB_ALIAS, 'replica'})
+        for alias, alias_stats in stats.items():
+            self.assertIsNone(alias_stats['pool'])
+            self.assertEqual(alias_stats['vendor'], 'sqlite')
+            self.assertEqual(
+                alias_stats['mode'], 'none' if connections[alias].settings_dict['CONN_MAX_AGE'] == 0 else 'persistent'
+            )
+
+    def test_pool_saturation_and_missing_counters(self):
+        pool = mock.Mock()
+        pool.get_stats.return_value = {'pool_min': 2, 'pool_max': 8, 'pool_size': 6, 'pool_available': 2, 'requests_num': 40}
+        stats = pool_stats(mock.Mock(pool=pool))
+
+        self.assertEqual((stats['in_use'], stats['saturation'], stats['waiting']), (4, 0.5, 0))
+        self.assertEqual(stats['requests_num'], 40)
+        self.assertEqual({counter: stats[counter] for counter in POOL_COUNTERS[1:]}, dict.fromkeys(POOL_COUNTERS[1:], 0))
+
+    def test_admin_endpoint_reports_every_alias(self):
+        admin_user = User.objects.create_superuser('admin@example.com', 'admin@example.com', 'pw')
+        response = self.client.get(
+            '/api/auth/admin/db-connections/', HTTP_AUTHORIZATION=f'Token {issue_token(admin_user).key}',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()['databases']), {DEFAULT_DB_ALIAS, 'replica'})
@@ -22,6 +22,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
+from .views_metrics import metrics_view
 
 
 @api_view(['GET'])
@@ -97,6 +98,8 @@ def api_help_view(request, **kwargs):
 urlpatterns = [
     path('', api_root_view, name='api_root'),
     path('admin/', admin.site.urls),
+    # GET /metrics - Prometheus scrape endpoint
+    path('metrics', metrics_view, name='metrics'),
     path('api/auth/', include('authentication.urls')),
     path('api/towns/', include('towns.urls')),
     path('api/government/', include('government.urls')),
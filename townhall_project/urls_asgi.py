@@ -0,0 +1,20 @@
+"""
+ASGI URL configuration
+Routes the highest-traffic read endpoints to async-native views and everything else
+to the regular URLconf. Selected by townhall_project.asgi via ROOT_URLCONF.
+"""
+from django.urls import path
+from citizen.views_async import list_notifications_async_view
+from businessowner.views_async import list_business_notifications_async_view
+from government.views_async import list_announcements_async_view, bills_list_async_view
+from towns.views_async import active_towns_async_view
+from .urls import urlpatterns as sync_urlpatterns
+
+# Non-GET methods on these paths are delegated to the original DRF views
+urlpatterns = [
+    path('api/towns/active/', active_towns_async_view),
+    path('api/government/announcements/', list_announcements_async_view),
+    path('api/government/bills/', bills_list_async_view),
+    path('api/citizen/notifications/', list_notifications_async_view),
+    path('api/business/notifications/', list_business_notifications_async_view),
+] + sync_urlpatterns
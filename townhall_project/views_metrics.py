@@ -0,0 +1,76 @@
+"""
+Metrics Views
+Prometheus scrape endpoint plus the gauges computed at scrape time
+"""
+
+import hmac
+import threading
+import time
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+from authentication.models import UserProfile
+from businessowner.models import BusinessLicense
+from citizen.models import ComplaintAssignment
+from towns.models import TownChangeRequest
+from . import metrics
+from .db_connections import connection_stats
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Town change requests still waiting for one of the two towns
+OPEN_TOWN_CHANGE_STATUSES = ['pending', 'approved_current', 'approved_new']
+
+_queue_depths = {'values': None, 'computed_at': 0.0}
+_queue_lock = threading.Lock()
+
+
+def count_queue_depths():
+    """Items waiting in each work queue (database-wide, so identical in every worker)"""
+    return {
+        'license_review': BusinessLicense.objects.filter(status='pending').count(),
+        'complaint_assignment': ComplaintAssignment.objects.filter(is_open=True, official__isnull=True).count(),
+        'user_approval': UserProfile.objects.filter(is_approved=False).count(),
+        'town_change': TownChangeRequest.objects.filter(status__in=OPEN_TOWN_CHANGE_STATUSES).count(),
+    }
+
+
+def queue_depth_collector():
+    with _queue_lock:
+        if time.monotonic() - _queue_depths['computed_at'] >= settings.METRICS_QUEUE_DEPTH_SECONDS:
+            _queue_depths['values'] = count_queue_depths()
+            _queue_depths['computed_at'] = time.monotonic()
+        depths = _queue_depths['values']
+    return [(
+        'townhall_queue_depth', 'gauge', 'Items waiting in each work queue',
+        [({'queue': queue}, depth) for queue, depth in depths.items()],
+    )]
+
+
+def db_pool_collector():
+    """Pool usage of the worker that serves the scrape (pools are per process)"""
+    samples = []
+    for alias, stats in connection_stats().items():
+        pool = stats['pool']
+        if pool is None:
+            continue
+        for state in ['in_use', 'available', 'waiting']:
+            samples.append(({'database': alias, 'state': state}, pool[state]))
+    return [('townhall_db_pool_connections', 'gauge', 'Pooled database connections by state', samples)]
+
+
+metrics.registry.register_collector(queue_depth_collector)
+metrics.registry.register_collector(db_pool_collector)
+
+
+@require_GET
+def metrics_view(request):
+    """GET /metrics - all metrics in the Prometheus text format"""
+    if not settings.METRICS_TOKEN and not settings.DEBUG:
+        # Never expose routes and queue sizes unauthenticated in production
+        return HttpResponse('Forbidden: set METRICS_TOKEN to enable /metrics\n', status=403, content_type='text/plain')
+    if settings.METRICS_TOKEN:
+        expected = f'Bearer {settings.METRICS_TOKEN}'
+        if not hmac.compare_digest(request.META.get('HTTP_AUTHORIZATION', ''), expected):
+            return HttpResponse('Unauthorized\n', status=401, content_type='text/plain')
+    return HttpResponse(metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Town, TownChangeRequest
+from .models import Town, TownChangeRequest, TownZipCode
 
 
 @admin.register(Town)
@@ -71,3 +71,16 @@ class TownChangeRequestAdmin(admin.ModelAdmin):
         if obj:
             return self.readonly_fields + ('status', 'rejection_reason')
         return self.readonly_fields
+
+
+@admin.register(TownZipCode)
+class TownZipCodeAdmin(admin.ModelAdmin):
+    list_display = ('zip_code', 'town', 'created_at')
+    list_filter = ('town__state',)
+    search_fields = ('zip_code', 'town__name')
+    readonly_fields = ('zip_code', 'town', 'created_at')
+    ordering = ('zip_code',)
+    
+    def has_add_permission(self, request):
+        # Entries are maintained from Town.zip_codes
+        return False
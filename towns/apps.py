@@ -6,5 +6,6 @@ class TownsConfig(AppConfig):
     name = 'towns'
     
     def ready(self):
-        """Import admin when app is ready"""
-        import towns.admin  # noqa
\ No newline at end of file
+        """Import admin and connect signal handlers when app is ready"""
+        import towns.admin  # noqa
+        import towns.signals  # noqa
\ No newline at end of file
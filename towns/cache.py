@@ -0,0 +1,125 @@
+"""
+Town Response Cache
+Versioned cache for rarely-changing town payloads, with ETag support
+"""
+
+import hashlib
+import json
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+from townhall_project.caches import versioned_timeout
+from townhall_project.metrics import record_cache
+
+# Cached payloads are unreachable once the version is bumped, so they can live long
+# on a shared cache (capped at LOCAL_CACHE_TIMEOUT on a per-process one, see versioned_timeout)
+TOWN_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Browser/CDN max-age for the public active towns list
+ACTIVE_TOWNS_MAX_AGE = 60 * 60
+
+# Browser max-age for per-user emergency contacts
+EMERGENCY_CONTACTS_MAX_AGE = 60 * 10
+
+VERSION_KEY = 'towns:version'
+
+
+def get_version():
+    """Current cache version for town payloads"""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def bump_version():
+    """Invalidate every cached town payload"""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 2, None)
+
+
+async def aget_version():
+    """Async variant of get_version"""
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, 1, None)
+        version = await cache.aget(VERSION_KEY, 1)
+    return version
+
+
+def compute_etag(data):
+    """Strong ETag for a JSON-serializable payload"""
+    body = json.dumps(data, sort_keys=True, separators=(',', ':'), default=str)
+    return '"' + hashlib.md5(body.encode('utf-8')).hexdigest() + '"'
+
+
+def get_cached_payload(name, build):
+    """
+    Return (data, etag) for a named payload, building and caching it on a miss.
+    build: callable returning JSON-serializable data
+    """
+    key = f'towns:payload:{name}:v{get_version()}'
+    entry = cache.get(key)
+    record_cache('town_payload', entry is not None)
+    if entry is None:
+        data = build()
+        entry = (data, compute_etag(data))
+        cache.set(key, entry, versioned_timeout(TOWN_CACHE_TIMEOUT))
+    return entry
+
+
+async def aget_cached_payload(name, abuild):
+    """
+    Async variant of get_cached_payload
+    abuild: coroutine function returning JSON-serializable data
+    """
+    key = f'towns:payload:{name}:v{await aget_version()}'
+    entry = await cache.aget(key)
+    record_cache('town_payload', entry is not None)
+    if entry is None:
+        data = await abuild()
+        entry = (data, compute_etag(data))
+        await cache.aset(key, entry, versioned_timeout(TOWN_CACHE_TIMEOUT))
+    return entry
+
+
+def is_not_modified(request, etag):
+    """True when the client's If-None-Match already covers this ETag"""
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+    return etag in [value.strip() for value in if_none_match.split(',')] or if_none_match.strip() == '*'
+
+
+def apply_cache_headers(response, etag, max_age, private=False):
+    """Set ETag/Cache-Control (and Vary for per-user payloads) on a response"""
+    response['ETag'] = etag
+    response['Cache-Control'] = f'{"private" if private else "public"}, max-age={max_age}'
+    if private:
+        response['Vary'] = 'Authorization, Cookie'
+    return response
+
+
+def etag_response(request, data, etag, max_age, private=False):
+    """200 with ETag and Cache-Control headers, or 304 when the client copy is current"""
+    if is_not_modified(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(data, status=status.HTTP_200_OK)
+    return apply_cache_headers(response, etag, max_age, private)
+
+
+def parse_fields(request, allowed):
+    """
+    Parse ?fields=a,b into a list of allowed field names
+    Returns: (fields or None when not requested, error_message)
+    """
+    raw = getattr(request, 'query_params', request.GET).get('fields', '')
+    if not raw:
+        return None, None
+    fields = [field.strip() for field in raw.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        return None, f'Unknown field(s): {", ".join(unknown)}. Allowed: {", ".join(allowed)}'
+    return fields, None
@@ -0,0 +1,154 @@
+"""
+iCalendar rendering and feed caching
+Builds RFC 5545 feeds from per-event chunks that are cached independently
+"""
+
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from django.core.cache import cache
+from django.utils import timezone
+from businessowner.models import EventRegistration
+from townhall_project.metrics import record_cache
+
+PRODID = '-//TownHall//Calendar Feeds//EN'
+
+# Rendered whole feeds; versions keys make stale entries unreachable on change
+# (capped by townhall_project.caches.versioned_timeout when the cache is per-process)
+FEED_CACHE_TIMEOUT = 60 * 60
+
+# Rendered VEVENT chunks are keyed by row version, so they can live much longer
+VEVENT_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Default event length when the source row only has a start time
+DEFAULT_EVENT_DURATION = timedelta(hours=1)
+
+
+def _escape(value):
+    """Escape TEXT values (RFC 5545 3.3.11)"""
+    return (
+        str(value or '')
+        .replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def _fold(line):
+    """Fold content lines longer than 75 octets (RFC 5545 3.1)"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    while len(encoded) > 75:
+        cut = 75 if not parts else 74
+        # Do not split a multi-byte UTF-8 sequence
+        while cut > 0 and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+    parts.append(encoded.decode('utf-8'))
+    return '\r\n '.join(parts)
+
+
+def _format_datetime(value):
+    """UTC DATE-TIME value"""
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def render_vevent(uid, summary, start, end=None, description='', location='', all_day=False, stamp=None):
+    """Render one VEVENT block (CRLF-terminated lines)"""
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:{uid}',
+        f'DTSTAMP:{_format_datetime(stamp or timezone.now())}',
+    ]
+    if all_day:
+        lines.append(f'DTSTART;VALUE=DATE:{start.strftime("%Y%m%d")}')
+        lines.append(f'DTEND;VALUE=DATE:{(start + timedelta(days=1)).strftime("%Y%m%d")}')
+    else:
+        lines.append(f'DTSTART:{_format_datetime(start)}')
+        lines.append(f'DTEND:{_format_datetime(end or start + DEFAULT_EVENT_DURATION)}')
+    lines.append(f'SUMMARY:{_escape(summary)}')
+    if description:
+        lines.append(f'DESCRIPTION:{_escape(description)}')
+    if location:
+        lines.append(f'LOCATION:{_escape(location)}')
+    lines.append('END:VEVENT')
+    return ''.join(_fold(line) + '\r\n' for line in lines)
+
+
+def render_calendar(name, vevents):
+    """Wrap pre-rendered VEVENT chunks into a VCALENDAR document"""
+    header = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:{PRODID}',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{_escape(name)}',
+    ]
+    return (
+        ''.join(_fold(line) + '\r\n' for line in header)
+        + ''.join(vevents)
+        + 'END:VCALENDAR\r\n'
+    )
+
+
+def combine_date_time(day, at=None):
+    """Aware datetime for a date and optional time in the current timezone"""
+    return timezone.make_aware(datetime.combine(day, at or time(0, 0)))
+
+
+def render_chunks(items):
+    """
+    Render VEVENT chunks, reusing cached ones.
+    items: list of (cache_key, render_callable); one get_many/set_many round trip.
+    """
+    cached = cache.get_many([key for key, _ in items])
+    missing = {}
+    chunks = []
+    for key, render in items:
+        chunk = cached.get(key)
+        if chunk is None:
+            chunk = render()
+            missing[key] = chunk
+        chunks.append(chunk)
+    record_cache('ical_vevent', True, len(items) - len(missing))
+    record_cache('ical_vevent', False, len(missing))
+    if missing:
+        cache.set_many(missing, VEVENT_CACHE_TIMEOUT)
+    return chunks
+
+
+def get_version(scope):
+    """Current cache version for a feed scope ('town:<id>' or 'user:<id>')"""
+    key = f'ical:version:{scope}'
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, None)
+        version = cache.get(key, 1)
+    return version
+
+
+def bump_version(scope):
+    """Invalidate every cached feed that depends on a scope"""
+    key = f'ical:version:{scope}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, None)
+
+
+def bump_event_versions(event_ids):
+    """
+    Invalidate the personal feeds that list these events, i.e. those of the citizens
+    registered for them (callers bump the organizers' town feeds)
+    """
+    user_ids = EventRegistration.objects.filter(
+        event_id__in=event_ids, status='registered'
+    ).values_list('citizen__user_id', flat=True).distinct()
+    for user_id in user_ids:
+        bump_version(f'user:{user_id}')
@@ -0,0 +1,15 @@
+"""
+Django management command to rebuild the ZIP code to town index
+Usage: python manage.py rebuild_zip_index
+Run after loading towns in bulk (bulk_create and fixtures skip the post_save sync).
+"""
+from django.core.management.base import BaseCommand
+from towns.zip_codes import rebuild_zip_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the TownZipCode index from Town.zip_codes'
+
+    def handle(self, *args, **options):
+        indexed = rebuild_zip_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} ZIP code(s)'))
@@ -0,0 +1,404 @@
+"""
+Django management command to generate a large synthetic multi-town dataset for load testing
+Usage: python manage.py seed_scale [--users 100000] [--complaints 1000000] [--password PW] [--clear]
+Rows are written with bulk_create in batches; run benchmarks/endpoints.py against the result.
+Refuses to run with DEBUG off unless --i-know-this-is-not-production is passed.
+"""
+import os
+import random
+import secrets
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from django.contrib.auth.hashers import make_password
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from authentication.models import UserProfile
+from businessowner.models import BusinessEvent, BusinessNotification, BusinessOwnerProfile
+from citizen.geo import encode_geohash
+from citizen.models import CitizenComplaint, CitizenNotification, CitizenProfile
+from government.models import Announcement, BillProposal, BillVote, Department, GovernmentOfficial
+from towns.cache import bump_version as bump_town_cache_version
+from towns.ical import bump_version as bump_feed_version
+from towns.models import Town
+
+# Every seeded user and town carries this marker so --clear removes exactly the seeded rows
+SEED_EMAIL_DOMAIN = 'seed.townhall.test'
+SEED_TOWN_SLUG_PREFIX = 'seed-'
+
+# Environment variable with the password of every seeded account when --password is not given (else random)
+SEED_PASSWORD_ENV = 'SEED_PASSWORD'
+
+# Share of users per role; the rest are citizens
+GOVERNMENT_SHARE = 0.02
+BUSINESS_SHARE = 0.10
+
+# Share of notifications addressed to business owners; the rest go to citizens
+BUSINESS_NOTIFICATION_SHARE = 0.10
+
+ANNOUNCEMENTS_PER_TOWN = 25
+
+STATES = ['NJ', 'NY', 'PA', 'CT', 'MA', 'DE', 'MD']
+DEPARTMENTS = ['Public Works', 'Parks and Recreation', 'Public Safety', 'Utilities', 'Planning and Zoning']
+COMPLAINT_TOPICS = {
+    'infrastructure': ['Pothole on {street}', 'Broken sidewalk on {street}', 'Streetlight out on {street}'],
+    'utilities': ['Water main leak near {street}', 'Low water pressure on {street}', 'Power flickering on {street}'],
+    'safety': ['Speeding cars on {street}', 'Missing stop sign at {street}', 'Unsafe crosswalk on {street}'],
+    'other': ['Overflowing trash cans on {street}', 'Graffiti on {street}', 'Noise complaint on {street}'],
+}
+STREETS = ['Main St', 'Oak Ave', 'Maple Dr', 'Park Pl', 'Elm St', 'River Rd', 'Church St', 'Mill Ln', 'Hill St']
+BUSINESS_TYPES = ['Restaurant', 'Retail', 'Salon', 'Cafe', 'Hardware', 'Fitness', 'Bakery', 'Auto Repair']
+BILL_TOPICS = ['Road resurfacing', 'Park renovation', 'Library hours', 'Parking meters', 'Bike lanes',
+               'Noise ordinance', 'Recycling program', 'Snow removal budget', 'School crossing guards']
+
+# (value, weight) pairs used when picking statuses and priorities
+COMPLAINT_STATUSES = [('pending', 20), ('in_progress', 15), ('resolved', 55), ('closed', 10)]
+COMPLAINT_PRIORITIES = [('low', 25), ('medium', 45), ('high', 22), ('urgent', 8)]
+BILL_STATUSES = [('published', 50), ('under_review', 25), ('approved', 15), ('rejected', 5), ('implemented', 5)]
+EVENT_STATUSES = [('approved', 70), ('pending', 20), ('rejected', 5), ('cancelled', 5)]
+
+# SLA hours per priority for open complaints
+SLA_HOURS = {'low': 240, 'medium': 120, 'high': 48, 'urgent': 12}
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Keep generated created_at values; auto_now_add would overwrite them with the current time"""
+    fields = [field for model in models for field in model._meta.concrete_fields if getattr(field, 'auto_now_add', False)]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def weighted(rng, pairs):
+    return rng.choices([value for value, _ in pairs], weights=[weight for _, weight in pairs])[0]
+
+
+class Command(BaseCommand):
+    help = 'Generate a large synthetic multi-town dataset (users, complaints, notifications, bills, votes, events)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--towns', type=int, default=20, help='Towns to create (default: 20)')
+        parser.add_argument('--users', type=int, default=100000, help='Users across all roles (default: 100000)')
+        parser.add_argument('--complaints', type=int, default=1000000, help='Citizen complaints (default: 1000000)')
+        parser.add_argument('--notifications', type=int, default=500000, help='Citizen and business notifications (default: 500000)')
+        parser.add_argument('--bills', type=int, default=2000, help='Bill proposals (default: 2000)')
+        parser.add_argument('--votes', type=int, default=500000, help='Bill votes (default: 500000)')
+        parser.add_argument('--events', type=int, default=20000, help='Business events (default: 20000)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per INSERT (default: 5000)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed, for repeatable datasets (default: 42)')
+        parser.add_argument('--password', help=f'Password of every seeded account, including the superuser '
+                                               f'(default: ${SEED_PASSWORD_ENV}, else a random one that is printed)')
+        parser.add_argument('--clear', action='store_true', help='Delete previously seeded data and exit')
+        parser.add_argument('--i-know-this-is-not-production', action='store_true', dest='not_production',
+                            help='Allow seeding while DEBUG is off')
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            self.clear()
+            return
+        if not settings.DEBUG and not options['not_production']:
+            raise CommandError(
+                'DEBUG is off, so this may be a production database. seed_scale creates a superuser and '
+                'thousands of accounts; pass --i-know-this-is-not-production if this is a load-test database.'
+            )
+        if Town.objects.filter(slug__startswith=SEED_TOWN_SLUG_PREFIX).exists():
+            raise CommandError('Seed data already exists. Run with --clear first.')
+        if options['users'] < options['towns']:
+            raise CommandError('--users must be at least --towns (every town gets an official)')
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.password = options['password'] or os.getenv(SEED_PASSWORD_ENV) or secrets.token_urlsafe(16)
+
+        self.step('towns', self.create_towns, options['towns'])
+        self.step('users', self.create_users, options['users'])
+        with explicit_timestamps(CitizenComplaint, CitizenNotification, BusinessNotification, BillProposal, Announcement):
+            citizen_notifications = round(options['notifications'] * (1 - BUSINESS_NOTIFICATION_SHARE))
+            self.step('complaints', self.create_complaints, options['complaints'], citizen_notifications)
+            self.step('notifications', self.create_notifications, options['notifications'] - citizen_notifications)
+            self.step('bills', self.create_bills, options['bills'])
+            self.step('announcements', self.create_announcements)
+        self.step('votes', self.create_votes, options['votes'])
+        self.step('events', self.create_events, options['events'])
+
+        # bulk_create skips the post_save signals that invalidate these caches
+        for town in self.towns:
+            bump_feed_version(f'town:{town.id}')
+        bump_town_cache_version()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {len(self.towns)} towns. Every account uses the password "{self.password}"; '
+            f'admin: seed-admin@{SEED_EMAIL_DOMAIN}'
+        ))
+
+    def step(self, label, create, *args):
+        started = time.monotonic()
+        created = create(*args)
+        elapsed = time.monotonic() - started
+        rate = created / elapsed if elapsed else created
+        self.stdout.write(f'  {label}: {created} rows in {elapsed:.1f}s ({rate:.0f}/s)')
+
+    def batches(self, total):
+        """Sizes of consecutive batches adding up to total"""
+        for start in range(0, total, self.batch_size):
+            yield min(self.batch_size, total - start)
+
+    def past(self, max_days=730):
+        """A timestamp in the last max_days, skewed towards recent activity"""
+        days = min(self.rng.expovariate(1 / (max_days / 4)), max_days)
+        return self.now - timedelta(days=days, seconds=self.rng.randint(0, 86399))
+
+    def clear(self):
+        self.stdout.write('Deleting seeded users and towns (cascades to their data; this can take a while)...')
+        users, _ = User.objects.filter(email__endswith=f'@{SEED_EMAIL_DOMAIN}').delete()
+        towns, _ = Town.objects.filter(slug__startswith=SEED_TOWN_SLUG_PREFIX).delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {users + towns} row(s)'))
+
+    def create_towns(self, count):
+        self.towns = []
+        for index in range(count):
+            town = Town.objects.create(
+                name=f'Seedville {index + 1}',
+                slug=f'{SEED_TOWN_SLUG_PREFIX}{index + 1}',
+                state=STATES[index % len(STATES)],
+                zip_codes=[f'{99000 + index * 3 + offset:05d}' for offset in range(3)],
+            )
+            # Town center for complaint coordinates
+            town.center = (self.rng.uniform(39.0, 42.0), self.rng.uniform(-75.5, -72.0))
+            self.towns.append(town)
+        # Population follows a long tail: a few large towns, many small ones
+        self.town_weights = [1 / (rank + 1) ** 0.8 for rank in range(count)]
+        self.departments = [
+            Department.objects.get_or_create(name=name, defaults={'description': f'{name} department'})[0]
+            for name in DEPARTMENTS
+        ]
+        return count
+
+    def pick_town_index(self):
+        return self.rng.choices(range(len(self.towns)), weights=self.town_weights)[0]
+
+    def create_users(self, total):
+        password = make_password(self.password)
+        government_total = max(len(self.towns), round(total * GOVERNMENT_SHARE))
+        business_total = round(total * BUSINESS_SHARE)
+        self.citizens = [[] for _ in self.towns]    # per town: (citizen profile id, user id)
+        self.businesses = [[] for _ in self.towns]  # per town: business profile id
+        self.officials = [[] for _ in self.towns]   # per town: official id
+
+        number = 0
+        for size in self.batches(total):
+            roles, town_indexes, users = [], [], []
+            for _ in range(size):
+                if number < government_total:
+                    role = 'government'
+                    # The first official of each town makes sure every town has one
+                    town_index = number if number < len(self.towns) else self.pick_town_index()
+                elif number < government_total + business_total:
+                    role, town_index = 'business', self.pick_town_index()
+                else:
+                    role, town_index = 'citizen', self.pick_town_index()
+                email = f'seed-{number}@{SEED_EMAIL_DOMAIN}'
+                users.append(User(
+                    username=email, email=email, password=password,
+                    first_name=self.rng.choice(['Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley']),
+                    last_name=f'Seed{number}', date_joined=self.past(),
+                ))
+                roles.append(role)
+                town_indexes.append(town_index)
+                number += 1
+
+            with transaction.atomic():
+                users = User.objects.bulk_create(users)
+                UserProfile.objects.bulk_create([
+                    UserProfile(user=user, role=role, town=self.towns[town_index], is_approved=self.rng.random() > 0.02)
+                    for user, role, town_index in zip(users, roles, town_indexes)
+                ])
+                self.create_role_profiles(users, roles, town_indexes)
+
+        User.objects.create_superuser(f'seed-admin@{SEED_EMAIL_DOMAIN}', f'seed-admin@{SEED_EMAIL_DOMAIN}', self.password)
+        return total
+
+    def create_role_profiles(self, users, roles, town_indexes):
+        citizens, businesses, officials = [], [], []
+        for user, role, town_index in zip(users, roles, town_indexes):
+            if role == 'citizen':
+                citizens.append((town_index, CitizenProfile(
+                    user=user, citizen_id=f'SEED{user.id:012d}', address=f'{self.rng.randint(1, 999)} {self.rng.choice(STREETS)}',
+                )))
+            elif role == 'business':
+                business_type = self.rng.choice(BUSINESS_TYPES)
+                businesses.append((town_index, BusinessOwnerProfile(
+                    user=user, business_name=f'{user.last_name} {business_type}', business_type=business_type,
+                    business_registration_number=f'SEED-BRN-{user.id}',
+                    business_address=f'{self.rng.randint(1, 999)} {self.rng.choice(STREETS)}',
+                )))
+            else:
+                officials.append((town_index, GovernmentOfficial(
+                    user=user, employee_id=f'SEED{user.id:012d}', department=self.rng.choice(DEPARTMENTS),
+                    position='Officer', town=self.towns[town_index], can_view_users=True,
+                )))
+
+        for town_index, profile in zip(
+            [index for index, _ in citizens],
+            CitizenProfile.objects.bulk_create([profile for _, profile in citizens]),
+        ):
+            self.citizens[town_index].append((profile.id, profile.user_id))
+        for town_index, profile in zip(
+            [index for index, _ in businesses],
+            BusinessOwnerProfile.objects.bulk_create([profile for _, profile in businesses]),
+        ):
+            self.businesses[town_index].append(profile.id)
+        for town_index, official in zip(
+            [index for index, _ in officials],
+            GovernmentOfficial.objects.bulk_create([official for _, official in officials]),
+        ):
+            self.officials[town_index].append(official.id)
+
+    def create_complaints(self, total, notifications):
+        """Complaints, plus complaint_update notifications for a share of them"""
+        towns_with_citizens = [index for index, citizens in enumerate(self.citizens) if citizens]
+        if not towns_with_citizens:
+            return 0
+        weights = [self.town_weights[index] for index in towns_with_citizens]
+        notify_share = min(1.0, notifications / total) if total else 0
+        self.citizen_notifications_created = 0
+
+        for size in self.batches(total):
+            complaints = []
+            for _ in range(size):
+                town_index = self.rng.choices(towns_with_citizens, weights=weights)[0]
+                citizen_id, _ = self.rng.choice(self.citizens[town_index])
+                category = self.rng.choice(list(COMPLAINT_TOPICS))
+                street = self.rng.choice(STREETS)
+                priority = weighted(self.rng, COMPLAINT_PRIORITIES)
+                status = weighted(self.rng, COMPLAINT_STATUSES)
+                created_at = self.past()
+                latitude = self.towns[town_index].center[0] + self.rng.uniform(-0.03, 0.03)
+                longitude = self.towns[town_index].center[1] + self.rng.uniform(-0.03, 0.03)
+                complaints.append(CitizenComplaint(
+                    citizen_id=citizen_id, town=self.towns[town_index], category=category, priority=priority,
+                    status=status, title=self.rng.choice(COMPLAINT_TOPICS[category]).format(street=street),
+                    description=f'Reported by a resident near {street}.', location=street,
+                    latitude=latitude, longitude=longitude, geohash=encode_geohash(latitude, longitude),
+                    due_at=created_at + timedelta(hours=SLA_HOURS[priority]) if status in ('pending', 'in_progress') else None,
+                    created_at=created_at,
+                ))
+
+            with transaction.atomic():
+                complaints = CitizenComplaint.objects.bulk_create(complaints)
+                updates = [
+                    CitizenNotification(
+                        citizen_id=complaint.citizen_id, complaint=complaint, notification_type='complaint_update',
+                        title=f'Update on: {complaint.title}', message=f'Your complaint is now {complaint.status}.',
+                        is_read=self.rng.random() < 0.6,
+                        created_at=complaint.created_at + timedelta(hours=self.rng.randint(1, 72)),
+                    )
+                    for complaint in complaints if self.rng.random() < notify_share
+                ]
+                CitizenNotification.objects.bulk_create(updates)
+            self.citizen_notifications_created += len(updates)
+        return total
+
+    def create_notifications(self, business_total):
+        """Business notifications (citizen ones come with their complaints)"""
+        business_ids = [profile_id for profiles in self.businesses for profile_id in profiles]
+        if not business_ids:
+            return self.citizen_notifications_created
+        for size in self.batches(business_total):
+            BusinessNotification.objects.bulk_create([
+                BusinessNotification(
+                    business_owner_id=self.rng.choice(business_ids), notification_type='general',
+                    title='Town notice', message='Please review the latest update from your town.',
+                    is_read=self.rng.random() < 0.5, created_at=self.past(365),
+                )
+                for _ in range(size)
+            ])
+        return self.citizen_notifications_created + business_total
+
+    def create_bills(self, total):
+        self.bills = []  # (bill, town index)
+        for size in self.batches(total):
+            bills, town_indexes = [], []
+            for _ in range(size):
+                town_index = self.pick_town_index()
+                topic = self.rng.choice(BILL_TOPICS)
+                created_at = self.past(365)
+                bills.append(BillProposal(
+                    title=f'{topic} proposal', description=f'A proposal about {topic.lower()} in {self.towns[town_index].name}.',
+                    department=self.rng.choice(self.departments), town=self.towns[town_index],
+                    status=weighted(self.rng, BILL_STATUSES), priority=weighted(self.rng, COMPLAINT_PRIORITIES[:3]),
+                    created_by_id=self.rng.choice(self.officials[town_index]), views=self.rng.randint(0, 5000),
+                    published_at=created_at + timedelta(days=1), created_at=created_at,
+                ))
+                town_indexes.append(town_index)
+            self.bills.extend(zip(BillProposal.objects.bulk_create(bills), town_indexes))
+        return total
+
+    def create_announcements(self):
+        announcements = []
+        for town_index, town in enumerate(self.towns):
+            for number in range(ANNOUNCEMENTS_PER_TOWN):
+                created_at = self.past(180)
+                announcements.append(Announcement(
+                    title=f'{town.name} notice #{number + 1}', content='Details of this town announcement.',
+                    description='Town announcement', department=self.rng.choice(self.departments), town=town,
+                    is_published=True, published_at=created_at, created_by_id=self.rng.choice(self.officials[town_index]),
+                    created_at=created_at,
+                ))
+        Announcement.objects.bulk_create(announcements, batch_size=self.batch_size)
+        return len(announcements)
+
+    def create_votes(self, total):
+        """Votes from citizens of each bill's town; support/oppose counts are written back to the bills"""
+        if not self.bills:
+            return 0
+        shares = [self.rng.random() for _ in self.bills]
+        scale = total / sum(shares)
+        pending, created = [], 0
+        for (bill, town_index), share in zip(self.bills, shares):
+            voters = [user_id for _, user_id in self.citizens[town_index]]
+            count = min(len(voters), round(share * scale))
+            support_rate = self.rng.uniform(0.2, 0.8)
+            for user_id in self.rng.sample(voters, count):
+                vote_type = 'support' if self.rng.random() < support_rate else 'oppose'
+                pending.append(BillVote(bill=bill, user_id=user_id, vote_type=vote_type))
+                if vote_type == 'support':
+                    bill.support_count += 1
+                else:
+                    bill.oppose_count += 1
+            if len(pending) >= self.batch_size:
+                BillVote.objects.bulk_create(pending)
+                created += len(pending)
+                pending = []
+        BillVote.objects.bulk_create(pending)
+        created += len(pending)
+        BillProposal.objects.bulk_update(
+            [bill for bill, _ in self.bills], ['support_count', 'oppose_count'], batch_size=self.batch_size
+        )
+        return created
+
+    def create_events(self, total):
+        business_ids = [profile_id for profiles in self.businesses for profile_id in profiles]
+        if not business_ids:
+            return 0
+        today = self.now.date()
+        for size in self.batches(total):
+            BusinessEvent.objects.bulk_create([
+                BusinessEvent(
+                    business_owner_id=self.rng.choice(business_ids), title=f'{self.rng.choice(BUSINESS_TYPES)} open house',
+                    description='Come meet the team.', event_date=today + timedelta(days=self.rng.randint(-90, 90)),
+                    event_time=datetime.min.time().replace(hour=self.rng.randint(9, 19)), location=self.rng.choice(STREETS),
+                    status=weighted(self.rng, EVENT_STATUSES), max_attendees=self.rng.choice([None, 20, 50, 100]),
+                )
+                for _ in range(size)
+            ])
+        return total
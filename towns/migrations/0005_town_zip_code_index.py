@@ -0,0 +1,54 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def normalize_zip(value):
+    """Copy of towns.zip_codes.normalize_zip as of this migration"""
+    if value is None:
+        return None
+    digits = str(value).strip().split('-')[0].strip()
+    if not digits.isdigit() or len(digits) > 5:
+        return None
+    return digits.zfill(5)
+
+
+def backfill_zip_index(apps, schema_editor):
+    """Index existing Town.zip_codes; when towns share a ZIP code the lowest town id wins"""
+    Town = apps.get_model('towns', 'Town')
+    TownZipCode = apps.get_model('towns', 'TownZipCode')
+    entries = {}
+    for town in Town.objects.order_by('id').only('id', 'zip_codes'):
+        for value in town.zip_codes or []:
+            zip_code = normalize_zip(value)
+            if zip_code:
+                entries.setdefault(zip_code, town.id)
+    TownZipCode.objects.bulk_create(
+        [TownZipCode(zip_code=zip_code, town_id=town_id) for zip_code, town_id in sorted(entries.items())],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('towns', '0004_town_emergency_animal_control_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TownZipCode',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('zip_code', models.CharField(max_length=5, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('town', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='zip_code_entries', to='towns.town')),
+            ],
+            options={
+                'verbose_name_plural': 'Town ZIP Codes',
+                'ordering': ['zip_code'],
+            },
+        ),
+        migrations.RunPython(backfill_zip_index, migrations.RunPython.noop),
+    ]
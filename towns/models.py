@@ -43,6 +43,16 @@ class Town(models.Model):
     
     def __str__(self):
         return f"{self.name}, {self.state}"
+    
+    def clean(self):
+        """Reject ZIP codes that are already assigned to another town"""
+        from django.core.exceptions import ValidationError
+        from .zip_codes import find_zip_conflicts
+        conflicts = find_zip_conflicts(self)
+        if conflicts:
+            raise ValidationError({
+                'zip_codes': [f'ZIP code {zip_code} already belongs to {town_name}' for zip_code, town_name in conflicts]
+            })
 
 
 class TownChangeRequest(models.Model):
@@ -101,3 +111,17 @@ class TownChangeRequest(models.Model):
         self.status = 'rejected'
         self.rejection_reason = reason
         self.save()
+
+
+class TownZipCode(models.Model):
+    """Normalized ZIP code to town index, kept in sync with Town.zip_codes"""
+    zip_code = models.CharField(max_length=5, unique=True)
+    town = models.ForeignKey(Town, on_delete=models.CASCADE, related_name='zip_code_entries')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['zip_code']
+        verbose_name_plural = 'Town ZIP Codes'
+    
+    def __str__(self):
+        return f"{self.zip_code} - {self.town.name}"
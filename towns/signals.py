@@ -0,0 +1,48 @@
+"""
+Town Signals
+Invalidate cached calendar feeds and town payloads, and keep the ZIP code index in sync when source rows change
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from authentication.models import UserProfile
+from .ical import bump_version, bump_event_versions
+from .cache import bump_version as bump_town_cache_version
+from .zip_codes import sync_town_zip_codes
+
+
+@receiver([post_save, post_delete], sender='businessowner.BusinessEvent')
+def invalidate_event_feeds(sender, instance, **kwargs):
+    """Events appear in their organizer's town feed and in attendees' personal feeds"""
+    town_id = UserProfile.objects.filter(
+        user_id=instance.business_owner.user_id
+    ).values_list('town_id', flat=True).first()
+    if town_id:
+        bump_version(f'town:{town_id}')
+    bump_event_versions([instance.id])
+
+
+@receiver([post_save, post_delete], sender='government.BillProposal')
+def invalidate_bill_feeds(sender, instance, **kwargs):
+    if instance.town_id:
+        bump_version(f'town:{instance.town_id}')
+
+
+@receiver([post_save, post_delete], sender='businessowner.EventRegistration')
+@receiver([post_save, post_delete], sender='businessowner.ServiceBooking')
+def invalidate_personal_feed(sender, instance, **kwargs):
+    bump_version(f'user:{instance.citizen.user_id}')
+
+
+@receiver(post_save, sender='towns.Town')
+def sync_zip_index(sender, instance, raw=False, **kwargs):
+    """Keep the TownZipCode index in step with Town.zip_codes"""
+    if raw:
+        return
+    sync_town_zip_codes(instance)
+
+
+@receiver([post_save, post_delete], sender='towns.Town')
+def invalidate_town_cache(sender, instance, **kwargs):
+    """Active towns and emergency contacts are served from the town cache"""
+    bump_town_cache_version()
@@ -1,3 +1,254 @@
+"""
+Town Tests
+Emergency contact projection (towns.views_towns)
+ZIP code index: conflicts between towns and signup ZIP validation (towns.zip_codes)
+Bulk town change approval and completion (towns.town_changes)
+Calendar feed versions: which changes invalidate which cached feeds (towns.signals, towns.views_calendar)
+"""
+
+from datetime import date, time
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.test import TestCase
+from authentication.authentication import issue_token
+from authentication.models import CalendarFeedToken, UserProfile
+from authentication.serializers import SignupSerializer
+from businessowner.models import BusinessComplaint, BusinessEvent, BusinessOwnerProfile, EventRegistration
+from citizen.models import CitizenComplaint, CitizenProfile
+from government.models import BillProposal, Department, GovernmentOfficial
+from .ical import get_version
+from .models import Town, TownChangeRequest, TownZipCode
+from .zip_codes import normalize_zip, rebuild_zip_index, resolve_town
+
+
+class EmergencyContactsTests(TestCase):
+
+    def setUp(self):
+        town = Town.objects.create(
+            name='Springfield', slug='springfield', state='NJ', emergency_poison_control='800-222-1222',
+        )
+        user = User.objects.create_user('citizen@example.com', 'citizen@example.com', 'pw')
+        UserProfile.objects.create(user=user, role='citizen', town=town, is_approved=True)
+        self.headers = {'HTTP_AUTHORIZATION': f'Token {issue_token(user).key}'}
+
+    def get_contacts(self, query=''):
+        response = self.client.get(f'/api/towns/towns/me/emergency-contacts/{query}', **self.headers)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['emergency_contacts']
+
+    def test_default_lists_core_services(self):
+        self.assertEqual(self.get_contacts(), {'police': '911', 'fire': '911', 'medical': '911'})
+
+    def test_fields_select_other_contacts(self):
+        self.assertEqual(self.get_contacts('?fields=poison_control'), {'poison_control': '800-222-1222'})
+
+
+class ZipCodeIndexTests(TestCase):
+
+    def setUp(self):
+        self.town = Town.objects.create(name='Springfield', slug='springfield', state='NJ', zip_codes=['07001', '7002'])
+        self.other_town = Town.objects.create(name='Shelbyville', slug='shelbyville', state='NJ', zip_codes=[])
+        self.unzoned_town = Town.objects.create(name='Ogdenville', slug='ogdenville', state='NJ')
+
+    def test_normalize_zip(self):
+        values = ['07001-1234', 7001, ' 07001 ', '123456', 'abc']
+        self.assertEqual([normalize_zip(value) for value in values], ['07001', '07001', '07001', None, None])
+
+    def test_index_follows_town_zip_codes(self):
+        self.assertEqual(resolve_town('07002-9999'), self.town)
+        self.town.zip_codes = ['07001']
+        self.town.save()
+        self.assertIsNone(resolve_town('07002'))
+
+    def test_clean_rejects_zip_codes_of_another_town(self):
+        self.other_town.zip_codes = ['07001', '07003']
+        with self.assertRaises(ValidationError) as raised:
+            self.other_town.clean()
+        self.assertEqual(raised.exception.message_dict['zip_codes'], ['ZIP code 07001 already belongs to Springfield'])
+
+    def test_first_owner_keeps_a_shared_zip_code(self):
+        # Saved without clean(), as bulk imports do; the index keeps the first owner
+        self.other_town.zip_codes = ['07001', '07003']
+        self.other_town.save()
+        self.assertEqual(resolve_town('07001'), self.town)
+        self.assertEqual(rebuild_zip_index(), 3)
+        self.assertEqual(
+            dict(TownZipCode.objects.values_list('zip_code', 'town_id')),
+            {'07001': self.town.id, '07002': self.town.id, '07003': self.other_town.id},
+        )
+
+    def signup_errors(self, town, zip_code):
+        serializer = SignupSerializer(data={
+            'email': 'citizen@example.com', 'password': 'long-password', 'firstName': 'Marge', 'lastName': 'Simpson',
+            'userType': 'citizen', 'townId': town.id, 'streetAddress': '742 Evergreen Terrace',
+            'city': 'Springfield', 'state': 'NJ', 'zipCode': zip_code,
+        })
+        serializer.is_valid()
+        return serializer.errors
+
+    def test_signup_zip_must_belong_to_selected_town(self):
+        self.assertEqual(self.signup_errors(self.town, '07001-1234'), {})
+        self.assertIn('belongs to Springfield', str(self.signup_errors(self.other_town, '07001')))
+        self.assertIn('not served', str(self.signup_errors(self.town, '07009')))
+        self.assertEqual(self.signup_errors(self.unzoned_town, '07009'), {})
+
+
+class BulkTownChangeTests(TestCase):
+
+    def setUp(self):
+        self.old_town = Town.objects.create(name='Shelbyville', slug='shelbyville', state='NJ')
+        self.town = Town.objects.create(name='Springfield', slug='springfield', state='NJ')
+        self.far_town = Town.objects.create(name='Capital City', slug='capital-city', state='NJ')
+        official_user = User.objects.create_user('official@example.com', 'official@example.com', 'pw')
+        UserProfile.objects.create(user=official_user, role='government', town=self.town, is_approved=True)
+        self.headers = {'HTTP_AUTHORIZATION': f'Token {issue_token(official_user).key}'}
+
+        self.arriving = self.add_citizen('arriving@example.com', self.old_town)
+        self.leaving = self.add_citizen('leaving@example.com', self.town)
+        self.waiting = self.add_citizen('waiting@example.com', self.old_town)
+        owner_user = User.objects.create_user('owner@example.com', 'owner@example.com', 'pw')
+        UserProfile.objects.create(user=owner_user, role='business', town=self.old_town, is_approved=True)
+        owner = BusinessOwnerProfile.objects.create(
+            user=owner_user, business_name='Cafe', business_registration_number='R1',
+            business_type='cafe', business_address='1 Main St',
+        )
+        self.open_complaint = CitizenComplaint.objects.create(
+            citizen=self.arriving, town=self.old_town, title='Pothole', description='Deep', category='roads',
+        )
+        self.resolved_complaint = CitizenComplaint.objects.create(
+            citizen=self.arriving, town=self.old_town, title='Old pothole', description='Fixed', category='roads',
+            status='resolved',
+        )
+        self.business_complaint = BusinessComplaint.objects.create(
+            business_owner=owner, town=self.old_town, title='Noise', description='Loud', category='noise',
+        )
+        self.requests = {
+            'arriving': self.add_request(self.arriving.user, self.old_town, self.town, 'approved_current'),
+            'business': self.add_request(owner_user, self.old_town, self.town, 'approved_current'),
+            'leaving': self.add_request(self.leaving.user, self.town, self.far_town, 'pending'),
+            'waiting': self.add_request(self.waiting.user, self.old_town, self.town, 'pending'),
+        }
+
+    def add_citizen(self, email, town):
+        user = User.objects.create_user(email, email, 'pw')
+        UserProfile.objects.create(user=user, role='citizen', town=town, is_approved=True)
+        return CitizenProfile.objects.create(user=user, citizen_id=email)
+
+    def add_request(self, user, current_town, requested_town, request_status):
+        return TownChangeRequest.objects.create(
+            user=user, current_town=current_town, requested_town=requested_town,
+            billing_address={}, status=request_status,
+        )
+
+    def test_bulk_approve_completes_arrivals_and_approves_departures(self):
+        ids = {name: change_request.id for name, change_request in self.requests.items()}
+        response = self.client.post(
+            '/api/towns/town-change-requests/bulk-approve/', {'request_ids': list(ids.values())},
+            content_type='application/json', **self.headers,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['completed'], sorted([ids['arriving'], ids['business']]))
+        self.assertEqual(data['approved'], [ids['leaving']])
+        self.assertEqual(data['skipped'], [ids['waiting']])
+
+        statuses = dict(TownChangeRequest.objects.values_list('id', 'status'))
+        self.assertEqual(statuses[ids['arriving']], 'approved_new')
+        self.assertEqual(statuses[ids['leaving']], 'approved_current')
+        self.assertEqual(statuses[ids['waiting']], 'pending')
+
+        towns = dict(UserProfile.objects.values_list('user_id', 'town_id'))
+        self.assertEqual(towns[self.arriving.user_id], self.town.id)
+        self.assertEqual(towns[self.leaving.user_id], self.town.id)
+        self.assertEqual(towns[self.waiting.user_id], self.old_town.id)
+
+        self.open_complaint.refresh_from_db()
+        self.resolved_complaint.refresh_from_db()
+        self.business_complaint.refresh_from_db()
+        self.assertEqual(self.open_complaint.town_id, self.town.id)
+        self.assertEqual(self.resolved_complaint.town_id, self.old_town.id)
+        self.assertEqual(self.business_complaint.town_id, self.town.id)
+
+    def test_completion_is_limited_to_the_requested_town(self):
+        far_official = User.objects.create_user('far@example.com', 'far@example.com', 'pw')
+        UserProfile.objects.create(user=far_official, role='government', town=self.far_town, is_approved=True)
+        response = self.client.post(
+            '/api/towns/town-change-requests/bulk-approve/', {'request_ids': [self.requests['business'].id]},
+            content_type='application/json', HTTP_AUTHORIZATION=f'Token {issue_token(far_official).key}',
+        )
+        self.assertEqual(response.json()['skipped'], [self.requests['business'].id])
+        self.assertEqual(TownChangeRequest.objects.get(id=self.requests['business'].id).status, 'approved_current')
+
+
+class CalendarFeedVersionTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.town = Town.objects.create(name='Springfield', slug='springfield', state='NJ')
+        self.other_town = Town.objects.create(name='Shelbyville', slug='shelbyville', state='NJ')
+        owner_user = User.objects.create_user('owner@example.com', 'owner@example.com', 'pw')
+        UserProfile.objects.create(user=owner_user, role='business', town=self.town, is_approved=True)
+        owner = BusinessOwnerProfile.objects.create(
+            user=owner_user, business_name='Cafe', business_registration_number='R1',
+            business_type='cafe', business_address='1 Main St',
+        )
+        self.event = BusinessEvent.objects.create(
+            business_owner=owner, title='Open house', description='Tour', location='1 Main St',
+            event_date=date(2030, 1, 7), event_time=time(18, 0), status='approved',
+        )
+        self.attendee = self.add_citizen('attendee@example.com')
+        self.bystander = self.add_citizen('bystander@example.com')
+        EventRegistration.objects.create(event=self.event, citizen=self.attendee)
+
+    def add_citizen(self, email):
+        user = User.objects.create_user(email, email, 'pw')
+        UserProfile.objects.create(user=user, role='citizen', town=self.town, is_approved=True)
+        return CitizenProfile.objects.create(user=user, citizen_id=email)
+
+    def versions(self):
+        return {
+            scope: get_version(scope) for scope in [
+                f'town:{self.town.id}', f'town:{self.other_town.id}',
+                f'user:{self.attendee.user_id}', f'user:{self.bystander.user_id}',
+            ]
+        }
+
+    def assertBumped(self, change, *scopes):
+        before = self.versions()
+        change()
+        after = self.versions()
+        self.assertEqual({scope for scope in after if after[scope] != before[scope]}, set(scopes))
+
+    def test_event_change_reaches_town_and_attendees_only(self):
+        self.event.title = 'Open house (moved)'
+        self.assertBumped(self.event.save, f'town:{self.town.id}', f'user:{self.attendee.user_id}')
+
+    def test_registration_change_reaches_that_citizen_only(self):
+        self.assertBumped(
+            lambda: EventRegistration.objects.create(event=self.event, citizen=self.bystander),
+            f'user:{self.bystander.user_id}',
+        )
+
+    def test_bill_change_reaches_its_town_only(self):
+        official_user = User.objects.create_user('official@example.com', 'official@example.com', 'pw')
+        official = GovernmentOfficial.objects.create(
+            user=official_user, employee_id='E1', department='Clerk', position='Clerk', town=self.other_town,
+        )
+        department = Department.objects.create(name='Clerk', description='Records')
+        self.assertBumped(
+            lambda: BillProposal.objects.create(
+                title='Bill', description='Text', town=self.other_town, created_by=official, department=department,
+            ),
+            f'town:{self.other_town.id}',
+        )
+
+    def test_cached_feed_is_rebuilt_after_a_change(self):
+        token = CalendarFeedToken.objects.create(user=self.attendee.user, token='feed-token').token
+        self.assertIn(b'SUMMARY:Open house', self.client.get(f'/api/towns/calendar/{token}/me.ics').content)
+
+        self.event.title = 'Closed house'
+        self.event.save()
 
-# Create your tests here.
+        self.assertIn(b'SUMMARY:Closed house', self.client.get(f'/api/towns/calendar/{token}/me.ics').content)
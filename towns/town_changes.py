@@ -0,0 +1,86 @@
+"""
+Town Change Processing
+Moves users between towns in batches with set-based updates
+"""
+
+from collections import defaultdict
+from django.db import transaction
+from django.utils import timezone
+from authentication.models import UserProfile
+from government.models import GovernmentOfficial
+from citizen.assignment import reroute_complaints
+from citizen.models import CitizenComplaint
+from businessowner.models import BusinessComplaint
+from .ical import bump_version
+from .models import TownChangeRequest
+
+# Complaints that follow their submitter to the new town
+OPEN_COMPLAINT_STATUSES = ['pending', 'in_progress']
+
+
+def approve_outgoing(request_ids, town, approver):
+    """
+    First-stage approval by the current town for many requests.
+    Returns: ids of the requests that moved to approved_current
+    """
+    with transaction.atomic():
+        ids = list(
+            TownChangeRequest.objects.select_for_update().filter(
+                id__in=request_ids, current_town=town, status='pending'
+            ).values_list('id', flat=True)
+        )
+        TownChangeRequest.objects.filter(id__in=ids).update(
+            status='approved_current',
+            approved_by_current_town=approver,
+        )
+    return ids
+
+
+def complete_town_changes(request_ids, town, approver):
+    """
+    Second-stage approval by the requested town: complete many requests in one transaction.
+    Profiles, official records and the users' open complaints are moved with one UPDATE
+    per destination town instead of one save per user.
+    Returns: ids of the completed requests
+    """
+    with transaction.atomic():
+        rows = list(
+            TownChangeRequest.objects.select_for_update().filter(
+                id__in=request_ids, requested_town=town, status='approved_current'
+            ).values('id', 'user_id', 'current_town_id', 'requested_town_id')
+        )
+        if not rows:
+            return []
+
+        now = timezone.now()
+        users_by_town = defaultdict(list)
+        for row in rows:
+            users_by_town[row['requested_town_id']].append(row['user_id'])
+
+        moved_complaint_ids = []
+        for town_id, user_ids in users_by_town.items():
+            UserProfile.objects.filter(user_id__in=user_ids).update(town_id=town_id, updated_at=now)
+            GovernmentOfficial.objects.filter(user_id__in=user_ids).update(town_id=town_id, updated_at=now)
+            complaints = CitizenComplaint.objects.filter(
+                citizen__user_id__in=user_ids, status__in=OPEN_COMPLAINT_STATUSES
+            )
+            moved_complaint_ids += complaints.values_list('id', flat=True)
+            complaints.update(town_id=town_id, updated_at=now)
+            BusinessComplaint.objects.filter(
+                business_owner__user_id__in=user_ids, status__in=OPEN_COMPLAINT_STATUSES
+            ).update(town_id=town_id, updated_at=now)
+
+        # Officials of the old town stop carrying the moved complaints; the new town's rules route them
+        reroute_complaints(moved_complaint_ids)
+
+        TownChangeRequest.objects.filter(id__in=[row['id'] for row in rows]).update(
+            status='approved_new',
+            approved_by_new_town=approver,
+            completed_at=now,
+        )
+
+    # Business events are listed in their organizer's town feed
+    for town_id in {row['current_town_id'] for row in rows} | set(users_by_town):
+        if town_id:
+            bump_version(f'town:{town_id}')
+    return [row['id'] for row in rows]
@@ -2,19 +2,31 @@ from django.urls import path
 from . import (
     views_towns,
     views_change_requests,
+    views_calendar,
 )
 
 urlpatterns = [
     # Towns - RESTful
     # GET /towns/active/ - List active towns
+    # GET /towns/zip/<zip_code>/ - Resolve a ZIP code to its town
     # GET /towns/me/emergency-contacts/ - Get emergency contacts
     # GET /town-change-requests/ - List change requests
     # POST /town-change-requests/ - Create change request
     # GET /town-change-requests/<id>/ - Get change request
     # PATCH /town-change-requests/<id>/ - Approve/reject change request
+    # POST /town-change-requests/bulk-approve/ - Approve/complete many change requests
+    # GET /towns/calendar/token/ - Get calendar feed token and subscription URLs
+    # POST /towns/calendar/token/ - Rotate calendar feed token
+    # GET /towns/calendar/<token>/town.ics - iCalendar feed of town events and bill deadlines
+    # GET /towns/calendar/<token>/me.ics - iCalendar feed of own registrations and bookings
     path('active/', views_towns.active_towns_view, name='active_towns'),
+    path('zip/<str:zip_code>/', views_towns.resolve_zip_code_view, name='resolve_zip_code'),
     path('towns/me/emergency-contacts/', views_towns.user_town_emergency_contacts, name='user_town_emergency_contacts'),
+    path('calendar/token/', views_calendar.calendar_token_view, name='calendar_token'),
+    path('calendar/<str:token>/town.ics', views_calendar.town_calendar_feed_view, name='town_calendar_feed'),
+    path('calendar/<str:token>/me.ics', views_calendar.user_calendar_feed_view, name='user_calendar_feed'),
     path('town-change-requests/', views_change_requests.list_town_change_requests, name='town_change_requests_list_create'),
+    path('town-change-requests/bulk-approve/', views_change_requests.bulk_approve_town_change_requests_view, name='town_change_requests_bulk_approve'),
     path('town-change-requests/<int:request_id>/', views_change_requests.town_change_request_detail_action_view, name='town_change_request_detail_action'),
     # Alias for frontend compatibility
     path('change-requests/', views_change_requests.list_town_change_requests, name='change_requests_list_create'),
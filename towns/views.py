@@ -228,6 +228,8 @@ def list_town_change_requests(request):
             else:
                 requests = TownChangeRequest.objects.filter(current_town=user_town)
         
+        requests = requests.select_related('user', 'current_town', 'requested_town')
+        
         data = []
         for req in requests:
             data.append({
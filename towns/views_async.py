@@ -0,0 +1,38 @@
+"""
+Town Async Views
+Async-native version of the active towns endpoint (ASGI only)
+"""
+
+from django.http import HttpResponseNotModified, JsonResponse
+from townhall_project.async_api import async_api_view
+from townhall_project.db_routers import replica_reads
+from .models import Town
+from .cache import aget_cached_payload, apply_cache_headers, is_not_modified, parse_fields, ACTIVE_TOWNS_MAX_AGE
+from .views_towns import active_towns_view, ACTIVE_TOWN_FIELDS, DEFAULT_ACTIVE_TOWN_FIELDS
+
+
+async def abuild_active_towns(fields):
+    """Async variant of build_active_towns"""
+    return [
+        {field: (town[field] or []) if field == 'zip_codes' else town[field] for field in fields}
+        async for town in Town.objects.filter(is_active=True).order_by('name').values(*fields).aiterator()
+    ]
+
+
+@async_api_view(active_towns_view, require_auth=False)
+@replica_reads
+async def active_towns_async_view(request, user):
+    """GET /towns/active/ - same cache, ETag and ?fields= handling as active_towns_view"""
+    fields, error = parse_fields(request, ACTIVE_TOWN_FIELDS)
+    if error:
+        return JsonResponse({'error': error}, status=400)
+    fields = fields or DEFAULT_ACTIVE_TOWN_FIELDS
+    
+    data, etag = await aget_cached_payload(
+        f'active:{",".join(fields)}', lambda: abuild_active_towns(fields)
+    )
+    if is_not_modified(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        response = JsonResponse(data, safe=False)
+    return apply_cache_headers(response, etag, ACTIVE_TOWNS_MAX_AGE)
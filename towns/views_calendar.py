@@ -0,0 +1,165 @@
+"""
+Calendar Feed Views
+Tokenized iCalendar (.ics) subscriptions for town events, bill review deadlines and personal bookings
+"""
+
+from django.core.cache import cache
+from django.http import HttpResponse, Http404
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from authentication.models import CalendarFeedToken, UserProfile
+from businessowner.models import BusinessEvent, EventRegistration, ServiceBooking
+from government.models import BillProposal
+from townhall_project.caches import versioned_timeout
+from .ical import (
+    render_vevent, render_calendar, render_chunks, combine_date_time,
+    get_version, FEED_CACHE_TIMEOUT
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Bill statuses whose review deadline is shown in town feeds
+BILL_FEED_STATUSES = ['published', 'under_review']
+
+# Calendar clients poll often; let intermediaries reuse a response briefly
+FEED_MAX_AGE = 300
+
+
+def _feed_response(body, filename):
+    response = HttpResponse(body, content_type='text/calendar; charset=utf-8')
+    response['Content-Disposition'] = f'inline; filename="{filename}"'
+    response['Cache-Control'] = f'private, max-age={FEED_MAX_AGE}'
+    return response
+
+
+def _get_token_user(token):
+    try:
+        return CalendarFeedToken.objects.select_related('user').get(token=token, user__is_active=True).user
+    except CalendarFeedToken.DoesNotExist:
+        raise Http404('Unknown calendar feed')
+
+
+def _event_chunk(event):
+    key = f'ical:vevent:event:{event.id}:{event.updated_at.timestamp()}'
+    return key, lambda: render_vevent(
+        uid=f'event-{event.id}@townhall',
+        summary=event.title,
+        start=combine_date_time(event.event_date, event.event_time),
+        description=event.description,
+        location=event.location,
+        stamp=event.updated_at,
+    )
+
+
+def _bill_chunk(bill):
+    key = f'ical:vevent:bill:{bill.id}:{bill.updated_at.timestamp()}'
+    return key, lambda: render_vevent(
+        uid=f'bill-deadline-{bill.id}@townhall',
+        summary=f'Review deadline: {bill.title}',
+        start=bill.review_deadline,
+        description=bill.summary or bill.description,
+        all_day=True,
+        stamp=bill.updated_at,
+    )
+
+
+def _booking_chunk(booking):
+    key = f'ical:vevent:booking:{booking.id}:{booking.updated_at.timestamp()}'
+    slot_end = combine_date_time(booking.slot.date, booking.slot.end_time) if booking.slot else None
+    return key, lambda: render_vevent(
+        uid=f'booking-{booking.id}@townhall',
+        summary=f'{booking.service.service_name} - {booking.service.business_owner.business_name}',
+        start=combine_date_time(booking.booking_date, booking.booking_time),
+        end=slot_end,
+        description=booking.notes,
+        stamp=booking.updated_at,
+    )
+
+
+def build_town_feed(town):
+    """Approved events and open bill review deadlines for a town"""
+    events = BusinessEvent.objects.filter(
+        status='approved',
+        business_owner__user__userprofile__town=town,
+    ).only('id', 'title', 'description', 'location', 'event_date', 'event_time', 'updated_at')
+    bills = BillProposal.objects.filter(
+        town=town,
+        status__in=BILL_FEED_STATUSES,
+        review_deadline__isnull=False,
+    ).only('id', 'title', 'summary', 'description', 'review_deadline', 'updated_at')
+
+    items = [_event_chunk(event) for event in events] + [_bill_chunk(bill) for bill in bills]
+    return render_calendar(f'{town.name} - TownHall', render_chunks(items))
+
+
+def build_user_feed(user):
+    """A user's event registrations and active service bookings"""
+    registrations = EventRegistration.objects.filter(
+        citizen__user=user,
+        status='registered',
+        event__status='approved',
+    ).select_related('event')
+    bookings = ServiceBooking.objects.filter(
+        citizen__user=user,
+        status__in=['pending', 'confirmed'],
+    ).select_related('slot', 'service', 'service__business_owner')
+
+    items = [_event_chunk(registration.event) for registration in registrations]
+    items += [_booking_chunk(booking) for booking in bookings]
+    return render_calendar('My TownHall Calendar', render_chunks(items))
+
+
+def town_calendar_feed_view(request, token):
+    """GET /towns/calendar/<token>/town.ics - Feed for the token owner's town"""
+    user = _get_token_user(token)
+    town = UserProfile.objects.filter(user=user).values_list('town', flat=True).first()
+    if not town:
+        raise Http404('No town assigned')
+
+    cache_key = f'ical:feed:town:{town}:v{get_version(f"town:{town}")}'
+    body = cache.get(cache_key)
+    if body is None:
+        profile = UserProfile.objects.select_related('town').get(user=user)
+        body = build_town_feed(profile.town)
+        cache.set(cache_key, body, versioned_timeout(FEED_CACHE_TIMEOUT))
+    return _feed_response(body, 'town.ics')
+
+
+def user_calendar_feed_view(request, token):
+    """GET /towns/calendar/<token>/me.ics - Feed of the token owner's registrations and bookings"""
+    user = _get_token_user(token)
+
+    cache_key = f'ical:feed:user:{user.id}:v{get_version(f"user:{user.id}")}'
+    body = cache.get(cache_key)
+    if body is None:
+        body = build_user_feed(user)
+        cache.set(cache_key, body, versioned_timeout(FEED_CACHE_TIMEOUT))
+    return _feed_response(body, 'me.ics')
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def calendar_token_view(request):
+    """Get (GET) or rotate (POST) the current user's calendar feed token and subscription URLs"""
+    try:
+        feed_token, created = CalendarFeedToken.objects.get_or_create(
+            user=request.user,
+            defaults={'token': CalendarFeedToken.generate_token()},
+        )
+        if request.method == 'POST' and not created:
+            feed_token.rotate()
+
+        return Response({
+            'token': feed_token.token,
+            'town_feed_url': request.build_absolute_uri(f'/api/towns/calendar/{feed_token.token}/town.ics'),
+            'user_feed_url': request.build_absolute_uri(f'/api/towns/calendar/{feed_token.token}/me.ics'),
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        logger.error(f"Error getting calendar token: {str(e)}")
+        return Response({
+            'error': f'An error occurred: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -8,8 +8,10 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from .models import Town, TownChangeRequest
+from .town_changes import approve_outgoing, complete_town_changes
 from authentication.models import UserProfile
-from django.db import transaction
+from government.views_utils import parse_bulk_ids
+from townhall_project.db_routers import replica_reads
 import logging
 
 logger = logging.getLogger(__name__)
@@ -77,6 +79,7 @@ def create_town_change_request(request):
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def list_town_change_requests(request):
     """List town change requests (GET) or create request (POST)"""
     if request.method == 'GET':
@@ -111,6 +114,8 @@ def list_town_change_requests(request):
                 else:
                     requests = TownChangeRequest.objects.filter(current_town=user_town)
             
+            requests = requests.select_related('user', 'current_town', 'requested_town')
+            
             data = []
             for req in requests:
                 data.append({
@@ -152,7 +157,9 @@ def town_change_request_detail_action_view(request, request_id):
             }, status=status.HTTP_403_FORBIDDEN)
         
         try:
-            change_request = TownChangeRequest.objects.get(id=request_id)
+            change_request = TownChangeRequest.objects.select_related(
+                'user', 'current_town', 'requested_town'
+            ).get(id=request_id)
         except TownChangeRequest.DoesNotExist:
             return Response({
                 'error': 'Request not found'
@@ -186,11 +193,7 @@ def town_change_request_detail_action_view(request, request_id):
                         'message': 'Request approved by current town. Awaiting approval from new town.'
                     }, status=status.HTTP_200_OK)
                 elif change_request.requested_town == user_town and change_request.status == 'approved_current':
-                    change_request.approve_by_new_town(request.user)
-                    with transaction.atomic():
-                        user_profile = UserProfile.objects.get(user=change_request.user)
-                        user_profile.town = change_request.requested_town
-                        user_profile.save()
+                    complete_town_changes([change_request.id], user_town, request.user)
                     return Response({
                         'message': 'Town change completed successfully'
                     }, status=status.HTTP_200_OK)
@@ -232,3 +235,51 @@ def town_change_request_detail_action_view(request, request_id):
 
 
 
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_approve_town_change_requests_view(request):
+    """
+    Approve many town change requests at once
+    Body: {"request_ids": [...]}
+    Requests leaving the official's town get first-stage approval; requests arriving
+    in it are completed, moving the users in one transaction.
+    """
+    try:
+        profile = UserProfile.objects.get(user=request.user)
+        
+        if profile.role != 'government' and not request.user.is_superuser:
+            return Response({
+                'error': 'Only government officials can manage requests'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        user_town = profile.town
+        if not user_town:
+            return Response({
+                'error': 'You are not assigned to a town'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        request_ids, error = parse_bulk_ids(request.data, 'request_ids')
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        
+        approved = approve_outgoing(request_ids, user_town, request.user)
+        completed = complete_town_changes(request_ids, user_town, request.user)
+        
+        processed = set(approved) | set(completed)
+        return Response({
+            'message': f'{len(approved)} request(s) approved, {len(completed)} town change(s) completed',
+            'approved': sorted(approved),
+            'completed': sorted(completed),
+            'skipped': [request_id for request_id in request_ids if request_id not in processed],
+        }, status=status.HTTP_200_OK)
+    except UserProfile.DoesNotExist:
+        return Response({
+            'error': 'User profile not found'
+        }, status=status.HTTP_404_NOT_FOUND)
+    except Exception as e:
+        logger.error(f"Error bulk approving town change requests: {str(e)}")
+        return Response({
+            'error': f'An error occurred: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
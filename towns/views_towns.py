@@ -8,75 +8,137 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from .models import Town
+from .zip_codes import normalize_zip, resolve_town
+from .cache import (
+    get_cached_payload, etag_response, parse_fields,
+    ACTIVE_TOWNS_MAX_AGE, EMERGENCY_CONTACTS_MAX_AGE
+)
 from authentication.models import UserProfile
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# Fields available through ?fields= on the active towns list (default: id, name, state)
+ACTIVE_TOWN_FIELDS = ['id', 'name', 'state', 'zip_codes']
+DEFAULT_ACTIVE_TOWN_FIELDS = ['id', 'name', 'state']
+
+# Emergency contact keys mapped to Town fields (available through ?fields=; default: police, fire, medical)
+EMERGENCY_CONTACT_FIELDS = {
+    'police': 'emergency_police',
+    'fire': 'emergency_fire',
+    'medical': 'emergency_medical',
+    'non_urgent': 'emergency_non_urgent',
+    'dispatch': 'emergency_dispatch',
+    'animal_control': 'emergency_animal_control',
+    'poison_control': 'emergency_poison_control',
+    'utilities': 'emergency_utilities',
+    'public_works': 'emergency_public_works',
+    'mental_health': 'emergency_mental_health',
+    'child_protective': 'emergency_child_protective',
+    'road_department': 'emergency_road_department',
+}
+DEFAULT_EMERGENCY_CONTACT_FIELDS = ['police', 'fire', 'medical']
+
+
+def build_active_towns(fields):
+    """Active towns projected onto the requested fields"""
+    towns = Town.objects.filter(is_active=True).order_by('name').values(*fields)
+    return [
+        {field: (town[field] or []) if field == 'zip_codes' else town[field] for field in fields}
+        for town in towns
+    ]
+
+
+def build_emergency_contacts(town_id, fields):
+    """Emergency contacts for a town, limited to the requested contact keys"""
+    columns = [EMERGENCY_CONTACT_FIELDS[field] for field in fields]
+    town = Town.objects.filter(id=town_id).values('name', *columns).first()
+    if town is None:
+        return None
+    return {
+        'town_name': town['name'],
+        'emergency_contacts': {
+            field: town[EMERGENCY_CONTACT_FIELDS[field]] or None for field in fields
+        }
+    }
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def active_towns_view(request):
-    """Get all active towns"""
-    towns = Town.objects.filter(is_active=True).order_by('name')
-    data = [
-        {
+    """
+    Get all active towns
+    Served from the town cache with an ETag; optional ?fields=id,name,state,zip_codes projection
+    """
+    fields, error = parse_fields(request, ACTIVE_TOWN_FIELDS)
+    if error:
+        return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+    fields = fields or DEFAULT_ACTIVE_TOWN_FIELDS
+    
+    data, etag = get_cached_payload(
+        f'active:{",".join(fields)}', lambda: build_active_towns(fields)
+    )
+    return etag_response(request, data, etag, ACTIVE_TOWNS_MAX_AGE)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def resolve_zip_code_view(request, zip_code):
+    """Resolve a ZIP code (5-digit or ZIP+4) to its active town"""
+    normalized = normalize_zip(zip_code)
+    if not normalized:
+        return Response({
+            'error': 'Invalid ZIP code'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    town = resolve_town(normalized)
+    if town is None:
+        return Response({
+            'error': 'No town found for this ZIP code'
+        }, status=status.HTTP_404_NOT_FOUND)
+    
+    return Response({
+        'zip_code': normalized,
+        'town': {
             'id': town.id,
             'name': town.name,
             'state': town.state
         }
-        for town in towns
-    ]
-    return Response(data, status=status.HTTP_200_OK)
+    }, status=status.HTTP_200_OK)
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def user_town_emergency_contacts(request):
-    """Get emergency contacts for the authenticated user's town"""
+    """
+    Get emergency contacts for the authenticated user's town
+    Served from the town cache with an ETag; police, fire and medical unless ?fields=... asks for others
+    """
     try:
-        profile = UserProfile.objects.get(user=request.user)
+        fields, error = parse_fields(request, list(EMERGENCY_CONTACT_FIELDS))
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        fields = fields or DEFAULT_EMERGENCY_CONTACT_FIELDS
         
-        if not profile.town:
+        town_ids = list(UserProfile.objects.filter(user=request.user).values_list('town_id', flat=True)[:1])
+        if not town_ids:
+            return Response({
+                'error': 'User profile not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        town_id = town_ids[0]
+        if not town_id:
             return Response({
                 'error': 'You are not assigned to a town'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        town = profile.town
-        data = {
-            'town_name': town.name,
-            'emergency_contacts': {
-                'police': town.emergency_police,
-                'fire': town.emergency_fire,
-                'medical': town.emergency_medical,
-                'non_urgent': town.emergency_non_urgent if town.emergency_non_urgent else None,
-                'dispatch': town.emergency_dispatch if town.emergency_dispatch else None,
-                'animal_control': town.emergency_animal_control if town.emergency_animal_control else None,
-                'poison_control': town.emergency_poison_control if town.emergency_poison_control else None,
-                'utilities': town.emergency_utilities if town.emergency_utilities else None,
-                'public_works': town.emergency_public_works if town.emergency_public_works else None,
-                'mental_health': town.emergency_mental_health if town.emergency_mental_health else None,
-                'child_protective': town.emergency_child_protective if town.emergency_child_protective else None,
-                'road_department': town.emergency_road_department if town.emergency_road_department else None,
-            }
-        }
-        
-        return Response(data, status=status.HTTP_200_OK)
-    except UserProfile.DoesNotExist:
-        return Response({
-            'error': 'User profile not found'
-        }, status=status.HTTP_404_NOT_FOUND)
+        data, etag = get_cached_payload(
+            f'emergency:{town_id}:{",".join(fields)}', lambda: build_emergency_contacts(town_id, fields)
+        )
+        return etag_response(request, data, etag, EMERGENCY_CONTACTS_MAX_AGE, private=True)
     except Exception as e:
         logger.error(f"Error getting emergency contacts: {str(e)}")
         return Response({
             'error': f'An error occurred: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-
-
-
-
-
-
-
-
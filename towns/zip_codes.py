@@ -0,0 +1,96 @@
+"""
+ZIP Code Index
+Keeps the TownZipCode lookup table in sync with Town.zip_codes and resolves ZIP codes to towns
+"""
+
+from django.db import transaction
+from .models import Town, TownZipCode
+
+
+def normalize_zip(value):
+    """
+    Normalize a ZIP code to its 5-digit form ("07001-1234" -> "07001", 7001 -> "07001")
+    Returns None for values that are not US ZIP codes
+    """
+    if value is None:
+        return None
+    digits = str(value).strip().split('-')[0].strip()
+    if not digits.isdigit() or len(digits) > 5:
+        return None
+    return digits.zfill(5)
+
+
+def normalized_zip_codes(town):
+    """The town's ZIP codes, normalized and de-duplicated"""
+    codes = set()
+    for value in town.zip_codes or []:
+        zip_code = normalize_zip(value)
+        if zip_code:
+            codes.add(zip_code)
+    return codes
+
+
+def find_zip_conflicts(town):
+    """(zip_code, town_name) pairs for ZIP codes already indexed under a different town"""
+    return list(
+        TownZipCode.objects.filter(zip_code__in=normalized_zip_codes(town))
+        .exclude(town_id=town.pk)
+        .values_list('zip_code', 'town__name')
+        .order_by('zip_code')
+    )
+
+
+def sync_town_zip_codes(town):
+    """
+    Make the index match one town's zip_codes list.
+    ZIP codes owned by another town are left with that town (the first owner wins).
+    """
+    wanted = normalized_zip_codes(town)
+    with transaction.atomic():
+        TownZipCode.objects.filter(town=town).exclude(zip_code__in=wanted).delete()
+        TownZipCode.objects.bulk_create(
+            [TownZipCode(zip_code=zip_code, town=town) for zip_code in sorted(wanted)],
+            ignore_conflicts=True,
+        )
+
+
+def rebuild_zip_index(towns=None):
+    """
+    Rebuild the index for many towns at once (e.g. after onboarding a county with bulk_create,
+    which does not send post_save). When towns share a ZIP code the lowest town id wins.
+    Returns the number of indexed ZIP codes.
+    """
+    towns = Town.objects.all() if towns is None else towns
+    entries = {}
+    town_ids = []
+    for town in towns.order_by('id').only('id', 'zip_codes'):
+        town_ids.append(town.id)
+        for zip_code in normalized_zip_codes(town):
+            entries.setdefault(zip_code, town.id)
+    with transaction.atomic():
+        stale_ids = [
+            entry_id
+            for entry_id, zip_code, town_id in TownZipCode.objects.filter(
+                town_id__in=town_ids
+            ).values_list('id', 'zip_code', 'town_id')
+            if entries.get(zip_code) != town_id
+        ]
+        TownZipCode.objects.filter(id__in=stale_ids).delete()
+        TownZipCode.objects.bulk_create(
+            [TownZipCode(zip_code=zip_code, town_id=town_id) for zip_code, town_id in sorted(entries.items())],
+            ignore_conflicts=True,
+            batch_size=1000,
+        )
+    return len(entries)
+
+
+def resolve_town(zip_code, active_only=True):
+    """Town for a ZIP code via the unique index, or None"""
+    zip_code = normalize_zip(zip_code)
+    if not zip_code:
+        return None
+    entries = TownZipCode.objects.select_related('town').filter(zip_code=zip_code)
+    if active_only:
+        entries = entries.filter(town__is_active=True)
+    entry = entries.first()
+    return entry.town if entry else None